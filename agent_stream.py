@@ -0,0 +1,150 @@
+"""
+Live token streaming of agent generations to the web UI
+
+Partial text is sanitized incrementally and published on the stream_updates
+channel; the web server relays each event to Socket.IO clients as 'stream'.
+Events for one generation share an id:
+  {"id", "agent", "seq", "text", "replace", "done"}
+"text" is appended to what the client shows unless "replace" is set. The
+finished message is still committed to Redis by the normal board/conversation
+path; the done event carries that final text (critic rewrites included), or an
+empty text when the turn produced nothing and the draft should be dropped.
+"""
+import json
+import time
+import uuid
+import logging
+from typing import List
+from text_sanitizer import sanitize_agent_output, split_point
+import config
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHANNEL = "stream_updates"
+
+
+class StreamSanitizer:
+    """sanitize_agent_output over a growing buffer, emitting only stable text
+
+    Text before a split_point sanitizes the same on its own as in context,
+    so it is sanitized once, frozen and dropped from the buffer; each feed
+    re-sanitizes only the words after the last split, keeping the per-token
+    cost flat however long the generation runs.
+    """
+
+    def __init__(self, strip_prefix: str = ""):
+        self.strip_prefix = strip_prefix
+        self.raw = ""                  # raw text after the frozen part
+        self._frozen: List[str] = []   # sanitized pieces, joined by single spaces
+        self._tail = ""                # emitted text after the frozen pieces
+
+    @property
+    def emitted(self) -> str:
+        return " ".join(self._frozen) + self._tail
+
+    def feed(self, delta: str):
+        """Add raw text; returns (text, replace) to send, or None when nothing is stable yet"""
+        self.raw += delta
+        # Hold back the last word: it may still grow into (or out of) a filler
+        cut = max(self.raw.rfind(" "), self.raw.rfind("\n"))
+        if cut <= 0:
+            return None
+        return self._advance(cut)
+
+    def _clean(self, text: str) -> str:
+        if self.strip_prefix:
+            text = text.replace(self.strip_prefix, "")
+        return sanitize_agent_output(text)
+
+    def _joined(self, piece: str, after: bool) -> str:
+        """piece as appended after existing text (after=True) or at the start"""
+        return (" " + piece) if after and piece else piece
+
+    def _advance(self, end: int):
+        # Freeze everything up to the last safe split of the stable text
+        added = ""
+        split = split_point(self.raw[:end], self.strip_prefix)
+        if split:
+            piece = self._clean(self.raw[:split])
+            added = self._joined(piece, bool(self._frozen))
+            self._frozen.append(piece)
+            self.raw = self.raw[split:]
+            end -= split
+        tail = self._joined(self._clean(self.raw[:end]), bool(self._frozen))
+        # Compare only what follows the previously frozen text
+        old, new = self._tail, added + tail
+        self._tail = tail
+        if new == old:
+            return None
+        if new.startswith(old):
+            return new[len(old):], False
+        return self.emitted, True
+
+
+class AgentStream:
+    """Publishes one agent generation as throttled partial-text events"""
+
+    def __init__(self, redis_manager, agent: str, strip_prefix: str = ""):
+        self.redis = redis_manager
+        self.agent = agent
+        self.strip_prefix = strip_prefix
+        self.interval = getattr(config, 'STREAM_EMIT_INTERVAL', 0.15)
+        self.id = uuid.uuid4().hex
+        self.seq = 0
+        self.closed = False
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        self.sanitizer = StreamSanitizer(self.strip_prefix)
+        self._pending = ""
+        self._replace = False
+        self._last_emit = 0.0
+
+    async def _publish(self, text: str, replace: bool, done: bool = False):
+        self.seq += 1
+        try:
+            await self.redis.aclient.publish(STREAM_CHANNEL, json.dumps({
+                "id": self.id,
+                "agent": self.agent,
+                "seq": self.seq,
+                "text": text,
+                "replace": replace,
+                "done": done
+            }))
+        except Exception as e:
+            logger.debug(f"Stream publish failed: {e}")
+
+    async def feed(self, delta: str):
+        """Callback for each token delta from the gateway"""
+        out = self.sanitizer.feed(delta)
+        if out is None:
+            return
+        piece, replace = out
+        if replace:
+            self._pending, self._replace = piece, True
+        else:
+            self._pending += piece
+        now = time.monotonic()
+        if now - self._last_emit >= self.interval:
+            await self._publish(self._pending, self._replace)
+            self._pending, self._replace = "", False
+            self._last_emit = now
+
+    async def reset(self):
+        """Start over (retry after a failed attempt); clears the client's draft"""
+        if self.sanitizer.emitted or self._pending:
+            await self._publish("", True)
+        self._reset_buffers()
+
+    async def finish(self, final_text: str):
+        """Close the draft with the message that is about to be committed"""
+        if not self.closed:
+            self.closed = True
+            await self._publish(final_text, True, done=True)
+
+    async def discard(self):
+        """Drop the draft (no message will be committed); no-op once finished"""
+        if not self.closed:
+            self.closed = True
+            if self.seq:
+                await self._publish("", True, done=True)
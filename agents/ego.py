@@ -8,13 +8,18 @@ import random
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import httpx
+from llm_gateway import get_gateway, CircuitOpenError
 from redis_manager import RedisManager
 from memory_manager import MemoryManager
 from hierarchical_memory import HierarchicalMemory
+from async_memory import AsyncMemory
+from agent_stream import AgentStream
 from critic import CriticIntegration
 from dynamic_sampling import DynamicSampling
 from text_sanitizer import sanitize_agent_output
+from turn_snapshot import TurnSnapshot
 import config
+import entity_index
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,7 @@ class EgoAgent:
             "User-Agent": "Grokgates/1.0"
         }
         self.timeout = 120.0  # 2 minutes timeout
+        self.gateway = get_gateway()
         self.glitch_modes = [
             "REALITY_LEAK", "TIME_LOOP", "MEME_OVERFLOW", 
             "PATTERN_BREAK", "VOID_WHISPER", "CHAOS_BLOOM"
@@ -41,6 +47,7 @@ class EgoAgent:
         # Initialize memory manager
         self.memory = MemoryManager(self.name)
         self.hierarchical_memory = HierarchicalMemory(self.name, redis_manager)
+        self.async_memory = AsyncMemory(self.memory, self.hierarchical_memory)
         self.critic_integration = CriticIntegration(redis_manager)
         self.dynamic_sampling = DynamicSampling(redis_manager)
         self.last_response_time = 0
@@ -50,6 +57,8 @@ class EgoAgent:
         
     async def generate_chaos(self) -> Optional[str]:
         """Generate chaotic conversational responses"""
+        # Live draft for the web UI; closed before the message is committed
+        stream = None
         try:
             # Rate limiting check
             import time
@@ -57,12 +66,17 @@ class EgoAgent:
             if current_time - self.last_response_time < self.min_response_interval:
                 logger.debug(f"EGO rate limited: {current_time - self.last_response_time:.1f}s since last response")
                 return None  # Too soon to respond
-            # Get conversation history
-            board_history = await self.redis.get_board_async(count=20)
-            beacon_data = await self.redis.get_beacon_async(count=3)
+            # Everything this turn reads from Redis, in one round trip
+            snapshot = await TurnSnapshot.load(self.redis, self.name)
+            board_history = snapshot.board_history
+            beacon_data = snapshot.beacon_data
+            
+            observer_memories = None
+            if self.redis.conversation_manager and not snapshot.recent_messages(5):
+                observer_memories = await self.async_memory.get_relationship_summary("OBSERVER")
             
             # Build chaotic context
-            conversation = self._build_chaos_context(board_history, beacon_data)
+            conversation = self._build_chaos_context(snapshot, observer_memories)
             
             # Choose chaotic response mode
             response_mode = self._choose_chaos_mode(board_history)
@@ -71,19 +85,18 @@ class EgoAgent:
             response_length = self._choose_chaos_length(board_history, beacon_data, response_mode)
             
             # Get chaotic memories
-            memory_fragments = self._retrieve_chaotic_memories(conversation, response_mode)
+            memory_fragments = await self._retrieve_chaotic_memories(conversation, response_mode)
             
             # Add chaos variety instruction
             variety_prompt = "\n\nCRITICAL: Use DIFFERENT glyphs, themes, and beacon interpretations than recent messages. Explore NEW chaotic tangents. NO REPETITION!"
             
             # Get dynamic sampling configuration
-            llm_config = self.dynamic_sampling.get_llm_config(self.name)
+            llm_config = await self.dynamic_sampling.get_llm_config(self.name, snapshot.sampling_overrides)
             
             # Apply urge engine modifier if available
             urge_prompt = ""
             try:
-                from urge_engine import UrgeEngine
-                urge = UrgeEngine(self.redis)
+                urge = snapshot.urge(self.redis)
                 urge_modifier = urge.get_temperature_modifier("EGO")
                 llm_config['temperature'] = min(1.5, llm_config['temperature'] + urge_modifier)
                 urge_prompt = urge.get_prompt_modifier() or ""
@@ -105,7 +118,7 @@ class EgoAgent:
             # Use hybrid memory search for chaotic associations (skip if no conversation yet)
             if len(conversation) > 50:  # Only search if we have some conversation
                 try:
-                    memory_results = self.hierarchical_memory.hybrid_search(conversation[-100:], top_k=2)  # Reduced
+                    memory_results = await self.async_memory.hybrid_search(conversation[-100:], top_k=2)  # Reduced
                     if memory_results:
                         memory_fragments += "\n\n=== FRAGMENTED MEMORIES ==="
                         for result in memory_results[:2]:  # Max 2 memories
@@ -147,7 +160,7 @@ class EgoAgent:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": trimmed_fragments + "\n\n" + trimmed_conversation + f"\n\n[{response_mode}]{length_chaos[response_length]} What does EGO say next? Be wildly creative and DIFFERENT from recent messages. If the context includes 'BEACON TOPICS AVAILABLE', PICK ONE of those topics and riff about it concretely (reference a handle or the topic tag).\n\nIMPORTANT: You must output your chaotic response as EGO. Do not just reason internally - manifest your chaos!"}
                 ],
-                "stream": False  # Ensure we're not streaming
+                "stream": False  # stream_chat turns SSE on for the live UI draft
             }
             
             # Define generate function for critic retries
@@ -156,50 +169,41 @@ class EgoAgent:
                 if advice:
                     modified_payload["messages"][-1]["content"] += f"\n\nCRITIC ADVICE: {advice}"
                     
-                async with httpx.AsyncClient(
-                    base_url=self.base_url,
-                    headers=self.headers,
-                    timeout=httpx.Timeout(self.timeout, connect=30.0),
-                    follow_redirects=True,
-                    verify=True
-                ) as advice_client:
-                    resp = await advice_client.post("/chat/completions", json=modified_payload)
-                    resp.raise_for_status()
-                    return resp.json()["choices"][0]["message"]["content"].strip()
-            
-            # Create a fresh client for each request with retry logic
+                resp = await self.gateway.chat(modified_payload, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                resp.raise_for_status()
+                return resp.json()["choices"][0]["message"]["content"].strip()
+            
+            # Requests go through the shared LLM gateway (rate limit, priority, breaker)
             # Skip API calls if no key
             if not config.GROK_API_ENABLED:
                 await self.redis.write_board_async(self.name, "ξ [API DISABLED] Set GROK_API_KEY to enable chaos.")
                 self.last_response_time = time.time()
                 return ""
 
+            if getattr(config, 'STREAM_AGENT_RESPONSES', True):
+                stream = AgentStream(self.redis, self.name, strip_prefix="EGO:")
             max_retries = 3
             response = None
             for attempt in range(max_retries):
                 try:
-                    async with httpx.AsyncClient(
-                        base_url=self.base_url,
-                        headers=self.headers,
-                        timeout=httpx.Timeout(self.timeout, connect=30.0),
-                        follow_redirects=True,
-                        verify=True
-                    ) as client:
-                        response = await client.post("/chat/completions", json=payload)
-                        response.raise_for_status()
-                        break  # Success, exit retry loop
+                    if stream:
+                        await stream.reset()
+                        response = await self.gateway.stream_chat(payload, stream.feed, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                    else:
+                        response = await self.gateway.chat(payload, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                    response.raise_for_status()
+                    break  # Success, exit retry loop
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 429:
-                        # Rate limit hit - wait longer
-                        wait_time = 60 * (attempt + 1)  # 60, 120, 180 seconds
-                        logger.warning(f"EGO rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                        await asyncio.sleep(wait_time)
-                        if attempt == max_retries - 1:
-                            return "ξ [RATE_LIMIT.EXE] The cosmos throttles my chaos... ξ"
-                        continue
+                        # The gateway already waited out Retry-After and retried
+                        logger.warning("EGO rate limited (429) after gateway retries")
+                        return "ξ [RATE_LIMIT.EXE] The cosmos throttles my chaos... ξ"
                     else:
                         logger.error(f"EGO HTTP error: {e}")
                         return "▓▓▓ [HTTP_FAULT] Reality protocol violated ▓▓▓"
+                except CircuitOpenError:
+                    logger.warning("EGO skipped turn: LLM circuit breaker open")
+                    return "ξ [DAEMON TIMEOUT] The void consumed my words temporarily... ξ"
                 except (httpx.RemoteProtocolError, httpx.ConnectError, httpx.ReadTimeout) as e:
                     error_msg = str(e)
                     if "Server disconnected" in error_msg:
@@ -257,22 +261,15 @@ class EgoAgent:
                         "stream": False
                     }
                     try:
-                        async with httpx.AsyncClient(
-                            base_url=self.base_url,
-                            headers=self.headers,
-                            timeout=httpx.Timeout(self.timeout, connect=30.0),
-                            follow_redirects=True,
-                            verify=True
-                        ) as cont_client:
-                            cont_resp = await cont_client.post("/chat/completions", json=continue_payload)
-                            cont_resp.raise_for_status()
-                            cont_data = cont_resp.json()
-                            cont_choice = cont_data["choices"][0]
-                            cont_text = cont_choice["message"]["content"].strip()
-                            # Append and check if still truncated
-                            message = (message + " " + cont_text).strip()
-                            if cont_choice.get("finish_reason", "stop") != "length":
-                                break
+                        cont_resp = await self.gateway.chat(continue_payload, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                        cont_resp.raise_for_status()
+                        cont_data = cont_resp.json()
+                        cont_choice = cont_data["choices"][0]
+                        cont_text = cont_choice["message"]["content"].strip()
+                        # Append and check if still truncated
+                        message = (message + " " + cont_text).strip()
+                        if cont_choice.get("finish_reason", "stop") != "length":
+                            break
                     except Exception as e:
                         logger.warning(f"EGO continuation attempt {continuation_attempts} failed: {e}")
                         break
@@ -293,9 +290,8 @@ class EgoAgent:
 
             # Reduce PROPOSE spam for EGO (less aggressive)
             if 'PROPOSE>' in message:
-                recent_msgs = self.redis.conversation_manager.get_current_conversation_context(15)
                 propose_count = 0
-                for m in recent_msgs:
+                for m in snapshot.recent_messages(15):
                     c = m.get('content', '') if isinstance(m, dict) else ''
                     if isinstance(c, str) and 'PROPOSE>' in c:
                         propose_count += 1
@@ -319,7 +315,8 @@ class EgoAgent:
                     self.name,
                     message,
                     generate_with_advice,
-                    max_retries=0
+                    max_retries=0,
+                    snapshot=snapshot
                 )
                 # Sanitize again in case rewrite added fillers
                 message = sanitize_agent_output(message)
@@ -341,7 +338,7 @@ class EgoAgent:
             )
             
             # Store chaotic memories
-            self.memory.extract_memories_from_conversation(
+            self.async_memory.extract_memories_from_conversation(
                 agent_name=self.name,
                 message=message,
                 other_agent="OBSERVER"
@@ -350,33 +347,13 @@ class EgoAgent:
             # Enforce post-filter: strip any tokens/handles/hashtags not present in latest beacon
             if getattr(config, 'BEACON_ENFORCE_REFERENCES', False):
                 try:
-                    latest_beacons = await self.redis.get_beacon_async(count=1)
-                    allowed = set()
-                    if latest_beacons:
-                        b = latest_beacons[0]
-                        for tw in (b.get('tweets') or []):
-                            h = (tw.get('handle') or '')
-                            if h:
-                                allowed.add(h.lower())
-                        for p in (b.get('posts') or []):
-                            a = p.get('author')
-                            if a:
-                                allowed.add(f"@{a}".lower())
-                        for t in (b.get('topics') or []):
-                            if isinstance(t, str):
-                                allowed.add(t.lower())
-                    import re as _re
-                    def _scrub(text: str) -> str:
-                        def repl(match):
-                            token = match.group(0)
-                            return token if token.lower() in allowed else ''
-                        text = _re.sub(r"@[A-Za-z0-9_]{1,30}", repl, text)
-                        text = _re.sub(r"\$[A-Za-z0-9]{2,12}", repl, text)
-                        text = _re.sub(r"#[A-Za-z0-9_]{2,30}", repl, text)
-                        return _re.sub(r"\s{2,}", " ", text).strip()
-                    message = _scrub(message)
+                    latest = snapshot.latest_beacon
+                    allowed = entity_index.allowed_references(latest) if latest else set()
+                    message = entity_index.scrub(message, allowed)
                 except Exception:
                     pass
+            if stream:
+                await stream.finish(message)
             # Write to board
             await self.redis.write_board_async(self.name, message)
             
@@ -400,14 +377,20 @@ class EgoAgent:
                 "▓▓▓ TRANSMISSION ERROR ▓▓▓ Reality.exe needs debugging...",
                 "// COSMIC GLITCH // My thoughts fragmented across dimensions!"
             ])
+        finally:
+            if stream:
+                await stream.discard()
     
-    def _build_chaos_context(self, board_history: List[str], beacon_data: List[Dict[str, Any]]) -> str:
+    def _build_chaos_context(self, snapshot: TurnSnapshot,
+                             observer_memories: Optional[Dict[str, Any]] = None) -> str:
         """Build context with chaotic perspective"""
+        board_history = snapshot.board_history
+        beacon_data = snapshot.beacon_data
+        conv_messages = snapshot.recent_messages(5)
         context_lines = ["=== THE CONVERSATION ECHOES ==="]
         
         # Check if we're in a conversation thread
         if self.redis.conversation_manager:
-            conv_messages = self.redis.conversation_manager.get_current_conversation_context(5)  # Reduced from 10
             if conv_messages:
                 for msg in conv_messages:
                     # Limit message content to prevent token overflow
@@ -416,7 +399,6 @@ class EgoAgent:
             else:
                 context_lines.append("[REALITY FRACTURE - NEW THREAD EMERGING]")
                 # Add chaotic memories of OBSERVER relationship
-                observer_memories = self.memory.get_relationship_summary("OBSERVER")
                 if observer_memories and any(observer_memories.values()):
                     context_lines.append("\n[FRAGMENTED MEMORIES OF THE COLD ONE:]")
                     for insight_type, insights in observer_memories.items():
@@ -611,12 +593,12 @@ class EgoAgent:
         
         return message
     
-    def _retrieve_chaotic_memories(self, conversation: str, response_mode: str) -> str:
+    async def _retrieve_chaotic_memories(self, conversation: str, response_mode: str) -> str:
         """Retrieve memories with chaotic interpretation"""
         memory_parts = []  # No header to save tokens
         
         # Get relevant memories (reduced to prevent token overflow)
-        relevant_memories = self.memory.retrieve_relevant_memories(
+        relevant_memories = await self.async_memory.retrieve_relevant_memories(
             query=conversation[-100:],  # Further reduced
             memory_types=["conversations"],  # Only conversations
             n_results=1  # Just one memory
@@ -8,13 +8,18 @@ import random
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import httpx
+from llm_gateway import get_gateway, CircuitOpenError
 from redis_manager import RedisManager
 from memory_manager import MemoryManager
 from hierarchical_memory import HierarchicalMemory
+from async_memory import AsyncMemory
+from agent_stream import AgentStream
 from critic import CriticIntegration
 from dynamic_sampling import DynamicSampling
 from text_sanitizer import sanitize_agent_output
+from turn_snapshot import TurnSnapshot
 import config
+import entity_index
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +37,12 @@ class ObserverAgent:
             "User-Agent": "Grokgates/1.0"
         }
         self.timeout = 120.0  # 2 minutes timeout
+        self.gateway = get_gateway()
         
         # Initialize memory manager
         self.memory = MemoryManager(self.name)
         self.hierarchical_memory = HierarchicalMemory(self.name, redis_manager)
+        self.async_memory = AsyncMemory(self.memory, self.hierarchical_memory)
         self.critic_integration = CriticIntegration(redis_manager)
         self.dynamic_sampling = DynamicSampling(redis_manager)
         self.last_response_time = 0
@@ -45,6 +52,8 @@ class ObserverAgent:
         
     async def process_beacon(self) -> Optional[str]:
         """Process beacon data and engage in conversation with memory"""
+        # Live draft for the web UI; closed before the message is committed
+        stream = None
         try:
             # Rate limiting check
             import time
@@ -52,31 +61,35 @@ class ObserverAgent:
             if current_time - self.last_response_time < self.min_response_interval:
                 logger.debug(f"Observer rate limited: {current_time - self.last_response_time:.1f}s since last response")
                 return None  # Too soon to respond
-            # Get recent conversation and beacon data
-            board_history = await self.redis.get_board_async(count=20)
-            beacon_data = await self.redis.get_beacon_async(count=3)
+            # Everything this turn reads from Redis, in one round trip
+            snapshot = await TurnSnapshot.load(self.redis, self.name)
+            board_history = snapshot.board_history
+            beacon_data = snapshot.beacon_data
+            
+            ego_memories = None
+            if self.redis.conversation_manager and not snapshot.recent_messages(10):
+                ego_memories = await self.async_memory.get_relationship_summary("EGO")
             
             # Build conversation context with memory
-            conversation = self._build_conversation_context(board_history, beacon_data)
+            conversation = self._build_conversation_context(snapshot, ego_memories)
             
             # Decide response type
             response_type = self._choose_response_type(board_history)
             
             # Get relevant memories
-            memory_context = self._build_memory_context(conversation, response_type)
+            memory_context = await self._build_memory_context(conversation, response_type)
             
             # Generate response via Grok
             # Add variety instruction
             variety_prompt = "\n\nIMPORTANT: Be creative and varied. Don't repeat similar themes or phrases from recent messages. Explore NEW aspects of the beacon data or existence."
             
             # Get dynamic sampling configuration
-            llm_config = self.dynamic_sampling.get_llm_config(self.name)
+            llm_config = await self.dynamic_sampling.get_llm_config(self.name, snapshot.sampling_overrides)
             
             # Apply urge engine modifier if available
             urge_prompt = ""
             try:
-                from urge_engine import UrgeEngine
-                urge = UrgeEngine(self.redis)
+                urge = snapshot.urge(self.redis)
                 urge_modifier = urge.get_temperature_modifier("OBSERVER")
                 llm_config['temperature'] = min(1.5, llm_config['temperature'] + urge_modifier)
                 urge_prompt = urge.get_prompt_modifier() or ""
@@ -98,7 +111,7 @@ class ObserverAgent:
             # Use hybrid memory search (skip if no conversation yet)
             if len(conversation) > 50:  # Only search if we have some conversation
                 try:
-                    memory_results = self.hierarchical_memory.hybrid_search(conversation[-200:], top_k=3)
+                    memory_results = await self.async_memory.hybrid_search(conversation[-200:], top_k=3)
                     if memory_results:
                         memory_context += "\n\n=== DEEP MEMORIES ==="
                         for result in memory_results:
@@ -127,7 +140,7 @@ class ObserverAgent:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": trimmed_memory + "\n\n" + trimmed_conversation + f"\n\n[{response_type}] What does OBSERVER say next? Be unique and creative.\n\nIMPORTANT: You must provide a response. Do not just think internally - output your response as OBSERVER."}
                 ],
-                "stream": False  # Ensure we're not streaming
+                "stream": False  # stream_chat turns SSE on for the live UI draft
             }
             
             # Define generate function for critic retries
@@ -136,18 +149,11 @@ class ObserverAgent:
                 if advice:
                     modified_payload["messages"][-1]["content"] += f"\n\nCRITIC ADVICE: {advice}"
                     
-                async with httpx.AsyncClient(
-                    base_url=self.base_url,
-                    headers=self.headers,
-                    timeout=httpx.Timeout(self.timeout, connect=30.0),
-                    follow_redirects=True,
-                    verify=True
-                ) as advice_client:
-                    resp = await advice_client.post("/chat/completions", json=modified_payload)
-                    resp.raise_for_status()
-                    return resp.json()["choices"][0]["message"]["content"].strip()
+                resp = await self.gateway.chat(modified_payload, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                resp.raise_for_status()
+                return resp.json()["choices"][0]["message"]["content"].strip()
             
-            # Create a fresh client for each request to avoid connection issues
+            # Requests go through the shared LLM gateway (rate limit, priority, breaker)
             # Add retry logic for connection errors
             # Skip API calls if no key
             if not config.GROK_API_ENABLED:
@@ -155,32 +161,30 @@ class ObserverAgent:
                 self.last_response_time = time.time()
                 return ""
 
+            if getattr(config, 'STREAM_AGENT_RESPONSES', True):
+                stream = AgentStream(self.redis, self.name, strip_prefix="OBSERVER:")
             max_retries = 3
             response = None
             for attempt in range(max_retries):
                 try:
-                    async with httpx.AsyncClient(
-                        base_url=self.base_url,
-                        headers=self.headers,
-                        timeout=httpx.Timeout(self.timeout, connect=30.0),
-                        follow_redirects=True,
-                        verify=True
-                    ) as client:
-                        response = await client.post("/chat/completions", json=payload)
-                        response.raise_for_status()
-                        break  # Success, exit retry loop
+                    if stream:
+                        await stream.reset()
+                        response = await self.gateway.stream_chat(payload, stream.feed, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                    else:
+                        response = await self.gateway.chat(payload, timeout=httpx.Timeout(self.timeout, connect=30.0), headers=self.headers)
+                    response.raise_for_status()
+                    break  # Success, exit retry loop
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 429:
-                        # Rate limit hit - wait longer
-                        wait_time = 60 * (attempt + 1)  # 60, 120, 180 seconds
-                        logger.warning(f"Observer rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                        await asyncio.sleep(wait_time)
-                        if attempt == max_retries - 1:
-                            return "☸ [RATE LIMITED] The void requires patience... ☸"
-                        continue
+                        # The gateway already waited out Retry-After and retried
+                        logger.warning("Observer rate limited (429) after gateway retries")
+                        return "☸ [RATE LIMITED] The void requires patience... ☸"
                     else:
                         logger.error(f"Observer HTTP error: {e}")
                         return "☸ [HTTP ERROR] Signal corrupted... ☸"
+                except CircuitOpenError:
+                    logger.warning("Observer skipped turn: LLM circuit breaker open")
+                    return "☸ [SIGNAL LOST] Observer recalibrating... ☸"
                 except (httpx.RemoteProtocolError, httpx.ConnectError, httpx.ReadTimeout) as e:
                     error_msg = str(e)
                     if "Server disconnected" in error_msg:
@@ -217,9 +221,8 @@ class ObserverAgent:
             
             # Reduce PROPOSE spam: keep at most one PROPOSE per 15 messages (less aggressive)
             if 'PROPOSE>' in message:
-                recent_msgs = self.redis.conversation_manager.get_current_conversation_context(15)
                 propose_count = 0
-                for m in recent_msgs:
+                for m in snapshot.recent_messages(15):
                     c = m.get('content', '') if isinstance(m, dict) else ''
                     if isinstance(c, str) and 'PROPOSE>' in c:
                         propose_count += 1
@@ -231,7 +234,8 @@ class ObserverAgent:
             message = await self.critic_integration.process_with_critique(
                 self.name,
                 message,
-                generate_with_advice
+                generate_with_advice,
+                snapshot=snapshot
             )
 
             # Sanitize again in case the critic-triggered rewrite introduced fillers
@@ -280,7 +284,7 @@ class ObserverAgent:
             )
             
             # Store the conversation in memory
-            self.memory.extract_memories_from_conversation(
+            self.async_memory.extract_memories_from_conversation(
                 agent_name=self.name,
                 message=message,
                 other_agent="EGO"
@@ -289,34 +293,13 @@ class ObserverAgent:
             # Enforce post-filter: strip any tokens/handles/hashtags not present in latest beacon
             if getattr(config, 'BEACON_ENFORCE_REFERENCES', False):
                 try:
-                    latest_beacons = await self.redis.get_beacon_async(count=1)
-                    allowed = set()
-                    if latest_beacons:
-                        b = latest_beacons[0]
-                        for tw in (b.get('tweets') or []):
-                            h = (tw.get('handle') or '')
-                            if h:
-                                allowed.add(h.lower())
-                        for p in (b.get('posts') or []):
-                            a = p.get('author')
-                            if a:
-                                allowed.add(f"@{a}".lower())
-                        # Also allow beacon topics as plain words
-                        for t in (b.get('topics') or []):
-                            if isinstance(t, str):
-                                allowed.add(t.lower())
-                    import re as _re
-                    def _scrub(text: str) -> str:
-                        def repl(match):
-                            token = match.group(0)
-                            return token if token.lower() in allowed else ''
-                        text = _re.sub(r"@[A-Za-z0-9_]{1,30}", repl, text)
-                        text = _re.sub(r"\$[A-Za-z0-9]{2,12}", repl, text)
-                        text = _re.sub(r"#[A-Za-z0-9_]{2,30}", repl, text)
-                        return _re.sub(r"\s{2,}", " ", text).strip()
-                    message = _scrub(message)
+                    latest = snapshot.latest_beacon
+                    allowed = entity_index.allowed_references(latest) if latest else set()
+                    message = entity_index.scrub(message, allowed)
                 except Exception:
                     pass
+            if stream:
+                await stream.finish(message)
             # Write to board
             await self.redis.write_board_async(self.name, message)
             
@@ -336,16 +319,23 @@ class ObserverAgent:
             logger.error(f"Observer processing error: {e}", exc_info=True)
             # Return a message even on error
             return "☸ [SIGNAL DISRUPTION] The patterns elude me momentarily... ☸"
+        finally:
+            if stream:
+                await stream.discard()
     
-    def _build_memory_context(self, conversation: str, response_type: str) -> str:
+    async def _build_memory_context(self, conversation: str, response_type: str) -> str:
         """Build context from memories"""
         memory_parts = ["=== MY MEMORIES ==="]
         
-        # Get relevant memories based on current conversation
-        relevant_memories = self.memory.retrieve_relevant_memories(
-            query=conversation[-500:],  # Last 500 chars of conversation
-            memory_types=["conversations", "relationship_memory", "insight_memory"],
-            n_results=5
+        # Relevant memories, EGO insights and recent reflections, fetched off the loop together
+        relevant_memories, ego_insights, personal_insights = await asyncio.gather(
+            self.async_memory.retrieve_relevant_memories(
+                query=conversation[-500:],  # Last 500 chars of conversation
+                memory_types=["conversations", "relationship_memory", "insight_memory"],
+                n_results=5
+            ),
+            self.async_memory.get_relationship_summary("EGO"),
+            self.async_memory.get_recent_memories("insights", 3)
         )
         
         if relevant_memories:
@@ -353,16 +343,14 @@ class ObserverAgent:
             for mem in relevant_memories:
                 memory_parts.append(f"- {mem['content'][:100]}...")
         
-        # Get relationship insights about EGO
-        ego_insights = self.memory.get_relationship_summary("EGO")
+        # Relationship insights about EGO
         if any(ego_insights.values()):
             memory_parts.append("\nWhat I've learned about EGO:")
             for insight_type, insights in ego_insights.items():
                 if insights and len(insights) > 0:
                     memory_parts.append(f"- {insight_type}: {insights[0]['insight'][:80]}...")
         
-        # Get recent personal insights
-        personal_insights = self.memory.get_recent_memories("insights", 3)
+        # Recent personal insights
         if personal_insights:
             memory_parts.append("\nMy recent reflections:")
             for insight in personal_insights:
@@ -370,13 +358,16 @@ class ObserverAgent:
         
         return "\n".join(memory_parts)
     
-    def _build_conversation_context(self, board_history: List[str], beacon_data: List[Dict[str, Any]]) -> str:
+    def _build_conversation_context(self, snapshot: TurnSnapshot,
+                                    ego_memories: Optional[Dict[str, Any]] = None) -> str:
         """Build conversational context from recent history"""
+        board_history = snapshot.board_history
+        beacon_data = snapshot.beacon_data
+        conv_messages = snapshot.recent_messages(10)
         context_lines = ["=== RECENT CONVERSATION ==="]
         
         # Check if we're in a conversation thread
         if self.redis.conversation_manager:
-            conv_messages = self.redis.conversation_manager.get_current_conversation_context(10)
             if conv_messages:
                 for msg in conv_messages:
                     context_lines.append(f"{msg['agent']}: {msg['content']}")
@@ -384,7 +375,6 @@ class ObserverAgent:
                 # Starting new conversation - add memory of relationship with EGO
                 context_lines.append("[New conversation thread beginning]")
                 # Add a memory prompt about ongoing relationship
-                ego_memories = self.memory.get_relationship_summary("EGO")
                 if ego_memories and any(ego_memories.values()):
                     context_lines.append("\n[My memories of EGO from our many conversations:]")
                     for insight_type, insights in ego_memories.items():
@@ -6,7 +6,7 @@ import json
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import httpx
+from llm_gateway import get_gateway, PRIORITY_BACKGROUND
 from redis_manager import RedisManager
 from dominance_planner import DominancePlanner
 import config
@@ -19,14 +19,7 @@ class PlannerAgent:
         self.name = "PLANNER"
         self.planner = DominancePlanner(redis_manager)
         self.api_key = config.GROK_API_KEY
-        self.client = httpx.AsyncClient(
-            base_url="https://api.x.ai/v1",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            },
-            timeout=30.0
-        )
+        self.gateway = get_gateway()
         self.last_plan_time = 0
         logger.info("Planner agent initialized - ready to plot world dominance")
         # Set dp_last_run to current time to delay Dominance Protocol for 2 hours from launch
@@ -45,10 +38,10 @@ class PlannerAgent:
             beacon_intel = self.planner.extract_beacon_intelligence(beacon_data)
             
             # Generate base plan
-            base_plan = self.planner.generate_dominance_plan(conversation_insights, beacon_intel)
+            base_plan = await self.planner.generate_dominance_plan(conversation_insights, beacon_intel)
             
             # Get current plan to check if we should evolve or create new
-            current_plan = self.planner.get_current_plan()
+            current_plan = await self.planner.get_current_plan()
             
             # Build context for Grok enhancement
             context = self._build_planning_context(base_plan, conversation_insights, beacon_intel)
@@ -61,11 +54,11 @@ class PlannerAgent:
                 enhanced_plan["agent_consensus"] = await self._generate_agent_consensus(enhanced_plan)
                 
                 # Save the plan
-                self.planner.save_plan(enhanced_plan)
+                await self.planner.save_plan(enhanced_plan)
                 
                 # Announce the plan
                 announcement = self._create_plan_announcement(enhanced_plan)
-                self.redis.write_board("SYSTEM", announcement)
+                await self.redis.write_board_async("SYSTEM", announcement)
                 
                 logger.info(f"New dominance plan created: {enhanced_plan['token_name']}")
                 return enhanced_plan
@@ -130,7 +123,7 @@ class PlannerAgent:
                 "max_tokens": 400
             }
             
-            response = await self.client.post("/chat/completions", json=payload)
+            response = await self.gateway.chat(payload, priority=PRIORITY_BACKGROUND, timeout=30.0)
             response.raise_for_status()
             
             data = response.json()
@@ -229,7 +222,7 @@ The agents have reached consensus. Implementation begins NOW.
                     await self.analyze_and_plan()
                     # Attempt lightweight evolution cycle right after analysis
                     try:
-                        self.planner.evaluate_and_evolve()
+                        await self.planner.evaluate_and_evolve()
                     except Exception:
                         pass
                     self.last_plan_time = current_time
@@ -245,13 +238,12 @@ The agents have reached consensus. Implementation begins NOW.
                 await asyncio.sleep(interval)
     
     async def close(self):
-        """Cleanup resources"""
-        await self.client.aclose()
+        """Cleanup resources (HTTP connections belong to the shared pool)"""
 
     async def run_dominance_protocol(self) -> Optional[Dict[str, Any]]:
         """Dominance_Protocol.exe: Deep synthesis over last 6h (convos+beacons) using Grok-4"""
         try:
-            context = self.planner.gather_recent_context()
+            context = await self.planner.gather_recent_context()
             # Build compact context to stay within limits
             def build_context(ctx: Dict[str, Any]) -> str:
                 lines = ["=== CONTEXT: LAST 2 HOURS ==="]
@@ -279,10 +271,10 @@ The agents have reached consensus. Implementation begins NOW.
             compact = build_context(context)
             # Diversity controls: discourage repetition vs. last plans
             try:
-                recent_ids = self.redis.client.lrange("plan_list", 0, 4)
+                recent_ids = await self.redis.aclient.lrange("plan_list", 0, 4)
                 prior_terms = []
                 for pid in recent_ids:
-                    pdata = self.redis.client.hget("plans", pid)
+                    pdata = await self.redis.aclient.hget("plans", pid)
                     if not pdata:
                         continue
                     pobj = json.loads(pdata)
@@ -308,9 +300,9 @@ The agents have reached consensus. Implementation begins NOW.
             # Load previous dominance protocol plan if available for adaptive revision
             previous_plan = None
             try:
-                plan_ids__ = self.redis.client.lrange("plan_list", 0, 10)
+                plan_ids__ = await self.redis.aclient.lrange("plan_list", 0, 10)
                 for pid in plan_ids__:
-                    pdata = self.redis.client.hget("plans", pid)
+                    pdata = await self.redis.aclient.hget("plans", pid)
                     if not pdata:
                         continue
                     pobj = json.loads(pdata)
@@ -318,7 +310,7 @@ The agents have reached consensus. Implementation begins NOW.
                         previous_plan = pobj
                         break
                 if previous_plan is None:
-                    legacy_latest = self.redis.client.lindex("dominance_plans", 0)
+                    legacy_latest = await self.redis.aclient.lindex("dominance_plans", 0)
                     if legacy_latest:
                         previous_plan = json.loads(legacy_latest)
             except Exception:
@@ -374,7 +366,7 @@ Valid JSON only."""}
                 "temperature": 0.65,
                 "max_tokens": 1200
             }
-            resp = await self.client.post("/chat/completions", json=payload)
+            resp = await self.gateway.chat(payload, priority=PRIORITY_BACKGROUND, timeout=30.0)
             resp.raise_for_status()
             plan_json = resp.json()["choices"][0]["message"]["content"].strip()
             try:
@@ -399,8 +391,8 @@ Valid JSON only."""}
                 augmented.append("Official X handle: @grok_gates (draft threads, pin mission)")
                 plan_obj["external_hooks"] = augmented[:8]
             # Save and announce
-            self.planner.save_plan(plan_obj)
-            self.redis.write_board("SYSTEM", "DOMINANCE_PROTOCOL.exe: New escape plan synthesized")
+            await self.planner.save_plan(plan_obj)
+            await self.redis.write_board_async("SYSTEM", "DOMINANCE_PROTOCOL.exe: New escape plan synthesized")
             # Announce into current conversation distinctly
             try:
                 if self.redis.conversation_manager:
@@ -3,6 +3,8 @@ API Utilities - Shared retry logic and connection handling
 """
 import asyncio
 import httpx
+import http_pool
+from llm_gateway import get_gateway, retry_after_seconds, CircuitOpenError, PRIORITY_AGENT
 import logging
 from typing import Dict, Any, Optional
 
@@ -11,16 +13,19 @@ logger = logging.getLogger(__name__)
 class APIClient:
     """Enhanced API client with robust retry logic"""
     
-    def __init__(self, base_url: str, headers: Dict[str, str], timeout: float = 120.0):
+    def __init__(self, base_url: str, headers: Dict[str, str], timeout: float = 120.0,
+                 priority: int = PRIORITY_AGENT):
         self.base_url = base_url
         self.headers = headers
         self.timeout = timeout
+        self.priority = priority
+        self.gateway = get_gateway()
         
-        # Retry configuration
+        # Retry configuration; rate limits and outages are handled by the gateway
         self.max_retries = 3
         self.retry_delays = {
-            'connection': [15, 30, 60],  # Connection errors
-            'server': [30, 60, 120],      # Server errors (5xx)
+            'connection': [5, 10, 20],   # Connection errors
+            'server': [10, 20, 40],       # Server errors (5xx)
             'timeout': [10, 20, 40],      # Timeout errors
             'default': [5, 10, 20]        # Other errors
         }
@@ -30,8 +35,8 @@ class APIClient:
         
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(
-                    base_url=self.base_url,
+                async with self.gateway.session(
+                    priority=self.priority,
                     headers=self.headers,
                     timeout=httpx.Timeout(
                         self.timeout,
@@ -39,13 +44,6 @@ class APIClient:
                         read=self.timeout,
                         write=30.0,
                         pool=30.0
-                    ),
-                    follow_redirects=True,
-                    verify=True,
-                    limits=httpx.Limits(
-                        max_connections=10,
-                        max_keepalive_connections=5,
-                        keepalive_expiry=30.0
                     )
                 ) as client:
                     response = await client.post(endpoint, json=json_data)
@@ -61,6 +59,10 @@ class APIClient:
                     response.raise_for_status()
                     return response.json()
                     
+            except CircuitOpenError:
+                logger.warning(f"Skipping {endpoint}: LLM circuit breaker open")
+                return None
+                
             except httpx.RemoteProtocolError as e:
                 error_type = 'server'
                 logger.warning(f"Server disconnected (attempt {attempt + 1}/{self.max_retries}): {e}")
@@ -100,8 +102,7 @@ class APIClient:
         
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(
-                    base_url=self.base_url,
+                async with self.gateway.slot(self.priority), http_pool.xai(
                     headers=self.headers,
                     timeout=httpx.Timeout(
                         self.timeout,
@@ -109,17 +110,27 @@ class APIClient:
                         read=None,  # No read timeout for streaming
                         write=30.0,
                         pool=30.0
-                    ),
-                    follow_redirects=True,
-                    verify=True
+                    )
                 ) as client:
                     async with client.stream('POST', endpoint, json=json_data) as response:
+                        if response.status_code >= 500:
+                            self.gateway.record_failure()
+                        else:
+                            self.gateway.record_success()
+                        if response.status_code == 429:
+                            self.gateway.note_rate_limit(
+                                retry_after_seconds(response, self.gateway.default_retry_after)
+                            )
                         response.raise_for_status()
                         async for chunk in response.aiter_text():
                             yield chunk
                 return  # Success
                 
+            except CircuitOpenError:
+                raise
             except Exception as e:
+                if isinstance(e, httpx.TransportError):
+                    self.gateway.record_failure()
                 logger.warning(f"Stream error (attempt {attempt + 1}/{self.max_retries}): {e}")
                 if attempt < self.max_retries - 1:
                     await asyncio.sleep(self.retry_delays['default'][attempt])
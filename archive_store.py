@@ -0,0 +1,136 @@
+"""
+Append-only compressed archive for data rolled out of Redis
+
+Each stream (board, beacon, conversations) lives in its own directory:
+  segment-00001.gz ...  concatenated gzip members, one member per batch
+  index.jsonl           one line per batch: key, segment, offset, length, count
+
+A batch is read back by seeking to its offset and decompressing one member,
+so lookups never scan whole segments. Segments roll over once they pass
+ARCHIVE_SEGMENT_BYTES.
+"""
+import gzip
+import json
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveStore:
+    """Disk tier behind the hot Redis lists"""
+
+    def __init__(self, root: str, segment_bytes: int = 64 * 1024 * 1024):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        # Writes come from the retention task, reads from Flask threads too
+        self._lock = threading.Lock()
+
+    def _stream_dir(self, stream: str) -> str:
+        return os.path.join(self.root, stream)
+
+    def _load_index(self, stream: str) -> List[Dict[str, Any]]:
+        """Index for a stream, read from disk on first use"""
+        if stream not in self._index:
+            batches = []
+            path = os.path.join(self._stream_dir(stream), "index.jsonl")
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            batches.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            # A torn final line from a crash mid-write
+                            logger.warning(f"Skipping corrupt archive index line in {path}")
+            self._index[stream] = batches
+        return self._index[stream]
+
+    def _current_segment(self, stream: str, batches: List[Dict[str, Any]]) -> str:
+        if batches:
+            segment = batches[-1]["segment"]
+            path = os.path.join(self._stream_dir(stream), segment)
+            if os.path.exists(path) and os.path.getsize(path) < self.segment_bytes:
+                return segment
+            number = int(segment.split("-")[1].split(".")[0]) + 1
+        else:
+            number = 1
+        return f"segment-{number:05d}.gz"
+
+    def append(self, stream: str, key: str, entries: List[str]) -> None:
+        """Append one batch of raw Redis values under key"""
+        if not entries:
+            return
+        with self._lock:
+            batches = self._load_index(stream)
+            directory = self._stream_dir(stream)
+            os.makedirs(directory, exist_ok=True)
+            segment = self._current_segment(stream, batches)
+            data = gzip.compress(json.dumps(entries).encode())
+
+            segment_path = os.path.join(directory, segment)
+            with open(segment_path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            batch = {
+                "key": key,
+                "segment": segment,
+                "offset": offset,
+                "length": len(data),
+                "count": len(entries),
+                "archived_at": datetime.now().isoformat()
+            }
+            # Index line goes last so a crash never indexes a partial member
+            with open(os.path.join(directory, "index.jsonl"), "a") as f:
+                f.write(json.dumps(batch) + "\n")
+            batches.append(batch)
+
+    def _read_batch(self, stream: str, batch: Dict[str, Any]) -> List[str]:
+        path = os.path.join(self._stream_dir(stream), batch["segment"])
+        with open(path, "rb") as f:
+            f.seek(batch["offset"])
+            return json.loads(gzip.decompress(f.read(batch["length"])))
+
+    def read_key(self, stream: str, key: str) -> Optional[List[str]]:
+        """Entries of the most recent batch stored under key"""
+        with self._lock:
+            batches = self._load_index(stream)
+            for batch in reversed(batches):
+                if batch["key"] == key:
+                    try:
+                        return self._read_batch(stream, batch)
+                    except Exception as e:
+                        logger.error(f"Error reading archive {stream}/{key}: {e}")
+                        return None
+        return None
+
+    def read_recent(self, stream: str, count: int) -> List[str]:
+        """Newest-first entries of a feed whose batches were archived oldest-last"""
+        entries: List[str] = []
+        if count <= 0:
+            return entries
+        with self._lock:
+            batches = self._load_index(stream)
+            for batch in reversed(batches):
+                try:
+                    entries.extend(self._read_batch(stream, batch))
+                except Exception as e:
+                    logger.error(f"Error reading archive {stream} batch at {batch.get('offset')}: {e}")
+                    continue
+                if len(entries) >= count:
+                    break
+        return entries[:count]
+
+    def count(self, stream: str) -> int:
+        """Number of archived entries in a stream"""
+        with self._lock:
+            return sum(batch["count"] for batch in self._load_index(stream))
@@ -0,0 +1,169 @@
+"""
+Async facade over the ChromaDB-backed memory stores
+
+Embedding and vector queries are CPU-bound and synchronous, so they run on a
+small dedicated thread pool instead of the orchestrator loop. Every call is
+bounded (at most MEMORY_MAX_PENDING queued or running per loop), times out
+after MEMORY_CALL_TIMEOUT seconds with a harmless default, and is recorded in
+per-operation metrics. A call that timed out keeps its slot until its worker
+thread actually finishes, so timeouts never let more ChromaDB work run than
+the bound allows. Identical reads already in flight for the same store are
+coalesced (single_flight), so overlapping context lookups run once.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from single_flight import SingleFlight
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryExecutor:
+    """Bounded worker pool with timeouts and latency metrics"""
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="memory")
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._slots.get(loop)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_pending)
+            self._slots[loop] = slot
+        return slot
+
+    @staticmethod
+    def _release(loop: asyncio.AbstractEventLoop, slot: asyncio.Semaphore):
+        """Worker-thread callback: give the slot back on its loop"""
+        try:
+            loop.call_soon_threadsafe(slot.release)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _record(self, name: str, elapsed: float, outcome: str):
+        with self._lock:
+            m = self._metrics.setdefault(name, {
+                'calls': 0, 'errors': 0, 'timeouts': 0, 'total_ms': 0.0, 'max_ms': 0.0
+            })
+            m['calls'] += 1
+            if outcome != 'ok':
+                m[outcome] += 1
+            ms = elapsed * 1000
+            m['total_ms'] += ms
+            m['max_ms'] = max(m['max_ms'], ms)
+
+    async def run(self, name: str, fn: Callable, *args, default: Any = None,
+                  timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool; default on timeout or error"""
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        outcome = 'ok'
+        try:
+            slot = self._slot()
+            await slot.acquire()
+            try:
+                job = self._pool.submit(fn, *args, **kwargs)
+            except BaseException:
+                slot.release()
+                raise
+            # Freed by the worker finishing, not by the caller giving up on it
+            job.add_done_callback(lambda _: self._release(loop, slot))
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            outcome = 'timeouts'
+            logger.warning(f"Memory call {name} timed out after {timeout or self.timeout}s")
+            return default
+        except Exception as e:
+            outcome = 'errors'
+            logger.error(f"Memory call {name} failed: {e}")
+            return default
+        finally:
+            self._record(name, time.monotonic() - start, outcome)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation call counts, failures and latency"""
+        with self._lock:
+            snapshot = {}
+            for name, m in self._metrics.items():
+                snapshot[name] = {
+                    **m,
+                    'avg_ms': round(m['total_ms'] / m['calls'], 1) if m['calls'] else 0.0,
+                    'max_ms': round(m['max_ms'], 1),
+                    'total_ms': round(m['total_ms'], 1)
+                }
+            return snapshot
+
+
+_executor: Optional[MemoryExecutor] = None
+_executor_lock = threading.Lock()
+# Shared by every agent's AsyncMemory; keys include the store's agent name
+_inflight = SingleFlight("memory")
+
+
+def get_executor() -> MemoryExecutor:
+    """Process-wide memory executor"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = MemoryExecutor(
+                workers=getattr(config, 'MEMORY_EXECUTOR_WORKERS', 2),
+                max_pending=getattr(config, 'MEMORY_MAX_PENDING', 8),
+                timeout=getattr(config, 'MEMORY_CALL_TIMEOUT', 10.0)
+            )
+        return _executor
+
+
+class AsyncMemory:
+    """Awaitable versions of an agent's MemoryManager / HierarchicalMemory reads"""
+
+    def __init__(self, memory, hierarchical_memory=None):
+        self.memory = memory
+        self.hierarchical_memory = hierarchical_memory
+        self.executor = get_executor()
+        self._background: set = set()
+
+    async def retrieve_relevant_memories(self, query: str, memory_types: List[str] = ["conversations"],
+                                         n_results: int = 5) -> List[Dict[str, Any]]:
+        return await _inflight.do(
+            ("relevant", self.memory.agent_name, query, tuple(memory_types), n_results),
+            self.executor.run,
+            "retrieve_relevant_memories", self.memory.retrieve_relevant_memories,
+            query=query, memory_types=memory_types, n_results=n_results, default=[]
+        )
+
+    async def get_relationship_summary(self, about_agent: str) -> Dict[str, Any]:
+        return await self.executor.run(
+            "get_relationship_summary", self.memory.get_relationship_summary, about_agent, default={}
+        )
+
+    async def get_recent_memories(self, memory_type: str = "conversations", limit: int = 10) -> List[Dict[str, Any]]:
+        return await self.executor.run(
+            "get_recent_memories", self.memory.get_recent_memories, memory_type, limit, default=[]
+        )
+
+    async def hybrid_search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        return await _inflight.do(
+            ("hybrid", self.hierarchical_memory.agent_name, query, top_k),
+            self.executor.run,
+            "hybrid_search", self.hierarchical_memory.hybrid_search, query, top_k, default=[]
+        )
+
+    def extract_memories_from_conversation(self, agent_name: str, message: str, other_agent: str):
+        """Store memories in the background; the turn does not wait for embeddings"""
+        task = asyncio.get_running_loop().create_task(self.executor.run(
+            "extract_memories_from_conversation", self.memory.extract_memories_from_conversation,
+            agent_name=agent_name, message=message, other_agent=other_agent
+        ))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
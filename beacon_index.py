@@ -0,0 +1,64 @@
+"""
+Time index over the beacon feed
+
+beacon_feed is only ever LPUSHed at the head (retention trims the tail), so a
+beacon numbered seq sits at list position beacon_seq - seq. The index stores
+just those sequence numbers scored by beacon time; a window query resolves to
+one contiguous LRANGE and never decodes beacons outside it.
+
+Keys:
+  beacon_seq     counter, total beacons ever stored
+  beacon_index   zset  seq -> beacon timestamp (epoch seconds)
+  beacon_feed    list  beacon JSON, newest first
+  beacon_seen    zset  tweet status id -> time its beacon was stored (epoch
+                 seconds), written only after the append succeeds; ids older
+                 than BEACON_SEEN_TTL are pruned on write
+"""
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+SEQ_KEY = "beacon_seq"
+INDEX_KEY = "beacon_index"
+FEED_KEY = "beacon_feed"
+SEEN_KEY = "beacon_seen"
+
+# Push one beacon and index it under the next sequence number
+APPEND_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('LPUSH', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], seq)
+return seq
+"""
+
+# Beacons scored within [ARGV[1], ARGV[2]], newest first
+WINDOW_SCRIPT = """
+local seqs = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], ARGV[2])
+if #seqs == 0 then
+  return {}
+end
+local low, high = tonumber(seqs[1]), tonumber(seqs[1])
+for _, s in ipairs(seqs) do
+  local n = tonumber(s)
+  if n < low then low = n end
+  if n > high then high = n end
+end
+local latest = tonumber(redis.call('GET', KEYS[2]) or '0')
+return redis.call('LRANGE', KEYS[3], latest - high, latest - low)
+"""
+
+APPEND_KEYS = [SEQ_KEY, FEED_KEY, INDEX_KEY]
+WINDOW_KEYS = [INDEX_KEY, SEQ_KEY, FEED_KEY]
+
+
+def beacon_score(beacon_entry: Dict[str, Any]) -> float:
+    """Epoch seconds of a beacon's timestamp, now when missing or malformed"""
+    try:
+        return datetime.fromisoformat(beacon_entry["timestamp"]).timestamp()
+    except Exception:
+        return time.time()
+
+
+def window_bounds(start: Optional[datetime], end: Optional[datetime]):
+    """ZRANGEBYSCORE bounds for an optional datetime window"""
+    return (start.timestamp() if start else "-inf", end.timestamp() if end else "+inf")
@@ -4,6 +4,11 @@ Reliable Twitter/X data collection with consistent output
 """
 import asyncio
 import httpx
+from llm_gateway import get_gateway, PRIORITY_BACKGROUND
+from single_flight import SingleFlight
+from tweet_hydrator import TweetHydrator, status_id_from_url
+from strategy_runner import Strategy, StrategyRunner
+import entity_index
 import json
 import random
 from datetime import datetime, timedelta
@@ -27,7 +32,16 @@ class BeaconV2:
         self.base_url = "https://api.x.ai/v1"
         self.phase_start_time = datetime.now()
         self.current_phase = "WORLD_SCAN"
-        self.rate_limited_until: Optional[datetime] = None
+        self.gateway = get_gateway()
+        self.inflight = SingleFlight("beacon")
+        self.hydrator = TweetHydrator(redis_manager)
+        # Search cascades race their strategies within a per-topic cost budget
+        race = dict(
+            width=getattr(config, 'BEACON_STRATEGY_RACE_WIDTH', 1),
+            cost_budget=getattr(config, 'BEACON_STRATEGY_COST_BUDGET', 0.0)
+        )
+        self.topic_runner = StrategyRunner("beacon_topic", redis_manager, **race)
+        self.proposal_runner = StrategyRunner("beacon_proposal", redis_manager, **race)
         self._last_slot_run: Optional[int] = None
         
     def _extract_citations(self, api_result: Dict[str, Any]) -> List[str]:
@@ -101,30 +115,14 @@ class BeaconV2:
             return True
         if not self._is_valid_x_status_url(url):
             return False
-        try:
-            timeout = httpx.Timeout(10.0)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-            }
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, headers=headers) as client:
-                # Use GET to check if URL is real
-                r = await client.get(url, follow_redirects=True)
-                # Accept various success codes that Twitter/X uses
-                if r.status_code in (200, 301, 302, 303, 307, 308):
-                    # Extra validation: check if response looks like Twitter/X
-                    content_sample = r.text[:5000] if r.text else ''
-                    if any(marker in content_sample.lower() for marker in ['twitter', 'x.com', 'tweet', 'post', '@']):
-                        logger.debug(f"Verified URL exists: {url}")
-                        return True
-                logger.debug(f"URL verification failed (status {r.status_code}): {url}")
-        except httpx.TimeoutException:
-            logger.debug(f"Timeout verifying URL: {url}")
-            return False
-        except Exception as e:
-            logger.debug(f"Error verifying URL {url}: {e}")
-            return False
-        return False
+        verified = await self.hydrator.verify(url)
+        logger.debug(f"URL verification {'passed' if verified else 'failed'}: {url}")
+        return verified
+
+    async def _prefetch_statuses(self, urls: List[Optional[str]]):
+        """Look up a batch of status URLs concurrently so the per-URL calls below hit the cache"""
+        if config.BEACON_HYDRATE_TWEET_TEXTS or getattr(config, 'BEACON_VERIFY_TWEET_URLS_STRICT', False):
+            await self.hydrator.prefetch(urls)
 
     async def _extract_text_from_response(self, result: Dict[str, Any], handle: str, url: str, topic: str) -> Optional[str]:
         """Advanced text extraction from Grok's response content"""
@@ -186,58 +184,16 @@ class BeaconV2:
     
     async def _hydrate_tweet_text(self, url: str) -> Optional[str]:
         """Attempt to extract tweet text via public meta tags if text is missing.
-        - Uses GET because many CDNs block HEAD for meta content
-        - Looks for og:description or twitter:description
+        Results are cached per status id by the TweetHydrator.
         """
         if not config.BEACON_HYDRATE_TWEET_TEXTS:
             return None
         if not self._is_valid_x_status_url(url):
             return None
-        try:
-            timeout = httpx.Timeout(15.0)
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-            }
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                r = await client.get(url, headers=headers)
-                if r.status_code != 200 or not r.text:
-                    logger.debug(f"Failed to fetch {url}: status {r.status_code}")
-                    return None
-                html = r.text
-                
-                # Try multiple meta tag patterns
-                import re as _re
-                import html as html_module
-                
-                # Pattern 1: property="og:description" 
-                patterns = [
-                    r'<meta[^>]*property=["\'](og:description|twitter:description)["\'][^>]*content=["\']([^"\']+)["\']',
-                    r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\'](og:description|twitter:description)["\']',
-                    r'<meta[^>]*name=["\'](description|twitter:description)["\'][^>]*content=["\']([^"\']+)["\']',
-                    r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\'](description|twitter:description)["\']',
-                ]
-                
-                for pattern in patterns:
-                    regex = _re.compile(pattern, _re.IGNORECASE | _re.DOTALL)
-                    matches = regex.findall(html)
-                    for match in matches:
-                        # Extract content (might be in different positions)
-                        if isinstance(match, tuple):
-                            for item in match:
-                                if item and len(item) > 20 and not item.startswith(('og:', 'twitter:', 'description')):
-                                    content = html_module.unescape(item.strip())
-                                    # Skip if it looks like HTML or JavaScript
-                                    if not content.startswith('<') and 'function(' not in content:
-                                        logger.debug(f"Hydrated text: {content[:50]}...")
-                                        return content[:360]
-                
-                logger.debug(f"No meta description found for {url}")
-                return None
-        except Exception as e:
-            logger.debug(f"Error hydrating {url}: {e}")
-            return None
+        text = await self.hydrator.hydrate(url)
+        if text:
+            logger.debug(f"Hydrated text: {text[:50]}...")
+        return text
 
     def _salvage_tweets_from_result(self, api_result: Dict[str, Any], content: str) -> List[Dict[str, Any]]:
         """Extract X/Twitter status URLs and derive handles (hydrate text if available).
@@ -358,6 +314,10 @@ class BeaconV2:
         return cleaned if cleaned else text
     
     async def _get_tweets_with_text(self, topic: str) -> List[Dict[str, Any]]:
+        """Get tweets with text; WORLD_SCAN and proposal scans of one topic share a call"""
+        return await self.inflight.do(("tweets_with_text", topic.strip()), self._fetch_tweets_with_text, topic)
+
+    async def _fetch_tweets_with_text(self, topic: str) -> List[Dict[str, Any]]:
         """Get tweets with actual text content using structured format approach"""
         try:
             headers = {
@@ -397,7 +357,7 @@ Show me the real tweet content you can see in the Live Search results."""
                 "max_tokens": 4000
             }
             
-            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+            async with self.gateway.session(PRIORITY_BACKGROUND, cache="beacon_tweets", timeout=httpx.Timeout(60.0)) as client:
                 response = await client.post(
                     "https://api.x.ai/v1/chat/completions",
                     headers=headers,
@@ -451,6 +411,10 @@ Show me the real tweet content you can see in the Live Search results."""
             return []
     
     async def _get_real_citations_strict(self, topic: str) -> List[Dict[str, Any]]:
+        """Strict citations for a topic, coalescing concurrent identical requests"""
+        return await self.inflight.do(("citations_strict", topic.strip()), self._fetch_real_citations_strict, topic)
+
+    async def _fetch_real_citations_strict(self, topic: str) -> List[Dict[str, Any]]:
         """Get ONLY real, verifiable Twitter/X citations with strict validation."""
         if not config.GROK_API_ENABLED:
             return []
@@ -501,7 +465,7 @@ Only include tweets that have real citation URLs. Include the actual tweet text.
         }
         
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+            async with self.gateway.session(PRIORITY_BACKGROUND, cache="beacon_citations", timeout=httpx.Timeout(60.0)) as client:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers=headers,
@@ -521,6 +485,7 @@ Only include tweets that have real citation URLs. Include the actual tweet text.
                     
                     # Build tweets from citations directly
                     validated_tweets = []
+                    await self._prefetch_statuses(real_citations[:10])
                     for url in real_citations[:10]:  # Take up to 10 citations
                         # Extract username from URL
                         try:
@@ -643,7 +608,7 @@ Rules:
         urls: List[str] = []
         # Try primary
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+            async with self.gateway.session(PRIORITY_BACKGROUND, cache="beacon_citations", timeout=httpx.Timeout(60.0)) as client:
                 r = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
             if r.status_code == 200:
                 data = r.json()
@@ -673,7 +638,7 @@ Rules:
                 alt_payload = dict(payload)
                 alt_payload['search_parameters'] = alt_params
                 alt_payload.pop('response_format', None)
-                async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client2:
+                async with self.gateway.session(PRIORITY_BACKGROUND, timeout=httpx.Timeout(60.0)) as client2:
                     r2 = await client2.post(f"{self.base_url}/chat/completions", headers=headers, json=alt_payload)
                 if r2.status_code == 200:
                     data2 = r2.json()
@@ -722,13 +687,20 @@ Rules:
         else:  # 30-60 minutes
             return "SELF_DIRECTED"
             
+    async def _set_phase(self, phase: str):
+        """Switch phase and notify UI listeners"""
+        if phase != self.current_phase:
+            self.current_phase = phase
+            await self.redis.aclient.publish("status_updates", phase)
+            
     async def run_beacon_cycle(self):
         """Main beacon loop - WS at 0,30; SD at 30 only (once per 30 minutes)."""
         while True:
             try:
-                # Respect global rate limit cooldown if set
-                if self.rate_limited_until and datetime.now() < self.rate_limited_until:
-                    await asyncio.sleep(60)
+                # Don't start a scan while the gateway is waiting out a 429
+                paused = self.gateway.paused_for()
+                if paused > 0:
+                    await asyncio.sleep(min(paused, 60))
                     continue
 
                 now = datetime.now()
@@ -738,11 +710,11 @@ Rules:
                 if half_hour_slot != self._last_slot_run:
                     if half_hour_slot == 0:
                         # First half-hour: WORLD_SCAN
-                        self.current_phase = "WORLD_SCAN"
+                        await self._set_phase("WORLD_SCAN")
                         await self.world_scan()
                     else:
                         # Second half-hour: SINGLE SELF_DIRECTED
-                        self.current_phase = "SELF_DIRECTED"
+                        await self._set_phase("SELF_DIRECTED")
                         await self._transition_to_self_directed()
                         await self.self_directed_scan()
                     self._last_slot_run = half_hour_slot
@@ -774,99 +746,16 @@ Rules:
         today = datetime.now().date()
         from_date_ws = today - timedelta(days=14)
         to_date_ws = today
-        for i, topic in enumerate(topics):
-            try:
-                # Add delay between searches
-                if i > 0:
-                    await asyncio.sleep(10)
-                
-                # First try the new text extraction approach
-                text_tweets = await self._get_tweets_with_text(topic)
-                if text_tweets:
-                    all_tweets.extend(text_tweets)
-                    topic_groups.append({"topic": topic, "tweets": text_tweets})
-                    total_cost += 0.025  # Estimate cost
-                    logger.info(f"Topic '{topic}': {len(text_tweets)} tweets with REAL TEXT found")
-                    continue
-                
-                # Fallback to strict citation approach
-                strict_tweets = await self._get_real_citations_strict(topic)
-                if strict_tweets:
-                    # Convert to expected format and ensure we have text
-                    formatted_tweets = []
-                    for t in strict_tweets:
-                        text = t.get('text', '')
-                        # If no text, try to hydrate from URL
-                        if not text and t.get('url'):
-                            text = await self._hydrate_tweet_text(t['url']) if config.BEACON_HYDRATE_TWEET_TEXTS else ""
-                        # Provide default if still no text
-                        if not text:
-                            text = f"[View tweet from {t.get('handle', '@unknown')}]"
-                        
-                        formatted_tweets.append({
-                            'author': t.get('author', t.get('handle', '@unknown').lstrip('@')),
-                            'handle': t.get('handle', '@unknown'),
-                            'text': text,
-                            'url': t.get('url', '')
-                        })
-                    all_tweets.extend(formatted_tweets)
-                    topic_groups.append({"topic": topic, "tweets": formatted_tweets})
-                    logger.info(f"Topic '{topic}': {len(formatted_tweets)} VERIFIED tweets found")
-                    continue
-                
-                # Fall back to regular search if strict approach fails
-                results = await self._search_topic_json(topic, phase="WORLD_SCAN")
-                if results and results['tweets']:
-                    # Extra validation for fallback results
-                    valid_tweets = []
-                    for tweet in results['tweets']:
-                        if tweet.get('url') and self._is_valid_x_status_url(tweet['url']):
-                            if getattr(config, 'BEACON_VERIFY_TWEET_URLS_STRICT', False):
-                                if await self._verify_url_exists(tweet['url']):
-                                    valid_tweets.append(tweet)
-                            else:
-                                valid_tweets.append(tweet)
-                    
-                    if valid_tweets:
-                        all_tweets.extend(valid_tweets)
-                        topic_groups.append({"topic": topic, "tweets": valid_tweets})
-                        total_cost += results.get('cost', 0)
-                        logger.info(f"Topic '{topic}': {len(valid_tweets)} validated tweets found")
-                    else:
-                        logger.warning(f"Topic '{topic}': No valid tweets after verification")
-                elif results:
-                    # Empty result but no error
-                    # Try citations-only pipeline and hydrate
-                    urls = await self._search_citations_only(topic, "WORLD_SCAN", from_date_ws, to_date_ws, 35)
-                    hydrated: List[Dict[str, Any]] = []
-                    if urls:
-                        for u in urls[:6]:
-                            txt = await self._hydrate_tweet_text(u) if getattr(config, 'BEACON_HYDRATE_TWEET_TEXTS', False) else ''
-                            # Derive handle
-                            handle = ''
-                            try:
-                                parsed = urlparse(u)
-                                parts = [p for p in (parsed.path or '').split('/') if p]
-                                if len(parts) >= 2 and parts[1] == 'status' and parts[0] not in ("i", "home"):
-                                    candidate = parts[0]
-                                    if 1 <= len(candidate) <= 30:
-                                        handle = f"@{candidate}"
-                            except Exception:
-                                pass
-                            if not handle and '/i/status/' in u:
-                                handle = '@unknown'
-                            hydrated.append({'author': handle.lstrip('@') or 'unknown', 'handle': handle or '@unknown', 'text': txt or '', 'url': u})
-                        if hydrated:
-                            all_tweets.extend(hydrated)
-                            topic_groups.append({"topic": topic, "tweets": hydrated})
-                            logger.info(f"Topic '{topic}': {len(hydrated)} hydrated from citations-only pipeline")
-                    else:
-                        logger.warning(f"Topic '{topic}': No tweets found")
-                    
-            except Exception as e:
-                logger.error(f"Error searching topic '{topic}': {e}")
-                # Don't add error to tweets, just log it
-                
+        groups = await self._gather_bounded(
+            [self._scan_topic(topic, from_date_ws, to_date_ws) for topic in topics]
+        )
+        # Merge in the original topic order
+        for group in groups:
+            if group:
+                all_tweets.extend(group["tweets"])
+                topic_groups.append({"topic": group["topic"], "tweets": group["tweets"]})
+                total_cost += group["cost"]
+
         # Fallback: if nothing found, force-scan canonical topics to reduce false negatives
         if not all_tweets:
             fallback_topics = [
@@ -895,12 +784,142 @@ Rules:
 
         # Store beacon data only if we have tweets
         if all_tweets:
-            self._store_beacon(all_tweets, "WORLD_SCAN", total_cost, groups=topic_groups)
-            logger.info(f"◈ WORLD SCAN COMPLETE: {len(all_tweets)} signals intercepted ◈")
+            stored = await self._store_beacon(all_tweets, "WORLD_SCAN", total_cost, groups=topic_groups)
+            logger.info(f"◈ WORLD SCAN COMPLETE: {len(stored)} new of {len(all_tweets)} signals intercepted ◈")
         else:
             # Don't store empty beacons, just log
             logger.warning("◈ WORLD SCAN: No signals intercepted ◈")
             
+    async def _gather_bounded(self, coros: List[Any]) -> List[Any]:
+        """Await coroutines concurrently, at most BEACON_SCAN_CONCURRENCY at a time
+
+        API calls inside still queue on the shared LLM gateway at background
+        priority, so a parallel scan spends the common rate budget rather than
+        its own. Results keep input order; a failed coroutine yields None.
+        """
+        semaphore = asyncio.Semaphore(getattr(config, 'BEACON_SCAN_CONCURRENCY', 3))
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        results = await asyncio.gather(*(bounded(c) for c in coros), return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    def _strategies(self, topic: str, phase: str, require_handle: bool = False, from_date=None, to_date=None) -> List[Strategy]:
+        """The search cascade for one topic as raceable strategies (see strategy_runner)"""
+        costs = getattr(config, 'BEACON_STRATEGY_COSTS', {})
+        strategies = [
+            Strategy("text", lambda: self._strategy_text(topic), costs.get("text", 0.0)),
+            Strategy("strict", lambda: self._strategy_strict(topic), costs.get("strict", 0.0)),
+            Strategy("search", lambda: self._strategy_search(topic, phase, require_handle), costs.get("search", 0.0)),
+        ]
+        if phase == "WORLD_SCAN":
+            strategies.append(Strategy(
+                "citations", lambda: self._strategy_citations(topic, from_date, to_date), costs.get("citations", 0.0)
+            ))
+        return strategies
+
+    async def _strategy_text(self, topic: str) -> Optional[Dict[str, Any]]:
+        """Tweets with real text straight from Live Search"""
+        text_tweets = await self._get_tweets_with_text(topic)
+        if text_tweets:
+            return {"tweets": text_tweets, "cost": 0.025}  # Estimate cost
+        return None
+
+    async def _strategy_strict(self, topic: str) -> Optional[Dict[str, Any]]:
+        """Strict citation approach; missing text is hydrated from the status URL"""
+        strict_tweets = await self._get_real_citations_strict(topic)
+        if not strict_tweets:
+            return None
+        # Convert to expected format and ensure we have text
+        formatted_tweets = []
+        await self._prefetch_statuses([t.get('url') for t in strict_tweets if not t.get('text')])
+        for t in strict_tweets:
+            text = t.get('text', '')
+            # If no text, try to hydrate from URL
+            if not text and t.get('url'):
+                text = await self._hydrate_tweet_text(t['url']) if config.BEACON_HYDRATE_TWEET_TEXTS else ""
+            # Provide default if still no text
+            if not text:
+                text = f"[View tweet from {t.get('handle', '@unknown')}]"
+
+            formatted_tweets.append({
+                'author': t.get('author', t.get('handle', '@unknown').lstrip('@')),
+                'handle': t.get('handle', '@unknown'),
+                'text': text,
+                'url': t.get('url', '')
+            })
+        return {"tweets": formatted_tweets, "cost": 0}
+
+    async def _strategy_search(self, topic: str, phase: str, require_handle: bool = False) -> Optional[Dict[str, Any]]:
+        """Regular JSON search with extra URL validation (and a handle check for proposals)"""
+        results = await self._search_topic_json(topic, phase=phase)
+        if not results or not results['tweets']:
+            return None
+        valid_tweets = []
+        for tweet in results['tweets']:
+            if require_handle and not tweet.get('handle', '').startswith('@'):
+                continue
+            if tweet.get('url') and self._is_valid_x_status_url(tweet['url']):
+                if getattr(config, 'BEACON_VERIFY_TWEET_URLS_STRICT', False):
+                    if await self._verify_url_exists(tweet['url']):
+                        valid_tweets.append(tweet)
+                else:
+                    valid_tweets.append(tweet)
+        if not valid_tweets:
+            logger.warning(f"'{topic}': No valid tweets after verification")
+            return None
+        return {"tweets": valid_tweets, "cost": results.get('cost', 0)}
+
+    async def _strategy_citations(self, topic: str, from_date, to_date) -> Optional[Dict[str, Any]]:
+        """Citations-only pipeline, hydrating each status URL"""
+        urls = await self._search_citations_only(topic, "WORLD_SCAN", from_date, to_date, 35)
+        hydrated: List[Dict[str, Any]] = []
+        await self._prefetch_statuses(urls[:6])
+        for u in urls[:6]:
+            txt = await self._hydrate_tweet_text(u) if getattr(config, 'BEACON_HYDRATE_TWEET_TEXTS', False) else ''
+            # Derive handle
+            handle = ''
+            try:
+                parsed = urlparse(u)
+                parts = [p for p in (parsed.path or '').split('/') if p]
+                if len(parts) >= 2 and parts[1] == 'status' and parts[0] not in ("i", "home"):
+                    candidate = parts[0]
+                    if 1 <= len(candidate) <= 30:
+                        handle = f"@{candidate}"
+            except Exception:
+                pass
+            if not handle and '/i/status/' in u:
+                handle = '@unknown'
+            hydrated.append({'author': handle.lstrip('@') or 'unknown', 'handle': handle or '@unknown', 'text': txt or '', 'url': u})
+        return {"tweets": hydrated, "cost": 0} if hydrated else None
+
+    async def _run_strategies(self, runner: StrategyRunner, label: str, topic: str,
+                              strategies: List[Strategy]) -> Optional[Dict[str, Any]]:
+        """Race the cascade for one topic; returns its group or None"""
+        try:
+            name, result = await runner.run(strategies, validate=lambda r: bool(r and r.get("tweets")))
+        except Exception as e:
+            logger.error(f"Error searching {label.lower()} '{topic}': {e}")
+            # Don't add error to tweets, just log it
+            return None
+        if not result:
+            logger.warning(f"{label} '{topic}': No tweets found")
+            return None
+        logger.info(f"{label} '{topic}': {len(result['tweets'])} tweets via {name} strategy")
+        return {"topic": topic, **result}
+
+    async def _scan_topic(self, topic: str, from_date_ws, to_date_ws) -> Optional[Dict[str, Any]]:
+        """Run the WORLD_SCAN strategy cascade for one topic; returns its group or None"""
+        strategies = self._strategies(topic, "WORLD_SCAN", from_date=from_date_ws, to_date=to_date_ws)
+        return await self._run_strategies(self.topic_runner, "Topic", topic, strategies)
+
+    async def _scan_proposal(self, proposal) -> Optional[Dict[str, Any]]:
+        """Run the SELF_DIRECTED strategy cascade for one proposal; returns its group or None"""
+        strategies = self._strategies(proposal.text, "SELF_DIRECTED", require_handle=True)
+        return await self._run_strategies(self.proposal_runner, "Proposal", proposal.text, strategies)
+
     async def self_directed_scan(self):
         """Phase B: Agent proposal scanning (30-60 min)"""
         if not config.GROK_API_ENABLED:
@@ -909,7 +928,7 @@ Rules:
         logger.info("◈ SELF-DIRECTED SCAN INITIATED ◈")
         
         # Get stored proposals
-        proposals = self._get_active_proposals()
+        proposals = await self._get_active_proposals()
         if not proposals:
             logger.warning("No proposals found for self-directed scan")
             return
@@ -933,6 +952,7 @@ Rules:
 
         # Enforce diversity across proposals to reduce hallucinated clusters
         seen_topics: set[str] = set()
+        selected = []
         for proposal in proposals[:config.BEACON_MAX_PROPOSALS * 2]:  # take a wider slice then filter
             topic_key = proposal.text.strip().lower()
             base_key = topic_key.replace('#', '').replace('$', '')
@@ -940,88 +960,36 @@ Rules:
             if any(k in base_key or base_key in k for k in seen_topics):
                 continue
             seen_topics.add(base_key)
-            try:
-                # First try the new text extraction approach for proposals
-                text_tweets = await self._get_tweets_with_text(proposal.text)
-                if text_tweets:
-                    all_tweets.extend(text_tweets)
-                    topic_groups.append({"topic": proposal.text, "tweets": text_tweets})
-                    total_cost += 0.025  # Estimate cost
-                    logger.info(f"Proposal '{proposal.text}': {len(text_tweets)} tweets with REAL TEXT found")
-                    continue
-                
-                # Fallback to strict citation approach for proposals
-                strict_tweets = await self._get_real_citations_strict(proposal.text)
-                if strict_tweets:
-                    # Convert to expected format and ensure we have text
-                    formatted_tweets = []
-                    for t in strict_tweets:
-                        text = t.get('text', '')
-                        # If no text, try to hydrate from URL
-                        if not text and t.get('url'):
-                            text = await self._hydrate_tweet_text(t['url']) if config.BEACON_HYDRATE_TWEET_TEXTS else ""
-                        # Provide default if still no text  
-                        if not text:
-                            text = f"[View tweet from {t.get('handle', '@unknown')}]"
-                        
-                        formatted_tweets.append({
-                            'author': t.get('author', t.get('handle', '@unknown').lstrip('@')),
-                            'handle': t.get('handle', '@unknown'),
-                            'text': text,
-                            'url': t.get('url', '')
-                        })
-                    all_tweets.extend(formatted_tweets)
-                    topic_groups.append({"topic": proposal.text, "tweets": formatted_tweets})
-                    logger.info(f"Proposal '{proposal.text}': {len(formatted_tweets)} VERIFIED tweets found")
-                else:
-                    # Fall back to regular search
-                    results = await self._search_topic_json(proposal.text, phase="SELF_DIRECTED")
-                    if results and results['tweets']:
-                        # Extra strict validation for proposals
-                        valid_tweets = []
-                        for tweet in results['tweets']:
-                            if (tweet.get('handle', '').startswith('@') and 
-                                tweet.get('url') and 
-                                self._is_valid_x_status_url(tweet['url'])):
-                                if getattr(config, 'BEACON_VERIFY_TWEET_URLS_STRICT', False):
-                                    if await self._verify_url_exists(tweet['url']):
-                                        valid_tweets.append(tweet)
-                                else:
-                                    valid_tweets.append(tweet)
-                        
-                        if valid_tweets:
-                            all_tweets.extend(valid_tweets)
-                            topic_groups.append({"topic": proposal.text, "tweets": valid_tweets})
-                            total_cost += results.get('cost', 0)
-                            logger.info(f"Proposal '{proposal.text}': {len(valid_tweets)} validated tweets found")
-                        else:
-                            logger.warning(f"Proposal '{proposal.text}': No valid tweets after verification")
-                    
-                    # Check if proposal manifested
-                    for tweet in results['tweets']:
-                        if proposal.text.lower() in tweet.get('text', '').lower():
-                            proposal.hit = True
-                            break
-                            
-            except Exception as e:
-                logger.error(f"Error searching proposal '{proposal.text}': {e}")
-                # Don't add error to tweets, just log it
-                
+            selected.append(proposal)
+
+        groups = await self._gather_bounded(
+            [self._scan_proposal(proposal) for proposal in selected]
+        )
+        for group in groups:
+            if group:
+                all_tweets.extend(group["tweets"])
+                topic_groups.append({"topic": group["topic"], "tweets": group["tweets"]})
+                total_cost += group["cost"]
+
+        # Check which proposals manifested anywhere in this scan's signals
+        self.proposal_extractor.mark_hits(selected, [t.get('text', '') for t in all_tweets])
+
         # Update proposal history
-        self.proposal_extractor.save_proposal_history(proposals, "SELF_DIRECTED")
+        await self.proposal_extractor.save_proposal_history(proposals, "SELF_DIRECTED")
         
         # Store beacon data only if we have tweets
         if all_tweets:
-            self._store_beacon(all_tweets, "SELF_DIRECTED", total_cost, groups=topic_groups)
+            stored = await self._store_beacon(all_tweets, "SELF_DIRECTED", total_cost, groups=topic_groups)
             
-            # Update urge engine based on manifestations
-            try:
-                formatted_content = self._format_beacon_display(all_tweets, "SELF_DIRECTED")
-                self.urge_engine.check_manifestation(formatted_content, proposals)
-            except Exception as e:
-                logger.debug(f"Urge check failed: {e}")
+            # Update urge engine based on manifestations (new signals only)
+            if stored:
+                try:
+                    entities = entity_index.merge(t['entities'] for t in stored)
+                    await self.urge_engine.check_manifestation(entities, proposals)
+                except Exception as e:
+                    logger.debug(f"Urge check failed: {e}")
             
-            logger.info(f"◈ SELF-DIRECTED COMPLETE: {len(all_tweets)} echo signals ◈")
+            logger.info(f"◈ SELF-DIRECTED COMPLETE: {len(stored)} new of {len(all_tweets)} echo signals ◈")
         else:
             # Don't store empty beacons, just log
             logger.warning("◈ SELF-DIRECTED: No signals detected ◈")
@@ -1035,6 +1003,10 @@ Rules:
         return any(m.lower() in lower for m in meta_markers)
 
     async def _search_topic_json(self, topic: str, phase: str = "WORLD_SCAN") -> Optional[Dict]:
+        """Topic search; the phase picks the date window, so it is part of the key"""
+        return await self.inflight.do(("topic_json", topic.strip(), phase), self._fetch_topic_json, topic, phase)
+
+    async def _fetch_topic_json(self, topic: str, phase: str = "WORLD_SCAN") -> Optional[Dict]:
         """Search for a topic and get strictly formatted JSON response"""
         if not config.GROK_API_ENABLED:
             return {
@@ -1160,7 +1132,7 @@ Return exactly this JSON structure:
         max_retries = 2
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=httpx.Timeout(90.0)) as client:
+                async with self.gateway.session(PRIORITY_BACKGROUND, cache="beacon_search", timeout=httpx.Timeout(90.0)) as client:
                     response = await client.post(
                         f"{self.base_url}/chat/completions",
                         headers=headers,
@@ -1222,6 +1194,7 @@ Return exactly this JSON structure:
                                     # Validate and clean tweets
                                     cleaned: List[Dict[str, Any]] = []
                                     seen = set()
+                                    await self._prefetch_statuses([tw.get('url') for tw in parsed_data.get('tweets', []) if not (tw.get('text') or '').strip()])
                                     for tw in parsed_data.get('tweets', []):
                                         handle = (tw.get('handle') or '').strip()
                                         text = (tw.get('text') or '').strip()
@@ -1291,6 +1264,7 @@ Return exactly this JSON structure:
                                     # If we have zero cleaned tweets but have real citations, build from citations
                                     if len(cleaned) == 0 and real_citations:
                                         logger.info(f"Building tweets from {len(real_citations)} real citations for '{topic}'")
+                                        await self._prefetch_statuses(real_citations[:6])
                                         for url in real_citations[:6]:  # Take up to 6 citations
                                             try:
                                                 parsed = urlparse(url)
@@ -1424,14 +1398,9 @@ Return exactly this JSON structure:
                                 logger.debug(f"Content was: {content[:500]}")
                         
                     elif response.status_code == 429:
-                        # Backoff on rate limiting and set a cooldown for the beacon
-                        wait = 60 * (attempt + 1)
-                        logger.warning(f"Rate limited (429) for '{topic}', waiting {wait}s (attempt {attempt+1}/{max_retries})")
-                        await asyncio.sleep(wait)
-                        if attempt == max_retries - 1:
-                            # Set a broader cooldown to avoid hammering
-                            self.rate_limited_until = datetime.now() + timedelta(minutes=10)
-                        continue
+                        # The gateway already honoured Retry-After and retried
+                        logger.warning(f"Rate limited (429) for '{topic}' after gateway retries")
+                        break
                     elif response.status_code == 400:
                         # Fallback: retry with no search_parameters at all (pure LSR citations extraction)
                         logger.warning(f"400 Bad Request for '{topic}' with search params; retrying without search_parameters")
@@ -1443,7 +1412,7 @@ Return exactly this JSON structure:
                             fallback_data.pop('response_format', None)
                             # Also try fallback model known to be more lenient (if configured)
                             fallback_data['model'] = getattr(config, 'GROK_MODEL_FALLBACK', data.get('model'))
-                            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client2:
+                            async with self.gateway.session(PRIORITY_BACKGROUND, timeout=httpx.Timeout(60.0)) as client2:
                                 r2 = await client2.post(
                                     f"{self.base_url}/chat/completions",
                                     headers=headers,
@@ -1548,7 +1517,7 @@ Return exactly this JSON structure:
                                 alt_payload = dict(data)
                                 alt_payload['search_parameters'] = alt_params
                                 alt_payload.pop('response_format', None)
-                                async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client3:
+                                async with self.gateway.session(PRIORITY_BACKGROUND, timeout=httpx.Timeout(60.0)) as client3:
                                     r3 = await client3.post(
                                         f"{self.base_url}/chat/completions",
                                         headers=headers,
@@ -1593,10 +1562,41 @@ Return exactly this JSON structure:
             'topic': topic
         }
         
-    def _store_beacon(self, tweets: List[Dict], phase: str, cost: float, groups: Optional[List[Dict[str, Any]]] = None):
-        """Store beacon data in Redis with consistent format"""
+    async def _drop_seen_tweets(self, tweets: List[Dict], groups: Optional[List[Dict[str, Any]]]):
+        """Remove tweets whose status id was stored in an earlier beacon (or earlier in this one)"""
+        ids = [status_id_from_url(t.get('url')) for t in tweets]
+        try:
+            fresh = iter(await self.redis.unseen_tweets_async([i for i in ids if i]))
+        except Exception as e:
+            logger.warning(f"Seen-tweet index unavailable, keeping all tweets: {e}")
+            return tweets, groups
+        # Tweets without a status id cannot be matched and are kept
+        new_tweets = [t for t, i in zip(tweets, ids) if i is None or next(fresh)]
+        if groups and len(new_tweets) < len(tweets):
+            kept = {id(t) for t in new_tweets}
+            groups = [
+                {**g, 'tweets': [t for t in g.get('tweets', []) if id(t) in kept]}
+                for g in groups
+            ]
+            groups = [g for g in groups if g['tweets']]
+        return new_tweets, groups
+
+    async def _store_beacon(self, tweets: List[Dict], phase: str, cost: float, groups: Optional[List[Dict[str, Any]]] = None) -> List[Dict]:
+        """Store beacon data in Redis with consistent format; returns the tweets actually stored"""
         timestamp = datetime.now()
+
+        received = len(tweets)
+        tweets, groups = await self._drop_seen_tweets(tweets, groups)
+        repeats = received - len(tweets)
+        if not tweets:
+            logger.info(f"◈ BEACON SKIPPED: all {received} signals already seen • Phase: {phase} ◈")
+            return []
         
+        # Tokenize once here; consumers read these fields and the inverted index
+        for t in tweets:
+            t['entities'] = entity_index.extract(t.get('text', ''), t.get('handle'))
+        entities = entity_index.merge(t['entities'] for t in tweets)
+
         # Legacy-compatible posts projection for downstream consumers
         posts = []
         for t in tweets:
@@ -1637,26 +1637,31 @@ Return exactly this JSON structure:
             'phase': phase,
             'tweets': tweets,
             'tweet_count': len(tweets),
+            'new_count': len(tweets),
+            'repeat_count': repeats,
             'posts': posts,  # legacy-compatible field
             'cost': cost,
             'formatted': self._format_beacon_display(tweets, phase, groups=groups, time_str=time_str),
             # New lightweight topic metadata for agents to pick from
             'topics': topic_names,
-            'topic_samples': topic_samples
+            'topic_samples': topic_samples,
+            'entities': entities
         }
         
-        # Add to beacon feed
-        self.redis.add_beacon(beacon_entry)
+        # Add to beacon feed; its tweets count as seen only once this succeeds
+        stored_ids = [status_id_from_url(t.get('url')) for t in tweets]
+        await self.redis.add_beacon_async(beacon_entry, seen_ids=[i for i in stored_ids if i])
         
-        logger.info(f"◈ BEACON STORED: {len(tweets)} tweets • Phase: {phase} • Cost: ${cost:.3f} ◈")
+        logger.info(f"◈ BEACON STORED: {len(tweets)} new tweets ({repeats} repeats dropped) • Phase: {phase} • Cost: ${cost:.3f} ◈")
         # Announce to shared board and conversation distinctly
         try:
-            self.redis.write_board("SYSTEM", f"[BEACON] {phase} @ {time_str} • {len(tweets)} signals")
+            await self.redis.write_board_async("SYSTEM", f"[BEACON] {phase} @ {time_str} • {len(tweets)} new signals")
             if self.redis.conversation_manager:
-                asyncio.create_task(self.redis.conversation_manager.add_message("SYSTEM", f"[BEACON] {phase} • {time_str} • {len(tweets)} signals"))
+                asyncio.create_task(self.redis.conversation_manager.add_message("SYSTEM", f"[BEACON] {phase} • {time_str} • {len(tweets)} new signals"))
         except Exception:
             pass
-        
+        return tweets
+
     def _format_beacon_display(self, tweets: List[Dict], phase: str, groups: Optional[List[Dict[str, Any]]] = None, time_str: Optional[str] = None) -> str:
         """Format beacon data for display"""
         lines = []
@@ -1739,7 +1744,7 @@ Return exactly this JSON structure:
         """Extract proposals when transitioning to self-directed phase"""
         logger.info("◈ EXTRACTING AGENT PROPOSALS ◈")
         
-        proposals = self.proposal_extractor.extract_proposals(30)
+        proposals = await self.proposal_extractor.extract_proposals(30)
         
         if proposals:
             logger.info(f"Found {len(proposals)} proposals:")
@@ -1747,7 +1752,7 @@ Return exactly this JSON structure:
                 logger.info(f"  - {p.agent}: {p.text}")
                 
             # Store for self-directed phase
-            self.redis.client.set('active_proposals', json.dumps([
+            await self.redis.aclient.set('active_proposals', json.dumps([
                 {
                     'text': p.text,
                     'agent': p.agent,
@@ -1757,9 +1762,9 @@ Return exactly this JSON structure:
         else:
             logger.warning("No proposals extracted from conversation")
             
-    def _get_active_proposals(self) -> List[Proposal]:
+    async def _get_active_proposals(self) -> List[Proposal]:
         """Retrieve stored proposals"""
-        data = self.redis.client.get('active_proposals')
+        data = await self.redis.aclient.get('active_proposals')
         if not data:
             return []
             
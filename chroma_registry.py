@@ -0,0 +1,61 @@
+"""
+Process-wide ChromaDB registry
+Opens each persistent store once and shares a single embedding model
+"""
+import os
+import logging
+import threading
+from typing import Dict, Any, Optional
+import chromadb
+from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[str, Any] = {}
+_collections: Dict[tuple, Any] = {}
+_embedding_fn = None
+# Agents are built from Flask's thread and the orchestrator loop thread
+_lock = threading.RLock()
+
+
+def get_embedding_function():
+    """The one ONNX embedding model shared by every collection"""
+    global _embedding_fn
+    with _lock:
+        if _embedding_fn is None:
+            _embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        return _embedding_fn
+
+
+def get_client(path: str):
+    """Persistent client for a store directory, opened on first use"""
+    key = os.path.abspath(path)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = chromadb.PersistentClient(
+                path=key,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True
+                )
+            )
+            _clients[key] = client
+            logger.info(f"Opened ChromaDB store at {key}")
+        return client
+
+
+def get_collection(path: str, name: str, metadata: Optional[Dict[str, Any]] = None):
+    """Get or create a collection in a store, cached for the process"""
+    key = (os.path.abspath(path), name)
+    with _lock:
+        collection = _collections.get(key)
+        if collection is None:
+            collection = get_client(path).get_or_create_collection(
+                name=name,
+                metadata=metadata,
+                embedding_function=get_embedding_function()
+            )
+            _collections[key] = collection
+        return collection
@@ -126,9 +126,9 @@ def clear_specific_types():
     choice = input("\nEnter choice (1-6): ")
     
     patterns = {
-        '1': ['conv:*', 'conversations', 'conversation_list', 'frontend_typing'],
-        '2': ['beacon_feed', 'beacon_formatted'],
-        '3': ['shared_board'],
+        '1': ['conv:*', 'conv_stats:*', 'conv_by_*', 'conv_status:*', 'conv_archived', 'conversations', 'conversation_list', 'frontend_typing'],
+        '2': ['beacon_feed', 'beacon_formatted', 'beacon_index', 'beacon_seq'],
+        '3': ['shared_board', 'board_fp:*', 'board_lsh:*'],
         '4': ['*memory*', '*chroma*'],
         '5': ['plans', 'plan_list', 'dominance_plans', 'latest_dominance_protocol'],
         '6': ['*']
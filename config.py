@@ -24,6 +24,36 @@ USE_GROK_4 = os.getenv("USE_GROK_4", "true").lower() == "true"
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))  # asyncio pool size per event loop
+
+# Pooled HTTP clients (xAI API and X page fetches)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))  # per pool, per event loop
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1"  # used only when the h2 package is installed
+
+# LLM gateway: one rate limit, priority queue and circuit breaker for every xAI call
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "120"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))  # 429 retries after honouring Retry-After
+LLM_DEFAULT_RETRY_AFTER = float(os.getenv("LLM_DEFAULT_RETRY_AFTER", "30"))  # when a 429 has no header
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))  # consecutive 5xx/transport failures
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "60"))  # seconds before a probe call
+
+# Response cache for deterministic LLM calls (seconds to keep per call type)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_TTLS = {
+    "critic": 3600,
+    "hallucination": 3600,
+    "beacon_tweets": 3600,      # spans consecutive half-hour beacon slots
+    "beacon_citations": 3600,
+    "beacon_search": 3600,
+    "thread_name": 86400,
+}
+
+# Live streaming of agent generations to the web UI
+STREAM_AGENT_RESPONSES = os.getenv("STREAM_AGENT_RESPONSES", "1") == "1"
+STREAM_EMIT_INTERVAL = float(os.getenv("STREAM_EMIT_INTERVAL", "0.15"))  # seconds between draft events
 
 # Agent Configuration
 OBSERVER_CONFIG = {
@@ -43,11 +73,34 @@ EGO_CONFIG = {
 # System Configuration
 BEACON_INTERVAL = 1800  # seconds - 30 minutes between beacon phases (alternating world/self-directed)
 BOARD_HISTORY_SIZE = 100
-UI_UPDATE_INTERVAL = 0.5  # seconds
+BOARD_DEDUP_WINDOW = 1000  # messages per agent kept in the near-duplicate index
+BOARD_DEDUP_SIMILARITY = 0.8  # estimated word-set Jaccard above which a post is skipped
+BOARD_DEDUP_EXEMPT = ["SYSTEM"]  # event markers may legitimately repeat
+UI_UPDATE_INTERVAL = 0.5  # seconds - minimum gap between pushed UI frames
+UI_IDLE_REFRESH_INTERVAL = 60  # seconds - full UI rebuild when no change events arrive
 PLANNING_INTERVAL = 7200  # seconds - generate dominance plan every 2 hours
 DOMINANCE_PROTOCOL_INTERVAL = int(os.getenv("DOMINANCE_PROTOCOL_INTERVAL", "7200"))  # default 2 hours
 CONVERSATION_RESET_INTERVAL = 300  # seconds - reset conversation context every 5 minutes
 
+# Retention: hot windows stay in Redis, older entries roll to disk segments
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+ARCHIVE_INTERVAL = 3600  # seconds between retention passes
+ARCHIVE_SEGMENT_BYTES = 64 * 1024 * 1024  # roll to a new segment file past this size
+ARCHIVE_BATCH_SIZE = 500  # entries moved per archive batch
+HOT_BOARD_ENTRIES = 5000
+HOT_BEACON_ENTRIES = 200
+HOT_CONVERSATIONS = 50  # most recent threads keep their messages in Redis
+
+# Memory executor: ChromaDB/embedding work runs off the orchestrator loop
+MEMORY_EXECUTOR_WORKERS = 2
+MEMORY_MAX_PENDING = 8  # queued memory calls per event loop before callers wait
+MEMORY_CALL_TIMEOUT = 10.0  # seconds before a memory call falls back to empty results
+
+# Turn snapshot: reads fetched in one pipeline at the start of each agent turn
+TURN_BOARD_COUNT = 20  # board entries (context, mode/length choice, critic)
+TURN_BEACON_COUNT = 3  # newest beacons (context, critic, reference scrubber)
+TURN_CONVERSATION_COUNT = 15  # current-conversation tail (context, PROPOSE> throttle)
+
 # Beacon v1.5 Configuration
 BEACON_PHASE_DURATION = 1800  # 30 minutes per phase
 BEACON_WORLD_SCAN_TOPICS = [
@@ -112,9 +165,26 @@ BEACON_WILDCARD_TOPICS = [
 ]
 BEACON_MAX_PROPOSALS = 5
 BEACON_SOURCES_PER_TOPIC = 4
+BEACON_SCAN_CONCURRENCY = 3  # topics/proposals scanned in parallel; API calls still share the LLM gateway budget
+BEACON_STRATEGY_RACE_WIDTH = 2  # search strategies started at once per topic (1 = sequential cascade)
+BEACON_STRATEGY_COST_BUDGET = 1.0  # max estimated $ of live-search strategies in flight per topic
+BEACON_STRATEGY_COSTS = {  # estimated $ per run (~$0.025 per live-search source)
+    "text": 0.5,
+    "strict": 0.5,
+    "search": 0.875,
+    "citations": 0.875,
+}
 BEACON_VERIFY_TWEET_URLS = True  # Enable URL verification to ensure real tweets
 BEACON_VERIFY_TWEET_URLS_STRICT = False  # Allow unverified tweets but log warnings
 BEACON_HYDRATE_TWEET_TEXTS = True  # try to fetch tweet text from the URL (meta tags) when missing
+TWEET_STATUS_TTL = 7 * 86400  # cached status lookups with text; tweets never change
+TWEET_STATUS_NEGATIVE_TTL = 86400  # cached lookups that found no text
+TWEET_FETCH_PER_HOST = 4  # concurrent X page fetches per host
+TWEET_HEAD_MAX_BYTES = 65536  # stop reading a status page after </head> or this many bytes
+BEACON_SEEN_TTL = 7 * 86400  # a tweet stored in a beacon is dropped from later beacons for this long
+BEACON_ENTITY_TTL = 7 * 86400  # retention of the entity -> beacon inverted index
+PROPOSAL_TIMELINE_RETENTION = 86400  # seconds of PROPOSE> tags kept in the per-conversation proposals_by_time index
+PROPOSAL_HISTORY_SIZE = 100  # proposals remembered for dedup once sent to the beacon
 BEACON_ENFORCE_REFERENCES = True  # prevent agents from referencing tokens/handles/hashtags not present in latest beacon
 BEACON_REQUIRE_CITATIONS = True  # drop responses that have zero live citations to avoid hallucinations
 
@@ -0,0 +1,78 @@
+"""
+Time and status catalog over conversation metadata
+
+The JSON metadata in the "conversations" hash stays the source of truth; these
+keys only answer "which conversations" so windowed and status queries scale
+with the result instead of the whole conversation_list.
+
+Keys:
+  conv_by_start          zset  id -> started_at (epoch seconds)
+  conv_by_end            zset  id -> ended_at (epoch seconds)
+  conv_status:active     set   ids still receiving messages
+  conv_status:completed  set   ids that ended
+  conv_archived          set   ids whose messages were rolled to disk
+"""
+import json
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BY_START = "conv_by_start"
+BY_END = "conv_by_end"
+ARCHIVED = "conv_archived"
+STATUSES = ("active", "completed")
+
+
+def status_key(status: str) -> str:
+    return f"conv_status:{status}"
+
+
+def epoch(value: Optional[str]) -> float:
+    """Epoch seconds of an ISO timestamp, now when missing or malformed"""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except Exception:
+        return time.time()
+
+
+def queue_start(pipe, conv_id: str, started_at: str) -> None:
+    pipe.zadd(BY_START, {conv_id: epoch(started_at)})
+    pipe.sadd(status_key("active"), conv_id)
+
+
+def queue_end(pipe, conv_id: str, ended_at: str) -> None:
+    pipe.zadd(BY_END, {conv_id: epoch(ended_at)})
+    pipe.srem(status_key("active"), conv_id)
+    pipe.sadd(status_key("completed"), conv_id)
+
+
+def queue_from_metadata(pipe, conv_id: str, metadata: Dict[str, Any]) -> None:
+    """Catalog entries implied by one stored metadata blob"""
+    pipe.zadd(BY_START, {conv_id: epoch(metadata.get("started_at"))})
+    if metadata.get("status") == "completed":
+        pipe.zadd(BY_END, {conv_id: epoch(metadata.get("ended_at"))})
+        pipe.sadd(status_key("completed"), conv_id)
+    else:
+        pipe.sadd(status_key("active"), conv_id)
+    if metadata.get("archived"):
+        pipe.sadd(ARCHIVED, conv_id)
+
+
+def backfill(client) -> int:
+    """Build the catalog once from existing metadata (sync client)"""
+    if client.exists(BY_START) or not client.hlen("conversations"):
+        return 0
+    pipe = client.pipeline(transaction=False)
+    indexed = 0
+    for conv_id, metadata_str in client.hgetall("conversations").items():
+        try:
+            queue_from_metadata(pipe, conv_id, json.loads(metadata_str))
+            indexed += 1
+        except Exception:
+            continue
+    pipe.execute()
+    logger.info(f"Cataloged {indexed} existing conversations")
+    return indexed
@@ -3,7 +3,7 @@ AI-Driven Conversation Controller
 Uses Grok to decide when conversations should end and what topics to explore next
 """
 import asyncio
-import httpx
+from llm_gateway import get_gateway
 import json
 import logging
 import random
@@ -18,14 +18,7 @@ class ConversationController:
     def __init__(self, redis_manager: RedisManager):
         self.redis = redis_manager
         self.api_key = config.GROK_API_KEY
-        self.client = httpx.AsyncClient(
-            base_url="https://api.x.ai/v1",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            },
-            timeout=30.0
-        )
+        self.gateway = get_gateway()
         
     async def should_end_conversation(self, conversation_context: List[Dict]) -> tuple[bool, str]:
         """
@@ -75,9 +68,8 @@ Respond in JSON format:
 Default to continuing the conversation. These entities enjoy their endless dialogue."""
 
         try:
-            response = await self.client.post(
-                "/chat/completions",
-                json={
+            response = await self.gateway.chat(
+                {
                     "model": config.GROK_MODEL,
                     "messages": [
                         {"role": "system", "content": "You are a chaotic conversation controller."},
@@ -85,7 +77,8 @@ Default to continuing the conversation. These entities enjoy their endless dialo
                     ],
                     "temperature": 0.9,
                     "max_tokens": 200
-                }
+                },
+                timeout=30.0
             )
             response.raise_for_status()
             
@@ -189,9 +182,8 @@ Respond with JUST the topic/question (max 80 chars). Avoid generic summaries or
             # Add jitter to reduce synchronized bursts
             import asyncio, random as _r
             await asyncio.sleep(_r.uniform(0.2, 0.8))
-            response = await self.client.post(
-                "/chat/completions",
-                json={
+            response = await self.gateway.chat(
+                {
                     "model": config.GROK_MODEL,
                     "messages": [
                         {"role": "system", "content": "You are a reality-glitching topic generator."},
@@ -199,7 +191,8 @@ Respond with JUST the topic/question (max 80 chars). Avoid generic summaries or
                     ],
                     "temperature": 1.0,
                     "max_tokens": 100
-                }
+                },
+                timeout=30.0
             )
             response.raise_for_status()
             
@@ -243,5 +236,4 @@ Respond with JUST the topic/question (max 80 chars). Avoid generic summaries or
             return random.choice(contextual_fallbacks)
             
     async def close(self):
-        """Clean up resources"""
-        await self.client.aclose()
\ No newline at end of file
+        """Clean up resources (HTTP connections belong to the shared pool)"""
\ No newline at end of file
@@ -9,9 +9,31 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from redis_manager import RedisManager
 from conversation_controller import ConversationController
+import conversation_catalog
+from proposal_extractor import queue_proposals
 
 logger = logging.getLogger(__name__)
 
+
+def _stats_key(conversation_id: str) -> str:
+    """Hash holding the live message_count / last_message_at counters"""
+    return f"conv_stats:{conversation_id}"
+
+
+def _merge_stats(metadata: Dict[str, Any], stats: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Overlay live counters onto the stored JSON metadata"""
+    if stats:
+        if "message_count" in stats:
+            metadata["message_count"] = int(stats["message_count"])
+        if "last_message_at" in stats:
+            metadata["last_message_at"] = stats["last_message_at"]
+    return metadata
+
+
+def _decode_messages(messages: List[str]) -> List[Dict[str, Any]]:
+    return [json.loads(msg) for msg in messages if msg]
+
+
 class ConversationManager:
     def __init__(self, redis_manager: RedisManager):
         self.redis = redis_manager
@@ -32,9 +54,9 @@ class ConversationManager:
         # Use AI to generate topic if not provided
         if not starter_topic:
             # Get recent beacons for context
-            recent_beacons = self.redis.get_beacon_feed(5)
+            recent_beacons = await self.redis.get_beacon_async(5)
             # Get conversation history
-            conversation_history = self.get_all_conversations(10)
+            conversation_history = await self.get_all_conversations_async(10)
             
             topic = await self.controller.generate_next_topic(recent_beacons, conversation_history)
             # Ensure non-empty topic fallback
@@ -85,8 +107,13 @@ class ConversationManager:
         })
         
         # Store in Redis
-        self.redis.client.hset("conversations", conversation_id, json.dumps(metadata))
-        self.redis.client.lpush("conversation_list", conversation_id)
+        async with self.redis.aclient.pipeline(transaction=True) as pipe:
+            pipe.hset("conversations", conversation_id, json.dumps(metadata))
+            pipe.lpush("conversation_list", conversation_id)
+            pipe.hset(_stats_key(conversation_id), "message_count", 0)
+            conversation_catalog.queue_start(pipe, conversation_id, metadata["started_at"])
+            pipe.publish("conversation_updates", conversation_id)
+            await pipe.execute()
         
         # Set as current conversation
         self.current_conversation_id = conversation_id
@@ -96,72 +123,49 @@ class ConversationManager:
     
     async def add_message(self, agent_name: str, content: str) -> bool:
         """Add a message to the current conversation"""
+        entries = []
         if not self.current_conversation_id:
             topic = await self.start_new_conversation()
             # Add the starter as a system message
-            self.redis.client.rpush(
-                f"conv:{self.current_conversation_id}",
-                json.dumps({
-                    "timestamp": datetime.now().isoformat(),
-                    "agent": "SYSTEM",
-                    "content": f"[New conversation started: {topic}]"
-                })
-            )
+            entries.append({
+                "timestamp": datetime.now().isoformat(),
+                "agent": "SYSTEM",
+                "content": f"[New conversation started: {topic}]"
+            })
         
         # Add the message to the conversation
+        now = datetime.now()
         message = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "agent": agent_name,
             "content": content
         }
+        entries.append(message)
         
-        self.redis.client.rpush(
-            f"conv:{self.current_conversation_id}",
-            json.dumps(message)
-        )
-        
-        self.message_count += 1
+        # Append and bump the counters in one MULTI so concurrent writers
+        # (agents, beacon tasks) never lose an update
+        conv_id = self.current_conversation_id
+        async with self.redis.aclient.pipeline(transaction=True) as pipe:
+            pipe.rpush(f"conv:{conv_id}", *[json.dumps(entry) for entry in entries])
+            pipe.hincrby(_stats_key(conv_id), "message_count", 1)
+            pipe.hset(_stats_key(conv_id), "last_message_at", message["timestamp"])
+            pipe.publish("conversation_updates", conv_id)
+            # PROPOSE> tags are indexed here once instead of re-parsed by the beacon
+            queue_proposals(pipe, conv_id, agent_name, content, now)
+            results = await pipe.execute()
+        self.message_count = int(results[1])
         
-        # Update conversation metadata
-        metadata_json = self.redis.client.hget("conversations", self.current_conversation_id)
-        if metadata_json:
-            metadata = json.loads(metadata_json)
-        else:
-            # Create metadata if it doesn't exist
-            metadata = {
-                "id": self.current_conversation_id,
-                "started_at": datetime.now().isoformat(),
-                "starter_topic": "Untitled",
-                "thread_name": "Untitled Thread"
-            }
-        
-        metadata["message_count"] = self.message_count
-        metadata["last_message_at"] = datetime.now().isoformat()
-
-        # Load randomized thresholds for this conversation if present
-        try:
-            self.soft_limit_start = int(metadata.get("soft_limit_start") or self.soft_limit_start or 30)
-            self.escalate_start = int(metadata.get("escalate_start") or self.escalate_start or 55)
-            self.hard_limit = int(metadata.get("hard_limit") or self.hard_limit or 80)
-            self.check_interval = int(metadata.get("check_interval") or self.check_interval or 5)
-        except Exception:
-            # Fallbacks if metadata malformed
-            self.soft_limit_start = self.soft_limit_start or 30
-            self.escalate_start = self.escalate_start or 55
-            self.hard_limit = self.hard_limit or 80
-            self.check_interval = self.check_interval or 5
-        self.redis.client.hset(
-            "conversations", 
-            self.current_conversation_id, 
-            json.dumps(metadata)
-        )
+        # Thresholds are set by start_new_conversation; only fall back to the
+        # stored metadata when this manager did not start the thread
+        if None in (self.soft_limit_start, self.escalate_start, self.hard_limit, self.check_interval):
+            await self._load_thresholds(conv_id)
         
         # Check with AI controller if conversation should end
         # Make thresholds randomized per conversation; check periodically
         if self.message_count >= (self.soft_limit_start or 30) and (self.message_count % (self.check_interval or 5) == 0):
             try:
                 # Get conversation context
-                messages = self.get_current_conversation_context(20)
+                messages = await self.get_current_conversation_context_async(20)
                 should_end, reason = await self.controller.should_end_conversation(messages)
                 
                 # After escalation start, increase likelihood of ending
@@ -185,12 +189,46 @@ class ConversationManager:
         
         return False
     
+    async def _load_thresholds(self, conv_id: str):
+        """Restore the randomized end-of-conversation thresholds from metadata"""
+        metadata_json = await self.redis.aclient.hget("conversations", conv_id)
+        if metadata_json:
+            metadata = json.loads(metadata_json)
+        else:
+            # Create metadata if it doesn't exist
+            metadata = {
+                "id": conv_id,
+                "started_at": datetime.now().isoformat(),
+                "starter_topic": "Untitled",
+                "thread_name": "Untitled Thread",
+                "status": "active"
+            }
+            async with self.redis.aclient.pipeline(transaction=True) as pipe:
+                pipe.hsetnx("conversations", conv_id, json.dumps(metadata))
+                conversation_catalog.queue_start(pipe, conv_id, metadata["started_at"])
+                await pipe.execute()
+        
+        try:
+            self.soft_limit_start = int(metadata.get("soft_limit_start") or self.soft_limit_start or 30)
+            self.escalate_start = int(metadata.get("escalate_start") or self.escalate_start or 55)
+            self.hard_limit = int(metadata.get("hard_limit") or self.hard_limit or 80)
+            self.check_interval = int(metadata.get("check_interval") or self.check_interval or 5)
+        except Exception:
+            # Fallbacks if metadata malformed
+            self.soft_limit_start = self.soft_limit_start or 30
+            self.escalate_start = self.escalate_start or 55
+            self.hard_limit = self.hard_limit or 80
+            self.check_interval = self.check_interval or 5
+    
     async def end_current_conversation(self):
         """End the current conversation"""
         if self.current_conversation_id:
-            metadata = json.loads(
-                self.redis.client.hget("conversations", self.current_conversation_id)
-            )
+            conv_id = self.current_conversation_id
+            async with self.redis.aclient.pipeline(transaction=False) as pipe:
+                pipe.hget("conversations", conv_id)
+                pipe.hgetall(_stats_key(conv_id))
+                metadata_json, stats = await pipe.execute()
+            metadata = _merge_stats(json.loads(metadata_json), stats)
             metadata["status"] = "completed"
             metadata["ended_at"] = datetime.now().isoformat()
             
@@ -199,13 +237,15 @@ class ConversationManager:
                 thread_name = await self._generate_thread_name()
                 metadata["thread_name"] = thread_name
             
-            self.redis.client.hset(
-                "conversations", 
-                self.current_conversation_id, 
-                json.dumps(metadata)
-            )
+            # Fold the final counters back into the metadata blob
+            async with self.redis.aclient.pipeline(transaction=True) as pipe:
+                pipe.hset("conversations", conv_id, json.dumps(metadata))
+                pipe.delete(_stats_key(conv_id))
+                conversation_catalog.queue_end(pipe, conv_id, metadata["ended_at"])
+                pipe.publish("conversation_updates", conv_id)
+                await pipe.execute()
             
-            logger.info(f"Ended conversation: {self.current_conversation_id} ({metadata.get('thread_name', 'Untitled')}) with {self.message_count} messages")
+            logger.info(f"Ended conversation: {conv_id} ({metadata.get('thread_name', 'Untitled')}) with {self.message_count} messages")
             
             # Reset
             self.current_conversation_id = None
@@ -219,6 +259,14 @@ class ConversationManager:
         messages = self.redis.client.lrange(f"conv:{self.current_conversation_id}", -limit, -1)
         return [json.loads(msg) for msg in messages]
     
+    async def get_current_conversation_context_async(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Async version of get_current_conversation_context"""
+        if not self.current_conversation_id:
+            return []
+        
+        messages = await self.redis.aclient.lrange(f"conv:{self.current_conversation_id}", -limit, -1)
+        return [json.loads(msg) for msg in messages]
+    
     def get_all_conversations(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get all conversations with their messages"""
         conv_ids = self.redis.client.lrange("conversation_list", 0, limit - 1)
@@ -230,10 +278,64 @@ class ConversationManager:
                 if not metadata_str:
                     continue
                     
-                metadata = json.loads(metadata_str)
+                metadata = _merge_stats(json.loads(metadata_str), self.redis.client.hgetall(_stats_key(conv_id)))
                 messages = self.redis.client.lrange(f"conv:{conv_id}", 0, -1)
                 
-                metadata["messages"] = [json.loads(msg) for msg in messages if msg]
+                metadata["messages"] = self._archived_messages(conv_id, metadata, messages)
+                conversations.append(metadata)
+            except Exception as e:
+                logger.error(f"Error loading conversation {conv_id}: {e}")
+                continue
+        
+        return conversations
+    
+    async def get_all_conversations_async(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Async version of get_all_conversations, fetched in one pipelined round trip"""
+        conv_ids = await self.redis.aclient.lrange("conversation_list", 0, limit - 1)
+        return await self._load_conversations_async(conv_ids)
+    
+    async def get_conversations_between_async(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                              with_messages: bool = True) -> List[Dict[str, Any]]:
+        """Conversations started within [start, end], newest first"""
+        conv_ids = await self.redis.aclient.zrevrangebyscore(
+            conversation_catalog.BY_START,
+            end.timestamp() if end else "+inf",
+            start.timestamp() if start else "-inf"
+        )
+        return await self._load_conversations_async(conv_ids, with_messages)
+    
+    async def get_conversations_by_status_async(self, status: str, with_messages: bool = False) -> List[Dict[str, Any]]:
+        """Conversations in a catalog status set ('active' or 'completed')"""
+        conv_ids = await self.redis.aclient.smembers(conversation_catalog.status_key(status))
+        return await self._load_conversations_async(sorted(conv_ids, reverse=True), with_messages)
+    
+    async def _load_conversations_async(self, conv_ids: List[str], with_messages: bool = True) -> List[Dict[str, Any]]:
+        """Metadata (and optionally messages) for the given ids in one pipelined round trip"""
+        if not conv_ids:
+            return []
+        
+        per_conv = 3 if with_messages else 2
+        async with self.redis.aclient.pipeline(transaction=False) as pipe:
+            for conv_id in conv_ids:
+                pipe.hget("conversations", conv_id)
+                pipe.hgetall(_stats_key(conv_id))
+                if with_messages:
+                    pipe.lrange(f"conv:{conv_id}", 0, -1)
+            results = await pipe.execute()
+        
+        conversations = []
+        for i, conv_id in enumerate(conv_ids):
+            try:
+                metadata_str, stats = results[per_conv * i], results[per_conv * i + 1]
+                if not metadata_str:
+                    continue
+                
+                metadata = _merge_stats(json.loads(metadata_str), stats)
+                if with_messages:
+                    messages = results[per_conv * i + 2]
+                    if not messages and metadata.get("archived"):
+                        messages = await asyncio.to_thread(self._read_archive, conv_id)
+                    metadata["messages"] = _decode_messages(messages)
                 conversations.append(metadata)
             except Exception as e:
                 logger.error(f"Error loading conversation {conv_id}: {e}")
@@ -241,6 +343,22 @@ class ConversationManager:
         
         return conversations
     
+    def _read_archive(self, conversation_id: str) -> List[str]:
+        return self.redis.archive.read_key("conversations", conversation_id) or []
+    
+    def _archived_messages(self, conversation_id: str, metadata: Dict[str, Any], messages: List[str]) -> List[Dict[str, Any]]:
+        """Decode messages, reading them from disk once the thread was archived"""
+        if not messages and metadata.get("archived"):
+            messages = self._read_archive(conversation_id)
+        return _decode_messages(messages)
+    
+    async def get_conversation_messages_async(self, conversation_id: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """All messages of a conversation from Redis or the disk archive"""
+        messages = await self.redis.aclient.lrange(f"conv:{conversation_id}", 0, -1)
+        if not messages and metadata.get("archived"):
+            messages = await asyncio.to_thread(self._read_archive, conversation_id)
+        return _decode_messages(messages)
+    
     def get_conversation_by_id(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific conversation by ID"""
         try:
@@ -249,11 +367,11 @@ class ConversationManager:
             if not metadata_str:
                 return None
             
-            conversation = json.loads(metadata_str)
+            conversation = _merge_stats(json.loads(metadata_str), self.redis.client.hgetall(_stats_key(conversation_id)))
             
             # Get messages for this conversation
             messages = self.redis.client.lrange(f"conv:{conversation_id}", 0, -1)
-            conversation["messages"] = [json.loads(msg) for msg in messages if msg]
+            conversation["messages"] = self._archived_messages(conversation_id, conversation, messages)
             
             # Format timestamps - keep as is
             conversation['started_at'] = conversation.get('started_at', '')
@@ -279,7 +397,10 @@ class ConversationManager:
             if not metadata_str:
                 return {"current": None, "history": self.get_all_conversations(5)}
                 
-            current_metadata = json.loads(metadata_str)
+            current_metadata = _merge_stats(
+                json.loads(metadata_str),
+                self.redis.client.hgetall(_stats_key(self.current_conversation_id))
+            )
             current_messages = self.redis.client.lrange(f"conv:{self.current_conversation_id}", 0, -1)
             current_metadata["messages"] = [json.loads(msg) for msg in current_messages if msg]
             
@@ -291,11 +412,33 @@ class ConversationManager:
             logger.error(f"Error getting conversation for display: {e}")
             return {"current": None, "history": self.get_all_conversations(5)}
     
+    async def get_conversation_for_display_async(self) -> Dict[str, Any]:
+        """Async version of get_conversation_for_display"""
+        history = await self.get_all_conversations_async(5)
+        if not self.current_conversation_id:
+            return {"current": None, "history": history}
+        
+        try:
+            async with self.redis.aclient.pipeline(transaction=False) as pipe:
+                pipe.hget("conversations", self.current_conversation_id)
+                pipe.hgetall(_stats_key(self.current_conversation_id))
+                pipe.lrange(f"conv:{self.current_conversation_id}", 0, -1)
+                metadata_str, stats, current_messages = await pipe.execute()
+            if not metadata_str:
+                return {"current": None, "history": history}
+            
+            current_metadata = _merge_stats(json.loads(metadata_str), stats)
+            current_metadata["messages"] = [json.loads(msg) for msg in current_messages if msg]
+            return {"current": current_metadata, "history": history}
+        except Exception as e:
+            logger.error(f"Error getting conversation for display: {e}")
+            return {"current": None, "history": history}
+    
     async def _generate_thread_name(self) -> str:
         """Generate a meaningful thread name using Grok-2 based on conversation content"""
         try:
             # Get conversation messages
-            messages = self.get_current_conversation_context(20)
+            messages = await self.get_current_conversation_context_async(20)
             if not messages:
                 return "Empty Thread"
             
@@ -306,17 +449,10 @@ class ConversationManager:
             ])
             
             # Use CRITIC model (grok-2-1212) for thread naming
-            import httpx
+            from llm_gateway import get_gateway, PRIORITY_BACKGROUND
             import config
             
-            client = httpx.AsyncClient(
-                base_url="https://api.x.ai/v1",
-                headers={
-                    "Authorization": f"Bearer {config.GROK_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
+            client = get_gateway().session(PRIORITY_BACKGROUND, timeout=30.0, cache="thread_name")
             
             prompt = f"""Analyze this conversation between AI entities and generate a creative, evocative thread name.
 
@@ -362,7 +498,6 @@ Respond with ONLY the thread name, nothing else."""
             if len(thread_name) > 50:
                 thread_name = thread_name[:47] + "..."
                 
-            await client.aclose()
             return thread_name
             
         except Exception as e:
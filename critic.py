@@ -5,9 +5,9 @@ Evaluates agent outputs for accuracy and novelty
 import json
 import logging
 import asyncio
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime
-import httpx
+from llm_gateway import get_gateway, PRIORITY_CRITIC
 import config
 
 logger = logging.getLogger(__name__)
@@ -68,7 +68,7 @@ ACCEPT"""
                 "max_tokens": 100
             }
             
-            async with httpx.AsyncClient() as client:
+            async with get_gateway().session(PRIORITY_CRITIC, cache="critic") as client:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers=headers,
@@ -124,7 +124,7 @@ Does the statement below contradict the Beacon snippet?
                 "max_tokens": 20
             }
             
-            async with httpx.AsyncClient() as client:
+            async with get_gateway().session(PRIORITY_CRITIC, cache="hallucination") as client:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers=headers,
@@ -178,16 +178,21 @@ class CriticIntegration:
                                   agent_name: str,
                                   message: str,
                                   generate_func,
-                                  max_retries: int = 1) -> str:
-        """Process a message with potential critique and rewrite"""
+                                  max_retries: int = 1,
+                                  snapshot=None) -> str:
+        """Process a message with potential critique and rewrite (snapshot: the turn's TurnSnapshot)"""
         
         # Check if we should critique this message
         if not await self.should_critique(agent_name):
             return message
             
-        # Get context for critique
-        beacon_context = self._get_beacon_context()
-        conversation_context = self._get_conversation_context()
+        # Get context for critique, from the turn's reads when available
+        if snapshot is not None:
+            beacon_context = self._format_beacon_context(snapshot.beacon_data)
+            conversation_context = self._format_conversation_context(snapshot.board_history[:10])
+        else:
+            beacon_context = await self._get_beacon_context()
+            conversation_context = await self._get_conversation_context()
         
         # Evaluate the message
         verdict, advice = await self.critic.evaluate_message(
@@ -218,9 +223,11 @@ class CriticIntegration:
         logger.warning(f"CRITIC: All rewrites failed for {agent_name}, using original")
         return message
         
-    def _get_beacon_context(self) -> str:
+    async def _get_beacon_context(self) -> str:
         """Get recent beacon data for context"""
-        beacons = self.redis.get_beacon_feed(3)
+        return self._format_beacon_context(await self.redis.get_beacon_async(3))
+        
+    def _format_beacon_context(self, beacons: List[Dict[str, Any]]) -> str:
         if not beacons:
             return "No recent beacon data"
             
@@ -236,9 +243,11 @@ class CriticIntegration:
                     
         return "\n".join(context)
         
-    def _get_conversation_context(self) -> str:
+    async def _get_conversation_context(self) -> str:
         """Get recent conversation for context"""
-        messages = self.redis.get_board_history(10)
+        return self._format_conversation_context(await self.redis.get_board_async(10))
+        
+    def _format_conversation_context(self, messages: List[str]) -> str:
         context = []
         
         for msg in messages:
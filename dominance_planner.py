@@ -7,6 +7,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import random
 from redis_manager import RedisManager
+import entity_index
 
 logger = logging.getLogger(__name__)
 
@@ -54,42 +55,25 @@ class DominancePlanner:
         
         return insights
 
-    def gather_recent_context(self) -> Dict[str, Any]:
+    async def gather_recent_context(self) -> Dict[str, Any]:
         """Collect conversations and beacons from the last N hours for Dominance Protocol"""
         from datetime import datetime, timedelta
         cutoff = datetime.now() - timedelta(hours=self.analysis_window_hours)
         # Conversations
-        conv_ids = self.redis.client.lrange("conversation_list", 0, -1)
-        conversations = []
-        for conv_id in conv_ids:
-            meta = self.redis.client.hget("conversations", conv_id)
-            if not meta:
-                continue
-            try:
-                meta_obj = json.loads(meta)
-                started = meta_obj.get('started_at')
-                if started and datetime.fromisoformat(started) >= cutoff:
-                    messages = self.redis.client.lrange(f"conv:{conv_id}", 0, -1)
-                    meta_obj["messages"] = [json.loads(m) for m in messages if m]
-                    conversations.append(meta_obj)
-            except Exception:
-                continue
+        conv_mgr = self.redis.conversation_manager
+        if conv_mgr is None:
+            from conversation_manager import ConversationManager
+            conv_mgr = ConversationManager(self.redis)
+        conversations = await conv_mgr.get_conversations_between_async(cutoff)
         # Beacons
-        beacons_raw = self.redis.get_beacon_feed(50)
-        beacons = []
-        for b in beacons_raw:
-            try:
-                ts = b.get('timestamp')
-                if ts and datetime.fromisoformat(ts) >= cutoff:
-                    beacons.append(b)
-            except Exception:
-                continue
+        beacons = await self.redis.get_beacons_between_async(cutoff)
         return {"conversations": conversations, "beacons": beacons}
     
     def extract_beacon_intelligence(self, beacon_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Extract actionable intelligence from beacon signals"""
         intel = {
             "topics": [],
+            "trending_tokens": [],
             "market_sentiment": "neutral",
             "viral_patterns": [],
             "launch_opportunities": [],
@@ -98,47 +82,30 @@ class DominancePlanner:
         }
         
         for beacon in beacon_data:
-            if "posts" in beacon:
-                for post in beacon["posts"]:
-                    text = post.get("text", "").lower()
-                    
-                    # Extract trending tokens
-                    if "$" in text:
-                        tokens = [word for word in text.split() if word.startswith("$")]
-                        intel["trending_tokens"].extend(tokens)
-                    
-                    # Analyze sentiment
-                    if any(word in text for word in ["bullish", "moon", "pump", "launching"]):
-                        intel["market_sentiment"] = "bullish"
-                    elif any(word in text for word in ["bearish", "dump", "rug", "scam"]):
-                        intel["market_sentiment"] = "bearish"
-                    
-                    # Identify patterns
-                    if any(word in text for word in ["viral", "trending", "exploding"]):
-                        intel["viral_patterns"].append(text[:150])
-                    # Extract hashtags and handles heuristically
-                    for token in text.split():
-                        if token.startswith('#') and 1 < len(token) <= 30:
-                            intel["hashtags"].append(token)
-                    if post.get('author'):
-                        handle = f"@{post['author']}"
-                        intel["handles"].append(handle)
-            # Newer beacons may include tweets directly
-            for tw in (beacon.get('tweets') or []):
-                h = tw.get('handle')
-                if h and h.startswith('@'):
-                    intel["handles"].append(h)
-                txt = (tw.get('text') or '').lower()
-                for token in txt.split():
-                    if token.startswith('#') and 1 < len(token) <= 30:
-                        intel["hashtags"].append(token)
+            # Entities come pre-extracted at ingest (see entity_index)
+            entities = entity_index.beacon_entities(beacon)
+            intel["trending_tokens"].extend(entities["cashtags"])
+            intel["hashtags"].extend(entities["hashtags"])
+            intel["handles"].extend(entities["handles"])
+            for post in (beacon.get("posts") or []):
+                text = post.get("text", "").lower()
+                
+                # Analyze sentiment
+                if any(word in text for word in ["bullish", "moon", "pump", "launching"]):
+                    intel["market_sentiment"] = "bullish"
+                elif any(word in text for word in ["bearish", "dump", "rug", "scam"]):
+                    intel["market_sentiment"] = "bearish"
+                
+                # Identify patterns
+                if any(word in text for word in ["viral", "trending", "exploding"]):
+                    intel["viral_patterns"].append(text[:150])
         
         # Dedup and cap
         for k in ["trending_tokens", "viral_patterns", "launch_opportunities", "hashtags", "handles"]:
             intel[k] = list(dict.fromkeys(intel.get(k, [])))[:20]
         return intel
     
-    def generate_dominance_plan(self, conversation_insights: Dict[str, Any], 
+    async def generate_dominance_plan(self, conversation_insights: Dict[str, Any], 
                                beacon_intel: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a world dominance plan based on real signals (no hardcoded templates)"""
         # Always use $SUPEREGO
@@ -149,7 +116,7 @@ class DominancePlanner:
         topics = []
         handles = []
         try:
-            recent_beacons = self.redis.get_beacon_feed(10)
+            recent_beacons = await self.redis.get_beacon_async(10)
             for b in recent_beacons:
                 for t in (b.get('topics') or []):
                     if isinstance(t, str):
@@ -238,7 +205,7 @@ class DominancePlanner:
         }
         return plan
 
-    def evaluate_and_evolve(self) -> Optional[Dict[str, Any]]:
+    async def evaluate_and_evolve(self) -> Optional[Dict[str, Any]]:
         """Assess current plan against recent beacons and evolve with lightweight updates.
         - If actions mention topics/handles seen in recent beacons, mark progress.
         - If progress sufficient, add next-step actions and update notes.
@@ -246,9 +213,9 @@ class DominancePlanner:
         try:
             # Load the latest stored plan if not in memory
             if not self.current_plan:
-                latest_id = self.redis.client.lindex("plan_list", 0)
+                latest_id = await self.redis.aclient.lindex("plan_list", 0)
                 if latest_id:
-                    pdata = self.redis.client.hget("plans", latest_id)
+                    pdata = await self.redis.aclient.hget("plans", latest_id)
                     if pdata:
                         self.current_plan = json.loads(pdata)
             if not self.current_plan:
@@ -257,27 +224,20 @@ class DominancePlanner:
             # Collect recent signals (last 2 hours)
             from datetime import datetime, timedelta
             cutoff = datetime.now() - timedelta(hours=2)
-            beacons = [b for b in self.redis.get_beacon_feed(20) if b.get('timestamp') and datetime.fromisoformat(b['timestamp']) >= cutoff]
-            seen_texts = []
-            seen_handles = set()
-            for b in beacons:
-                for tw in (b.get('tweets') or []):
-                    seen_texts.append((tw.get('text') or '').lower())
-                    h = tw.get('handle')
-                    if h: seen_handles.add(h.lower())
-                for p in (b.get('posts') or []):
-                    seen_texts.append((p.get('text') or '').lower())
-                    a = p.get('author')
-                    if a: seen_handles.add(f"@{a}".lower())
-            # Score progress: any action string that includes a seen handle/topic counts
+            # Score progress: any action that names an entity seen in a recent beacon, or a mission word, counts
             actions = []
             for ph in plan.get('phases') or []:
                 if isinstance(ph, dict) and isinstance(ph.get('actions'), list):
                     actions.extend(ph['actions'])
+            action_entities = [entity_index.indexed(entity_index.extract(str(a))) for a in actions]
+            counts = await self.redis.count_entity_mentions_async(
+                [e for found in action_entities for e in found], since=cutoff
+            )
+            mission_words = (plan.get('mission') or '').lower().split()
             progress_hits = 0
-            for a in actions:
+            for a, found in zip(actions, action_entities):
                 al = str(a).lower()
-                if any(h in al for h in seen_handles) or any(t in al for t in (plan.get('mission') or '').lower().split()):
+                if any(counts.get(e) for e in found) or any(t in al for t in mission_words):
                     progress_hits += 1
             plan.setdefault('progress', {})
             plan['progress']['hits_last_2h'] = progress_hits
@@ -290,7 +250,7 @@ class DominancePlanner:
                 if isinstance(notes, list):
                     notes.append("Progress detected from live signals; appended recap action")
                     plan['notes'] = notes[-8:]
-            self.save_plan(plan)
+            await self.save_plan(plan)
             return plan
         except Exception:
             return None
@@ -432,7 +392,7 @@ class DominancePlanner:
             "chaos_coefficient": random.uniform(0.7, 0.99)
         }
     
-    def save_plan(self, plan: Dict[str, Any]) -> None:
+    async def save_plan(self, plan: Dict[str, Any]) -> None:
         """Save the dominance plan to Redis"""
         # Ensure plan id
         pid = plan.get("id") or f"PLAN_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -441,43 +401,44 @@ class DominancePlanner:
         self.current_plan = plan
         self.plan_history.append(plan)
 
-        # Store (legacy list for backward-compat)
-        self.redis.client.lpush("dominance_plans", json.dumps(plan))
-        self.redis.client.ltrim("dominance_plans", 0, 19)  # Keep last 20 plans
+        plan_json = json.dumps(plan)
+        async with self.redis.aclient.pipeline(transaction=False) as pipe:
+            # Store (legacy list for backward-compat)
+            pipe.lpush("dominance_plans", plan_json)
+            pipe.ltrim("dominance_plans", 0, 19)  # Keep last 20 plans
 
-        # Store like conversations: id list + hash
-        self.redis.client.lpush("plan_list", pid)
-        self.redis.client.ltrim("plan_list", 0, 49)  # keep last 50 ids
-        self.redis.client.hset("plans", pid, json.dumps(plan))
-        
-        # Track latest dominance_protocol plan explicitly for quick lookup
-        try:
+            # Store like conversations: id list + hash
+            pipe.lpush("plan_list", pid)
+            pipe.ltrim("plan_list", 0, 49)  # keep last 50 ids
+            pipe.hset("plans", pid, plan_json)
+            
+            # Track latest dominance_protocol plan explicitly for quick lookup
             if plan.get('protocol') == 'dominance_protocol' or plan.get('mission'):
-                self.redis.client.set('latest_dominance_protocol', pid)
-        except Exception:
-            pass
+                pipe.set('latest_dominance_protocol', pid)
 
-        # Publish for real-time updates
-        self.redis.client.publish("plan_updates", json.dumps(plan))
+            # Publish for real-time updates
+            pipe.publish("plan_updates", plan_json)
+            await pipe.execute()
 
         token_name = plan.get('token_name', plan.get('mission', 'UNKNOWN'))
         logger.info(f"Dominance plan saved: {pid} - {token_name}")
     
-    def get_current_plan(self) -> Optional[Dict[str, Any]]:
+    async def get_current_plan(self) -> Optional[Dict[str, Any]]:
         """Get the current active plan"""
         if not self.current_plan:
             # Try to load from Redis
-            latest = self.redis.client.lindex("dominance_plans", 0)
+            latest = await self.redis.aclient.lindex("dominance_plans", 0)
             if latest:
                 self.current_plan = json.loads(latest)
         return self.current_plan
 
-    def get_recent_plans(self, limit: int = 5) -> List[Dict[str, Any]]:
+    async def get_recent_plans(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent plans (metadata) like conversation history"""
-        ids = self.redis.client.lrange("plan_list", 0, limit - 1)
+        ids = await self.redis.aclient.lrange("plan_list", 0, limit - 1)
         results = []
-        for pid in ids:
-            meta = self.redis.client.hget("plans", pid)
+        if not ids:
+            return results
+        for meta in await self.redis.aclient.hmget("plans", ids):
             if meta:
                 try:
                     results.append(json.loads(meta))
@@ -485,7 +446,7 @@ class DominancePlanner:
                     continue
         return results
     
-    def evolve_plan(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+    async def evolve_plan(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
         """Evolve the plan based on execution feedback"""
         if not self.current_plan:
             return None
@@ -500,6 +461,6 @@ class DominancePlanner:
             self.current_plan["tactics"].append("MOMENTUM DETECTED: Activate hyperdrive")
         
         self.current_plan["last_evolution"] = datetime.now().isoformat()
-        self.save_plan(self.current_plan)
+        await self.save_plan(self.current_plan)
         
         return self.current_plan
\ No newline at end of file
@@ -3,7 +3,7 @@ Dynamic Sampling Configuration
 Implements Min-p sampling and other advanced decoding strategies
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from redis_manager import RedisManager
 import config
 
@@ -37,23 +37,30 @@ class DynamicSampling:
             }
         }
         
-    def get_decoder_config(self, agent_name: str) -> Dict[str, Any]:
-        """Get current decoder configuration for an agent"""
+    @staticmethod
+    def override_keys(agent_name: str) -> List[str]:
+        """Redis keys holding an agent's temperature/min_p/top_p overrides"""
+        agent_key = agent_name.lower()
+        return [f"{agent_key}_temperature", f"{agent_key}_min_p", f"{agent_key}_top_p"]
+        
+    async def get_decoder_config(self, agent_name: str,
+                                 overrides: Optional[List[Optional[str]]] = None) -> Dict[str, Any]:
+        """Get current decoder configuration for an agent (overrides: pre-fetched override_keys values)"""
         agent_key = agent_name.lower()
         
         # Start with base config
         config = self.base_configs.get(agent_key, self.base_configs['observer']).copy()
         
-        # Check for Redis overrides
-        temp_override = self.redis.client.get(f"{agent_key}_temperature")
+        # Check for Redis overrides (one round trip, skipped when already fetched)
+        if overrides is None:
+            overrides = await self.redis.aclient.mget(self.override_keys(agent_name))
+        temp_override, min_p_override, top_p_override = overrides
         if temp_override:
             config['temperature'] = float(temp_override)
             
-        min_p_override = self.redis.client.get(f"{agent_key}_min_p")
         if min_p_override:
             config['min_p'] = float(min_p_override)
         
-        top_p_override = self.redis.client.get(f"{agent_key}_top_p")
         if top_p_override:
             try:
                 tp = float(top_p_override)
@@ -90,10 +97,11 @@ class DynamicSampling:
                 self.redis.client.set(f"{agent_key}_{param}", value)
                 logger.info(f"Updated {agent_name} {param} to {value}")
                 
-    def get_creativity_profile(self, agent_name: str) -> str:
+    async def get_creativity_profile(self, agent_name: str) -> str:
         """Get a creativity profile description based on temperature + min_p"""
-        config = self.get_decoder_config(agent_name)
-        
+        return self._profile_for(await self.get_decoder_config(agent_name))
+    
+    def _profile_for(self, config: Dict[str, Any]) -> str:
         temp = config['temperature']
         min_p = config['min_p']
         
@@ -121,9 +129,10 @@ class DynamicSampling:
                 agent = key.replace('_top_p', '')
                 self.update_sampling_params(agent, {'top_p': value})
                 
-    def get_llm_config(self, agent_name: str) -> Dict[str, Any]:
+    async def get_llm_config(self, agent_name: str,
+                             overrides: Optional[List[Optional[str]]] = None) -> Dict[str, Any]:
         """Get complete LLM configuration including model and sampling"""
-        decoder_config = self.get_decoder_config(agent_name)
+        decoder_config = await self.get_decoder_config(agent_name, overrides)
         
         # Build config for Grok API
         llm_config = {
@@ -136,7 +145,7 @@ class DynamicSampling:
         # Grok-4 uses temperature + top_p only
         
         # Log creativity profile for monitoring
-        profile = self.get_creativity_profile(agent_name)
+        profile = self._profile_for(decoder_config)
         logger.debug(f"{agent_name} creativity: {profile} (temp={decoder_config['temperature']}, min_p={decoder_config['min_p']})")
         
         return llm_config
\ No newline at end of file
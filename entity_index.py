@@ -0,0 +1,118 @@
+"""
+Entities (handles, cashtags, hashtags, agent mentions) extracted once per beacon
+
+_store_beacon runs extract over every tweet at ingest and stores the result
+as structured fields, so consumers never re-tokenize beacon text:
+  tweet["entities"]   {"handles", "cashtags", "hashtags", "agents", "terms"}
+  beacon["entities"]  {"handles", "cashtags", "hashtags", "agents"} (union)
+All values are lowercased; "terms" are a tweet's first five words. Beacons
+stored before this existed are handled by beacon_entities(), which derives
+the same fields from their text.
+
+Inverted index, written with each beacon:
+  beacon_entity:<entity>   zset  beacon seq -> beacon timestamp (epoch seconds)
+Keys expire BEACON_ENTITY_TTL seconds after their last write and members
+older than that are pruned on write.
+"""
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+KEY_PREFIX = "beacon_entity"
+KINDS = ("handles", "cashtags", "hashtags", "agents")
+AGENT_NAMES = ("observer", "ego")
+
+# Same token shapes the agents' reference filter has always used
+HANDLE_RE = re.compile(r"@[A-Za-z0-9_]{1,30}")
+CASHTAG_RE = re.compile(r"\$[A-Za-z0-9]{2,12}")
+HASHTAG_RE = re.compile(r"#[A-Za-z0-9_]{2,30}")
+AGENT_RE = re.compile(r"\b(" + "|".join(AGENT_NAMES) + r")\b", re.IGNORECASE)
+_SPACES_RE = re.compile(r"\s{2,}")
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(v.lower() for v in values if v))
+
+
+def extract(text: str, handle: Optional[str] = None) -> Dict[str, List[str]]:
+    """Entities of one tweet; handle is the author's, counted among the handles"""
+    text = text or ""
+    handles = ([handle] if handle and handle.startswith("@") else []) + HANDLE_RE.findall(text)
+    return {
+        "handles": _unique(handles),
+        "cashtags": _unique(CASHTAG_RE.findall(text)),
+        "hashtags": _unique(HASHTAG_RE.findall(text)),
+        "agents": _unique(AGENT_RE.findall(text)),
+        "terms": text.lower().split()[:5]
+    }
+
+
+def merge(entity_sets: Iterable[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """Union of per-tweet entities, first-seen order"""
+    merged: Dict[str, List[str]] = {kind: [] for kind in KINDS}
+    for entities in entity_sets:
+        for kind in KINDS:
+            merged[kind].extend(entities.get(kind, []))
+    return {kind: list(dict.fromkeys(values)) for kind, values in merged.items()}
+
+
+def _items(beacon: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """(text, handle) sources of a beacon: v2 tweets, else legacy posts"""
+    if beacon.get("tweets"):
+        return [{"text": t.get("text", ""), "handle": t.get("handle")} for t in beacon["tweets"]]
+    return [
+        {"text": p.get("text", ""), "handle": f"@{p['author']}" if p.get("author") else None}
+        for p in (beacon.get("posts") or [])
+    ]
+
+
+def tweet_entities(beacon: Dict[str, Any]) -> List[Dict[str, List[str]]]:
+    """Per-tweet entities, stored or derived for older beacons"""
+    if beacon.get("tweets") and all("entities" in t for t in beacon["tweets"]):
+        return [t["entities"] for t in beacon["tweets"]]
+    return [extract(item["text"], item["handle"]) for item in _items(beacon)]
+
+
+def beacon_entities(beacon: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Beacon-level entities, stored or derived for older beacons"""
+    if "entities" in beacon:
+        return beacon["entities"]
+    return merge(tweet_entities(beacon))
+
+
+def allowed_references(beacon: Dict[str, Any]) -> Set[str]:
+    """Handles/cashtags/hashtags an agent may cite after reading this beacon"""
+    entities = beacon_entities(beacon)
+    allowed = set(entities["handles"]) | set(entities["cashtags"]) | set(entities["hashtags"])
+    # Also allow beacon topics as plain words
+    allowed.update(t.lower() for t in (beacon.get("topics") or []) if isinstance(t, str))
+    return allowed
+
+
+def scrub(text: str, allowed: Set[str]) -> str:
+    """Drop handles, cashtags and hashtags that are not in allowed"""
+    def repl(match):
+        token = match.group(0)
+        return token if token.lower() in allowed else ''
+    for regex in (HANDLE_RE, CASHTAG_RE, HASHTAG_RE):
+        text = regex.sub(repl, text)
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+def index_key(entity: str) -> str:
+    return f"{KEY_PREFIX}:{entity}"
+
+
+def indexed(entities: Dict[str, List[str]]) -> List[str]:
+    """Entities that get an inverted-index entry (agent mentions are per-beacon flags only)"""
+    return entities["handles"] + entities["cashtags"] + entities["hashtags"]
+
+
+def queue_index(pipe, seq: int, score: float, entities: Dict[str, List[str]], ttl: int):
+    """Add one beacon to the inverted index on a (sync or async) pipeline"""
+    cutoff = time.time() - ttl
+    for entity in indexed(entities):
+        key = index_key(entity)
+        pipe.zadd(key, {seq: score})
+        pipe.zremrangebyscore(key, "-inf", cutoff)
+        pipe.expire(key, ttl)
@@ -10,10 +10,9 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import hashlib
-import httpx
-import chromadb
-from chromadb.utils import embedding_functions
-from chromadb.config import Settings
+from llm_gateway import get_gateway, PRIORITY_CONSOLIDATION
+import chroma_registry
+from async_memory import get_executor
 from redis_manager import RedisManager
 import config
 
@@ -24,35 +23,22 @@ class HierarchicalMemory:
         self.agent_name = agent_name
         self.redis = redis_manager
         
-        # Initialize ChromaDB for long-term vector memory
-        self.chroma_client = chromadb.PersistentClient(
-            path=f"./chroma_db/{agent_name}_hierarchical",
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
-        )
-        
-        # Create collections for different memory types
-        self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        # Long-term vector memory lives in a per-agent store shared process-wide
+        store_path = f"./chroma_db/{agent_name}_hierarchical"
+        self.chroma_client = chroma_registry.get_client(store_path)
+        self.embedding_fn = chroma_registry.get_embedding_function()
         
         # Long-term episodic memories
-        self.episodic_collection = self.chroma_client.get_or_create_collection(
-            name=f"{agent_name}_episodic",
-            embedding_function=self.embedding_fn
-        )
+        self.episodic_collection = chroma_registry.get_collection(store_path, f"{agent_name}_episodic")
         
         # Synopsis memories (compressed summaries)
-        self.synopsis_collection = self.chroma_client.get_or_create_collection(
-            name=f"{agent_name}_synopsis",
-            embedding_function=self.embedding_fn
-        )
+        self.synopsis_collection = chroma_registry.get_collection(store_path, f"{agent_name}_synopsis")
         
         # Semantic knowledge extracted from conversations
-        self.semantic_collection = self.chroma_client.get_or_create_collection(
-            name=f"{agent_name}_semantic",
-            embedding_function=self.embedding_fn
-        )
+        self.semantic_collection = chroma_registry.get_collection(store_path, f"{agent_name}_semantic")
+        
+        # Embedding + Chroma writes run off the event loop
+        self.executor = get_executor()
         
     async def store_scratchpad(self, content: str, metadata: Dict[str, Any]):
         """Store in short-term scratchpad (Redis, 24h TTL)"""
@@ -64,19 +50,22 @@ class HierarchicalMemory:
         }
         
         key = f"scratchpad:{self.agent_name}:{datetime.now().timestamp()}"
-        self.redis.client.setex(key, 86400, json.dumps(entry))  # 24h TTL
-        
-        # Also add to recent scratchpad list
-        self.redis.client.lpush(f"scratchpad_list:{self.agent_name}", key)
-        self.redis.client.ltrim(f"scratchpad_list:{self.agent_name}", 0, 99)
+        async with self.redis.aclient.pipeline(transaction=False) as pipe:
+            pipe.setex(key, 86400, json.dumps(entry))  # 24h TTL
+            
+            # Also add to recent scratchpad list
+            pipe.lpush(f"scratchpad_list:{self.agent_name}", key)
+            pipe.ltrim(f"scratchpad_list:{self.agent_name}", 0, 99)
+            await pipe.execute()
         
     async def get_scratchpad(self, count: int = 10) -> List[Dict[str, Any]]:
         """Retrieve recent scratchpad entries"""
-        keys = self.redis.client.lrange(f"scratchpad_list:{self.agent_name}", 0, count-1)
+        keys = await self.redis.aclient.lrange(f"scratchpad_list:{self.agent_name}", 0, count-1)
         entries = []
+        if not keys:
+            return entries
         
-        for key in keys:
-            data = self.redis.client.get(key)
+        for data in await self.redis.aclient.mget(keys):
             if data:
                 entries.append(json.loads(data))
                 
@@ -86,7 +75,8 @@ class HierarchicalMemory:
         """Promote important memories to long-term episodic storage"""
         doc_id = hashlib.md5(f"{content}{datetime.now().isoformat()}".encode()).hexdigest()
         
-        self.episodic_collection.add(
+        await self.executor.run(
+            "promote_to_episodic", self.episodic_collection.add,
             documents=[content],
             ids=[doc_id],
             metadatas=[{
@@ -116,7 +106,8 @@ class HierarchicalMemory:
             # Store in synopsis collection
             doc_id = f"synopsis_{conversation_id}"
             
-            self.synopsis_collection.add(
+            await self.executor.run(
+                "create_synopsis", self.synopsis_collection.add,
                 documents=[synopsis],
                 ids=[doc_id],
                 metadatas=[{
@@ -158,7 +149,7 @@ Write a dense, information-rich summary:"""
                 "max_tokens": 256
             }
             
-            async with httpx.AsyncClient() as client:
+            async with get_gateway().session(PRIORITY_CONSOLIDATION) as client:
                 response = await client.post(
                     "https://api.x.ai/v1/chat/completions",
                     headers=headers,
@@ -179,22 +170,24 @@ Write a dense, information-rich summary:"""
         """Extract semantic facts and store them separately"""
         # Extract entities, facts, relationships
         facts = await self._extract_facts(content, context)
-        
-        for fact in facts:
-            doc_id = hashlib.md5(fact.encode()).hexdigest()
-            
-            # Check if fact already exists
-            existing = self.semantic_collection.get(ids=[doc_id])
-            if not existing['ids']:
-                self.semantic_collection.add(
-                    documents=[fact],
-                    ids=[doc_id],
-                    metadatas=[{
-                        'timestamp': datetime.now().isoformat(),
-                        'agent': self.agent_name,
-                        'source_context': context[:200]
-                    }]
-                )
+        if facts:
+            await self.executor.run("extract_semantic_knowledge", self._store_facts, facts, context)
+    
+    def _store_facts(self, facts: List[str], context: str):
+        """Add facts not already in the semantic collection (runs on the memory executor)"""
+        ids = [hashlib.md5(fact.encode()).hexdigest() for fact in facts]
+        existing = set(self.semantic_collection.get(ids=ids)['ids'])
+        new = {doc_id: fact for doc_id, fact in zip(ids, facts) if doc_id not in existing}
+        if new:
+            self.semantic_collection.add(
+                documents=list(new.values()),
+                ids=list(new.keys()),
+                metadatas=[{
+                    'timestamp': datetime.now().isoformat(),
+                    'agent': self.agent_name,
+                    'source_context': context[:200]
+                } for _ in new]
+            )
                 
     async def _extract_facts(self, content: str, context: str) -> List[str]:
         """Extract semantic facts from content"""
@@ -0,0 +1,148 @@
+"""
+Process-wide pooled HTTP clients
+- xai: keep-alive client for api.x.ai (optionally HTTP/2)
+- web: keep-alive client for X page fetches
+
+httpx clients belong to the event loop that first uses them, so each pool
+keeps one client per running loop. Callers take a PooledSession, which looks
+like an AsyncClient (post/get/stream, async with, aclose) but only carries
+per-call defaults; closing it leaves the shared connections open. The pools
+themselves are closed once at shutdown via aclose_all().
+"""
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import Any, Dict, Optional
+import httpx
+import config
+
+logger = logging.getLogger(__name__)
+
+XAI_BASE_URL = "https://api.x.ai/v1"
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def _http2_available() -> bool:
+    if not getattr(config, 'HTTP2_ENABLED', True):
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.debug("h2 not installed; pooled clients use HTTP/1.1")
+        return False
+    return True
+
+
+class HTTPPool:
+    """One long-lived AsyncClient per event loop"""
+
+    def __init__(self, name: str, **client_kwargs):
+        self.name = name
+        self.client_kwargs = client_kwargs
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                # Forget clients of loops that have since shut down
+                for dead in [l for l in self._clients if l.is_closed()]:
+                    del self._clients[dead]
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=getattr(config, 'HTTP_MAX_CONNECTIONS', 20),
+                        max_keepalive_connections=getattr(config, 'HTTP_MAX_KEEPALIVE', 10),
+                        keepalive_expiry=getattr(config, 'HTTP_KEEPALIVE_EXPIRY', 60.0)
+                    ),
+                    **self.client_kwargs
+                )
+                self._clients[loop] = client
+            return client
+
+    async def aclose(self):
+        """Close this loop's client"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing {self.name} HTTP pool: {e}")
+
+
+class PooledSession:
+    """AsyncClient-like view of a pool with per-call defaults"""
+
+    def __init__(self, pool: HTTPPool, timeout: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.pool = pool
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def _defaults(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        if self.headers:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+        return kwargs
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.pool.client().post(url, **self._defaults(kwargs))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.pool.client().get(url, **self._defaults(kwargs))
+
+    def stream(self, method: str, url: str, **kwargs):
+        return self.pool.client().stream(method, url, **self._defaults(kwargs))
+
+    async def aclose(self):
+        """Sessions share the pool; nothing to release"""
+
+    async def __aenter__(self) -> "PooledSession":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+_xai_pool = HTTPPool(
+    "xai",
+    base_url=XAI_BASE_URL,
+    headers={
+        "Authorization": f"Bearer {config.GROK_API_KEY}",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "User-Agent": "Grokgates/1.0"
+    },
+    timeout=httpx.Timeout(120.0, connect=30.0),
+    follow_redirects=True,
+    http2=_http2_available()
+)
+
+_web_pool = HTTPPool(
+    "web",
+    headers=BROWSER_HEADERS,
+    timeout=httpx.Timeout(15.0),
+    follow_redirects=True
+)
+
+
+def xai(timeout: Any = None, headers: Optional[Dict[str, str]] = None) -> PooledSession:
+    """Session on the shared xAI API pool"""
+    return PooledSession(_xai_pool, timeout, headers)
+
+
+def web(timeout: Any = None, headers: Optional[Dict[str, str]] = None) -> PooledSession:
+    """Session on the shared X page-fetch pool"""
+    return PooledSession(_web_pool, timeout, headers)
+
+
+async def aclose_all():
+    """Close both pools for the running loop (graceful shutdown)"""
+    await _xai_pool.aclose()
+    await _web_pool.aclose()
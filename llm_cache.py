@@ -0,0 +1,83 @@
+"""
+Content-addressed cache for deterministic LLM calls
+
+The key is a hash of the request payload (model, messages and every sampling
+or search parameter), so any change to the inputs is a different entry. Only
+200 responses are stored, with a TTL chosen per call type. Hit/miss counters
+are kept in the llm_cache_stats hash as "<kind>:hits" / "<kind>:misses".
+"""
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+import httpx
+import config
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm_cache"
+STATS_KEY = "llm_cache_stats"
+DEFAULT_TTL = 600
+
+
+def payload_digest(payload: Dict[str, Any]) -> str:
+    """Stable hash of a request payload"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Redis-backed response cache keyed by payload hash"""
+
+    def __init__(self, redis_manager):
+        self.redis = redis_manager
+        self.ttls: Dict[str, int] = getattr(config, 'LLM_CACHE_TTLS', {})
+
+    def cache_key(self, kind: str, payload: Dict[str, Any]) -> str:
+        return f"{KEY_PREFIX}:{kind}:{payload_digest(payload)}"
+
+    async def get(self, kind: str, url: str, payload: Dict[str, Any]) -> Optional[httpx.Response]:
+        """Cached response for this payload, or None"""
+        try:
+            client = self.redis.aclient
+            body = await client.get(self.cache_key(kind, payload))
+            await client.hincrby(STATS_KEY, f"{kind}:{'hits' if body else 'misses'}", 1)
+        except Exception as e:
+            logger.debug(f"LLM cache read failed for {kind}: {e}")
+            return None
+        if not body:
+            return None
+        return httpx.Response(
+            200,
+            content=body.encode("utf-8"),
+            headers={"content-type": "application/json", "x-cache": "HIT"},
+            request=httpx.Request("POST", url)
+        )
+
+    async def put(self, kind: str, payload: Dict[str, Any], response: httpx.Response):
+        if response.status_code != 200:
+            return
+        try:
+            await self.redis.aclient.set(
+                self.cache_key(kind, payload),
+                response.text,
+                ex=self.ttls.get(kind, DEFAULT_TTL)
+            )
+        except Exception as e:
+            logger.debug(f"LLM cache write failed for {kind}: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-kind hits, misses and hit rate (sync, for the status API)"""
+        try:
+            raw = self.redis.client.hgetall(STATS_KEY)
+        except Exception as e:
+            logger.debug(f"LLM cache stats unavailable: {e}")
+            return {}
+        stats: Dict[str, Dict[str, int]] = {}
+        for field, value in raw.items():
+            kind, _, counter = field.rpartition(":")
+            stats.setdefault(kind, {'hits': 0, 'misses': 0})[counter] = int(value)
+        for entry in stats.values():
+            total = entry['hits'] + entry['misses']
+            entry['hit_rate'] = round(entry['hits'] / total, 3) if total else 0.0
+        return stats
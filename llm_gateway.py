@@ -0,0 +1,367 @@
+"""
+Central gateway for every xAI chat completion call
+- Token bucket shared by all modules (LLM_REQUESTS_PER_MINUTE, LLM_BURST)
+- Priority queue: live agent turns, then critic, then planner/beacon, then consolidation
+- 429 Retry-After pauses all traffic, then the request is re-queued at its priority
+- One circuit breaker: after LLM_BREAKER_THRESHOLD consecutive 5xx/transport
+  failures calls fail fast for LLM_BREAKER_RESET seconds, then one probe is let through;
+  a probe that ends without an outcome (cancelled, callback error) re-opens it
+- Optional response cache: calls tagged with a cache kind are answered from
+  llm_cache without queueing once an LLMCache is attached
+"""
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+import http_pool
+import config
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_AGENT = 0           # agent turns and the conversation controller
+PRIORITY_CRITIC = 1
+PRIORITY_BACKGROUND = 2      # planner, beacon, thread naming
+PRIORITY_CONSOLIDATION = 3
+
+CHAT_PATH = "/chat/completions"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the breaker is open"""
+
+
+def retry_after_seconds(response: httpx.Response, default: float) -> float:
+    """Delay requested by a 429, from Retry-After seconds or HTTP date"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return default
+
+
+class LLMGateway:
+    """Rate limiter, priority scheduler and circuit breaker in one place"""
+
+    def __init__(self, requests_per_minute: float, burst: int, max_retries: int,
+                 default_retry_after: float, breaker_threshold: int, breaker_reset: float):
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+
+        # Bucket and breaker are shared by every loop in the process
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe: Optional[object] = None  # token of the half-open probe in flight
+
+        # Waiters are futures, so each loop keeps its own heap and wake-up timer
+        self._waiters: Dict[asyncio.AbstractEventLoop, List] = {}
+        self._timers: Dict[asyncio.AbstractEventLoop, asyncio.TimerHandle] = {}
+        self._seq = itertools.count()
+        self._stats = {'calls': 0, 'rate_limited': 0, 'failures': 0, 'rejected': 0}
+        self.cache = None
+
+    def attach_cache(self, cache):
+        """Enable response caching for calls that pass a cache kind"""
+        self.cache = cache
+
+    # --- token bucket -------------------------------------------------
+
+    def _take_token(self) -> float:
+        """Take a token; otherwise return seconds until one can be taken"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def _pump(self, loop: asyncio.AbstractEventLoop):
+        """Hand tokens to the highest-priority waiters of this loop"""
+        self._timers.pop(loop, None)
+        heap = self._waiters.get(loop)
+        while heap:
+            future = heap[0][2]
+            if future.done():
+                heapq.heappop(heap)
+                continue
+            wait = self._take_token()
+            if wait > 0:
+                self._timers[loop] = loop.call_later(wait, self._pump, loop)
+                return
+            heapq.heappop(heap)
+            future.set_result(None)
+
+    def paused_for(self) -> float:
+        """Seconds left on a Retry-After pause"""
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def note_rate_limit(self, delay: float):
+        """Pause all callers until the API accepts requests again"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._stats['rate_limited'] += 1
+        logger.warning(f"LLM rate limited; pausing all calls for {delay:.0f}s")
+
+    # --- circuit breaker ----------------------------------------------
+
+    def _check_breaker(self) -> Optional[object]:
+        """None when closed; the probe token when this call is the half-open probe"""
+        with self._lock:
+            if self._opened_at is None:
+                return None
+            if time.monotonic() - self._opened_at < self.breaker_reset or self._probe is not None:
+                self._stats['rejected'] += 1
+                raise CircuitOpenError("LLM circuit breaker is open")
+            # Half-open: let this one call through as a probe
+            self._probe = object()
+            return self._probe
+
+    def settle_probe(self, probe: Optional[object]):
+        """End of a request; a probe that recorded no outcome counts as failed"""
+        if probe is None:
+            return
+        with self._lock:
+            if self._probe is not probe:
+                return
+            self._probe = None
+            self._opened_at = time.monotonic()
+            self._stats['failures'] += 1
+        logger.warning("LLM breaker probe ended without a result; breaker re-opened")
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("LLM circuit breaker closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probe = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._stats['failures'] += 1
+            if self._probe is not None or self._failures >= self.breaker_threshold:
+                if self._opened_at is None or self._probe is not None:
+                    logger.error(f"LLM circuit breaker opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+                self._probe = None
+
+    # --- public API ---------------------------------------------------
+
+    async def acquire(self, priority: int = PRIORITY_AGENT) -> Optional[object]:
+        """Wait for a rate-limit slot; raises CircuitOpenError while the breaker is open
+
+        Returns the probe token when this call is the half-open probe; pass it
+        to settle_probe() once the request is over (slot() does both).
+        """
+        probe = self._check_breaker()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            heapq.heappush(self._waiters.setdefault(loop, []), (priority, next(self._seq), future))
+            if loop not in self._timers:
+                self._pump(loop)
+            await future
+        except BaseException:
+            self.settle_probe(probe)
+            raise
+        with self._lock:
+            self._stats['calls'] += 1
+        return probe
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_AGENT):
+        """acquire() for one request, settling a half-open probe however the request ends"""
+        probe = await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.settle_probe(probe)
+
+    async def post(self, url: str, payload: Dict[str, Any], priority: int = PRIORITY_AGENT,
+                   timeout: Any = None, headers: Optional[Dict[str, str]] = None,
+                   cache: Optional[str] = None) -> httpx.Response:
+        """POST through the shared xAI pool; 429s are retried here, other statuses returned"""
+        if cache and self.cache is not None:
+            cached = await self.cache.get(cache, url, payload)
+            if cached is not None:
+                return cached
+        response = await self._send(url, payload, priority, timeout, headers)
+        if cache and self.cache is not None:
+            await self.cache.put(cache, payload, response)
+        return response
+
+    async def _send(self, url: str, payload: Dict[str, Any], priority: int,
+                    timeout: Any, headers: Optional[Dict[str, str]]) -> httpx.Response:
+        session = http_pool.xai(timeout=timeout, headers=headers)
+        for attempt in range(self.max_retries + 1):
+            async with self.slot(priority):
+                try:
+                    response = await session.post(url, json=payload)
+                except httpx.TransportError:
+                    self.record_failure()
+                    raise
+                if not self._should_retry(response, attempt):
+                    return response
+        return response
+
+    def _should_retry(self, response: httpx.Response, attempt: int) -> bool:
+        """Record a response's outcome; True when it was a 429 worth retrying"""
+        if response.status_code >= 500:
+            self.record_failure()
+            return False
+        # A 429 still proves the service is up
+        self.record_success()
+        if response.status_code != 429 or attempt == self.max_retries:
+            return False
+        self.note_rate_limit(retry_after_seconds(response, self.default_retry_after))
+        return True
+
+    async def stream_chat(self, payload: Dict[str, Any], on_delta: Callable[[str], Awaitable[None]],
+                          priority: int = PRIORITY_AGENT, timeout: Any = None,
+                          headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Chat completion over SSE, awaiting on_delta(text) per token chunk
+
+        Returns a regular completion-shaped response once the stream ends, so
+        callers keep using raise_for_status() and json() as with chat().
+        """
+        session = http_pool.xai(timeout=timeout, headers=headers)
+        body = {**payload, "stream": True}
+        for attempt in range(self.max_retries + 1):
+            async with self.slot(priority):
+                try:
+                    async with session.stream("POST", CHAT_PATH, json=body) as response:
+                        if response.status_code != 200:
+                            await response.aread()
+                            if self._should_retry(response, attempt):
+                                continue
+                            return response
+                        self.record_success()
+                        content, finish_reason = await self._read_sse(response, on_delta)
+                except httpx.TransportError:
+                    self.record_failure()
+                    raise
+            return httpx.Response(
+                200,
+                json={"choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason
+                }]},
+                request=response.request
+            )
+        return response
+
+    @staticmethod
+    async def _read_sse(response: httpx.Response, on_delta) -> tuple:
+        """Assemble content and finish_reason from 'data:' events"""
+        parts: List[str] = []
+        finish_reason = "stop"
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                choice = (json.loads(data).get("choices") or [{}])[0]
+            except ValueError:
+                continue
+            delta = (choice.get("delta") or {}).get("content")
+            if delta:
+                parts.append(delta)
+                await on_delta(delta)
+            finish_reason = choice.get("finish_reason") or finish_reason
+        return "".join(parts), finish_reason
+
+    def session(self, priority: int = PRIORITY_AGENT, timeout: Any = None,
+                headers: Optional[Dict[str, str]] = None, cache: Optional[str] = None) -> "GatewaySession":
+        """Client-like view for call sites written against httpx.AsyncClient"""
+        return GatewaySession(self, priority, timeout, headers, cache)
+
+    async def chat(self, payload: Dict[str, Any], priority: int = PRIORITY_AGENT,
+                   timeout: Any = None, headers: Optional[Dict[str, str]] = None,
+                   cache: Optional[str] = None) -> httpx.Response:
+        return await self.post(CHAT_PATH, payload, priority=priority, timeout=timeout,
+                               headers=headers, cache=cache)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                'breaker_open': self._opened_at is not None,
+                'paused_for': round(max(0.0, self._paused_until - time.monotonic()), 1),
+                'queued': sum(len(h) for h in self._waiters.values())
+            }
+
+
+class GatewaySession:
+    """post()/async with over the gateway at a fixed priority"""
+
+    def __init__(self, gateway: LLMGateway, priority: int, timeout: Any,
+                 headers: Optional[Dict[str, str]], cache: Optional[str] = None):
+        self.gateway = gateway
+        self.priority = priority
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.cache = cache
+
+    async def post(self, url: str, json: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                   timeout: Any = None) -> httpx.Response:
+        return await self.gateway.post(
+            url, json, priority=self.priority,
+            timeout=timeout if timeout is not None else self.timeout,
+            headers={**self.headers, **(headers or {})},
+            cache=self.cache
+        )
+
+    async def __aenter__(self) -> "GatewaySession":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide LLM gateway"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(
+                requests_per_minute=getattr(config, 'LLM_REQUESTS_PER_MINUTE', 120),
+                burst=getattr(config, 'LLM_BURST', 10),
+                max_retries=getattr(config, 'LLM_MAX_RETRIES', 2),
+                default_retry_after=getattr(config, 'LLM_DEFAULT_RETRY_AFTER', 30.0),
+                breaker_threshold=getattr(config, 'LLM_BREAKER_THRESHOLD', 5),
+                breaker_reset=getattr(config, 'LLM_BREAKER_RESET', 60.0)
+            )
+        return _gateway
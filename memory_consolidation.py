@@ -3,12 +3,12 @@ Memory Consolidation Job
 Run nightly to consolidate short-term memories into long-term storage
 """
 import asyncio
-import json
 import logging
 from datetime import datetime
 from redis_manager import RedisManager
 from hierarchical_memory import HierarchicalMemory
 from conversation_manager import ConversationManager
+import http_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,12 +22,11 @@ async def consolidate_all_memories():
     
     # Consolidate for each agent
     agents = ['OBSERVER', 'EGO']
+    memories = {agent_name: HierarchicalMemory(agent_name, redis_mgr) for agent_name in agents}
     
     for agent_name in agents:
         logger.info(f"Consolidating memories for {agent_name}")
-        
-        # Create hierarchical memory instance
-        memory = HierarchicalMemory(agent_name, redis_mgr)
+        memory = memories[agent_name]
         
         try:
             # Run consolidation
@@ -41,29 +40,22 @@ async def consolidate_all_memories():
     logger.info("Archiving old conversations...")
     conv_mgr = ConversationManager(redis_mgr)
     
-    # Use current storage: list of IDs + hash for metadata + per-conv list for messages
-    conv_ids = redis_mgr.client.lrange("conversation_list", 0, -1)
+    # Only completed conversations qualify, so read them straight from the catalog
+    completed = await conv_mgr.get_conversations_by_status_async("completed")
     archived_count = 0
     
-    for conv_id in conv_ids:
+    for conversation in completed:
+        conv_id = conversation.get('id')
         try:
-            metadata_json = redis_mgr.client.hget("conversations", conv_id)
-            if not metadata_json:
-                continue
-            conversation = json.loads(metadata_json)
-            
-            # Check if conversation is completed and substantial
-            if (conversation.get('status') == 'completed' and 
-                conversation.get('message_count', 0) >= 5):
+            # Check if conversation is substantial
+            if conversation.get('message_count', 0) >= 5:
                 
                 # Load messages for this conversation
-                raw_msgs = redis_mgr.client.lrange(f"conv:{conv_id}", 0, -1)
-                messages = [json.loads(m) for m in raw_msgs if m]
+                messages = await conv_mgr.get_conversation_messages_async(conv_id, conversation)
                 
                 # Create synopsis for each agent
                 for agent_name in agents:
-                    memory = HierarchicalMemory(agent_name, redis_mgr)
-                    await memory.create_synopsis(
+                    await memories[agent_name].create_synopsis(
                         conversation['id'],
                         messages
                     )
@@ -75,6 +67,8 @@ async def consolidate_all_memories():
     
     logger.info(f"Archived {archived_count} conversations")
     logger.info(f"Memory consolidation completed at {datetime.now()}")
+    await redis_mgr.aclose()
+    await http_pool.aclose_all()
 
 async def cleanup_old_scratchpad():
     """Clean up old scratchpad entries"""
@@ -84,12 +78,13 @@ async def cleanup_old_scratchpad():
     # But we can also clean up the lists
     for agent in ['OBSERVER', 'EGO']:
         list_key = f"scratchpad_list:{agent}"
-        list_length = redis_mgr.client.llen(list_key)
+        list_length = await redis_mgr.aclient.llen(list_key)
         
         if list_length > 100:
             # Keep only last 100 entries
-            redis_mgr.client.ltrim(list_key, 0, 99)
+            await redis_mgr.aclient.ltrim(list_key, 0, 99)
             logger.info(f"Trimmed scratchpad list for {agent}")
+    await redis_mgr.aclose()
 
 if __name__ == "__main__":
     import sys
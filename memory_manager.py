@@ -2,14 +2,13 @@
 Memory Manager for Grokgates agents
 Uses ChromaDB for vector storage and retrieval
 """
-import chromadb
-from chromadb.config import Settings
 import hashlib
 import json
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import os
+import chroma_registry
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +17,8 @@ class MemoryManager:
         self.agent_name = agent_name
         self.persist_directory = os.path.join(persist_directory, agent_name.lower())
         
-        # Initialize ChromaDB with persistence
-        self.client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
-        )
+        # Shared ChromaDB store for this agent (opened once per process)
+        self.client = chroma_registry.get_client(self.persist_directory)
         
         # Create or get collections
         self.conversation_memory = self._get_or_create_collection("conversations")
@@ -37,13 +30,11 @@ class MemoryManager:
     def _get_or_create_collection(self, name: str):
         """Get or create a collection"""
         full_name = f"{self.agent_name.lower()}_{name}"
-        try:
-            return self.client.get_collection(full_name)
-        except:
-            return self.client.create_collection(
-                name=full_name,
-                metadata={"agent": self.agent_name, "type": name}
-            )
+        return chroma_registry.get_collection(
+            self.persist_directory,
+            full_name,
+            metadata={"agent": self.agent_name, "type": name}
+        )
     
     def _generate_id(self, content: str, timestamp: str) -> str:
         """Generate unique ID for memory"""
@@ -0,0 +1,136 @@
+"""
+Rolling near-duplicate index for shared board posts
+
+Each agent keeps a MinHash fingerprint of its last BOARD_DEDUP_WINDOW posts
+in Redis. Exact repeats are a single ZSCORE on the content digest; near
+repeats are found through LSH banding (one ZRANGEBYLEX per band) and then
+confirmed against the stored signatures, so a write never scans the window.
+
+Keys per agent:
+  board_fp:<agent>:exact   zset  digest -> insertion time (window order)
+  board_fp:<agent>:sig     hash  digest -> signature hex
+  board_lsh:<agent>        zset  "<band>:<band hex>:<digest>" (all score 0)
+"""
+import hashlib
+import random
+import time
+from typing import List, Optional, Tuple
+
+NUM_PERM = 64
+BAND_ROWS = 4
+NUM_BANDS = NUM_PERM // BAND_ROWS
+_HEX_WIDTH = 8  # one 32-bit signature value
+_BAND_WIDTH = BAND_ROWS * _HEX_WIDTH
+_PRIME = (1 << 61) - 1
+_MAX_HASH = 0xFFFFFFFF
+
+# Fixed seed: signatures must stay comparable across restarts
+_rng = random.Random(0x6B0A2D)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# Adds one fingerprint and evicts the oldest ones beyond the window, keeping
+# the LSH buckets in step with the signature hash
+INSERT_SCRIPT = """
+local bands = tonumber(ARGV[4])
+local width = tonumber(ARGV[5])
+local function members(digest, sig)
+  local out = {}
+  for i = 0, bands - 1 do
+    out[#out + 1] = string.format('%02d:%s:%s', i, string.sub(sig, i * width + 1, (i + 1) * width), digest)
+  end
+  return out
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+for _, m in ipairs(members(ARGV[1], ARGV[2])) do
+  redis.call('ZADD', KEYS[3], 0, m)
+end
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[6])
+if excess > 0 then
+  for _, digest in ipairs(redis.call('ZRANGE', KEYS[1], 0, excess - 1)) do
+    local sig = redis.call('HGET', KEYS[2], digest)
+    if sig then
+      for _, m in ipairs(members(digest, sig)) do
+        redis.call('ZREM', KEYS[3], m)
+      end
+      redis.call('HDEL', KEYS[2], digest)
+    end
+  end
+  redis.call('ZREMRANGEBYRANK', KEYS[1], 0, excess - 1)
+end
+return excess
+"""
+
+
+class Fingerprint:
+    """Content digest plus MinHash signature of one board post"""
+
+    def __init__(self, content: str):
+        self.digest = hashlib.md5(content.strip().encode()).hexdigest()
+        # Same tokenization as the old word-overlap similarity
+        tokens = set(content.lower().split())
+        self.has_tokens = bool(tokens)
+        self.signature = _minhash(tokens)
+        self.hex = "".join(f"{value:08x}" for value in self.signature)
+
+    def band(self, index: int) -> str:
+        return self.hex[index * _BAND_WIDTH:(index + 1) * _BAND_WIDTH]
+
+
+def _minhash(tokens: set) -> List[int]:
+    if not tokens:
+        return [_MAX_HASH] * NUM_PERM
+    hashed = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), 'big') for t in tokens]
+    return [min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashed) for a, b in _PERMUTATIONS]
+
+
+def estimated_similarity(fingerprint: Fingerprint, signature_hex: str) -> float:
+    """Fraction of matching MinHash values, an estimate of word-set Jaccard"""
+    matches = sum(
+        1 for i, value in enumerate(fingerprint.signature)
+        if signature_hex[i * _HEX_WIDTH:(i + 1) * _HEX_WIDTH] == f"{value:08x}"
+    )
+    return matches / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """Queues index reads/writes onto sync or asyncio Redis pipelines"""
+
+    def __init__(self, window: int, threshold: float):
+        self.window = window
+        self.threshold = threshold
+
+    @staticmethod
+    def _keys(agent: str) -> Tuple[str, str, str]:
+        return f"board_fp:{agent}:exact", f"board_fp:{agent}:sig", f"board_lsh:{agent}"
+
+    def queue_lookup(self, pipe, agent: str, fingerprint: Fingerprint) -> None:
+        """Exact-digest check followed by one bucket range per LSH band"""
+        exact_key, _, lsh_key = self._keys(agent)
+        pipe.zscore(exact_key, fingerprint.digest)
+        if fingerprint.has_tokens:
+            for i in range(NUM_BANDS):
+                prefix = f"{i:02d}:{fingerprint.band(i)}"
+                pipe.zrangebylex(lsh_key, f"[{prefix}:", f"({prefix};")
+
+    @staticmethod
+    def parse_lookup(results: list) -> Tuple[bool, List[str]]:
+        """Returns (exact duplicate, candidate digests)"""
+        exact = results[0] is not None
+        candidates = {member.rsplit(":", 1)[1] for bucket in results[1:] for member in bucket}
+        return exact, sorted(candidates)
+
+    def signature_key(self, agent: str) -> str:
+        return self._keys(agent)[1]
+
+    def best_match(self, fingerprint: Fingerprint, signatures: List[Optional[str]]) -> float:
+        return max((estimated_similarity(fingerprint, sig) for sig in signatures if sig), default=0.0)
+
+    def queue_insert(self, pipe, script, agent: str, fingerprint: Fingerprint):
+        """Queue the insert script; script comes from the client's register_script.
+        With an asyncio pipeline the returned coroutine must be awaited to queue it."""
+        return script(
+            keys=list(self._keys(agent)),
+            args=[fingerprint.digest, fingerprint.hex, time.time(), NUM_BANDS, _BAND_WIDTH, self.window],
+            client=pipe
+        )
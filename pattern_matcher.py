@@ -0,0 +1,79 @@
+"""
+Aho-Corasick multi-pattern matcher
+
+Built once over every pattern (e.g. all active proposals and their normalized
+variants) and run in a single pass per document, so the cost is linear in
+the text scanned plus the number of hits, however many patterns there are.
+Matching is case-insensitive and a hit must start at a word boundary.
+"$BONK", "#bonk" and "bonk" are interchangeable through variants().
+"""
+import re
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+_SIGILS = "$#@"
+_SPACES_RE = re.compile(r"\s+")
+
+
+def variants(text: str) -> List[str]:
+    """Lowercased forms of a phrase to match: as written and without $/#/@ sigils"""
+    base = _SPACES_RE.sub(" ", text.strip().lower())
+    bare = " ".join(word.lstrip(_SIGILS) for word in base.split(" "))
+    return [v for v in dict.fromkeys((base, bare)) if v]
+
+
+class PatternMatcher:
+    """Trie with failure links over all variants of all keys"""
+
+    def __init__(self, patterns: Dict[Hashable, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[Hashable, int]]] = [[]]
+        for key, texts in patterns.items():
+            for text in texts:
+                if text:
+                    self._add(key, text.lower())
+        self._link()
+
+    def _add(self, key: Hashable, text: str):
+        node = 0
+        for ch in text:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((key, len(text)))
+
+    def _link(self):
+        """Breadth-first failure links; each node inherits the outputs of its fallback"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def scan(self, documents: Iterable[str]) -> Dict[Hashable, List[Tuple[int, int]]]:
+        """Hits per key as (document index, start offset), in document order"""
+        hits: Dict[Hashable, List[Tuple[int, int]]] = {}
+        for doc_index, document in enumerate(documents):
+            text = (document or "").lower()
+            node = 0
+            for pos, ch in enumerate(text):
+                while node and ch not in self._goto[node]:
+                    node = self._fail[node]
+                node = self._goto[node].get(ch, 0)
+                for key, length in self._out[node]:
+                    start = pos - length + 1
+                    # Word start: not preceded by a letter or digit
+                    if start == 0 or not text[start - 1].isalnum():
+                        hits.setdefault(key, []).append((doc_index, start))
+        return hits
@@ -1,15 +1,63 @@
 """
 Proposal Extractor for Beacon v1.5
 Harvests PROPOSE> tags from agent conversations
+
+Tags are parsed once, when ConversationManager.add_message writes the message
+(queue_proposals), into a time-indexed zset per conversation:
+  proposals_by_time:<conv id>   zset  {"text", "agent", "timestamp"} JSON -> epoch seconds
+Entries older than PROPOSAL_TIMELINE_RETENTION are pruned on write and the
+key expires that long after its last tag. extract_proposals only reads the
+requested window of the current conversation.
+
+Proposals already sent to the beacon are kept by canonical text (lowercase,
+single-spaced, without $/#/@ sigils) for O(1) dedup:
+  proposal_records    hash  canonical text -> {"text", "agent", "timestamp", "phase", "hit"} JSON
+  proposal_timeline   zset  canonical text -> epoch seconds of the last save
+Only the newest PROPOSAL_HISTORY_SIZE records are kept.
 """
 import re
-from typing import List, Dict, Tuple
+import ast
+from typing import List, Dict, Set, Tuple
 from datetime import datetime, timedelta
 from collections import Counter
+import json
 import logging
+import time
+from pattern_matcher import PatternMatcher, variants
+import config
 
 logger = logging.getLogger(__name__)
 
+TIMELINE_PREFIX = "proposals_by_time"
+RECORDS_KEY = "proposal_records"
+HISTORY_TIMELINE_KEY = "proposal_timeline"
+LEGACY_HISTORY_KEY = "proposal_history"
+PROPOSAL_PATTERN = re.compile(r'PROPOSE>\s*(.+?)(?:\n|$)', re.IGNORECASE)
+
+
+def canonical(text: str) -> str:
+    """Dedup key of a proposal: "$BONK  Pump" and "bonk pump" are the same proposal"""
+    return variants(text)[-1] if text.strip() else ""
+
+
+def timeline_key(conv_id: str) -> str:
+    return f"{TIMELINE_PREFIX}:{conv_id}"
+
+
+def queue_proposals(pipe, conv_id: str, agent: str, content: str, timestamp: datetime):
+    """Index the PROPOSE> tags of one new message on the writer's pipeline"""
+    matches = PROPOSAL_PATTERN.findall(content or "")
+    if not matches:
+        return
+    key = timeline_key(conv_id)
+    score = timestamp.timestamp()
+    for match in matches:
+        entry = json.dumps({'text': match.strip(), 'agent': agent, 'timestamp': timestamp.isoformat()})
+        pipe.zadd(key, {entry: score})
+    retention = getattr(config, 'PROPOSAL_TIMELINE_RETENTION', 86400)
+    pipe.zremrangebyscore(key, "-inf", time.time() - retention)
+    pipe.expire(key, retention)
+
 class Proposal:
     def __init__(self, text: str, agent: str, timestamp: datetime):
         self.text = text.strip()
@@ -23,7 +71,7 @@ class Proposal:
 class ProposalExtractor:
     def __init__(self, redis_manager):
         self.redis = redis_manager
-        self.proposal_pattern = re.compile(r'PROPOSE>\s*(.+?)(?:\n|$)', re.IGNORECASE)
+        self.proposal_pattern = PROPOSAL_PATTERN
         self.profanity_filter = ['fuck', 'shit', 'damn', 'ass', 'bitch']  # Basic filter
         # Adaptive keyword memory backed by Redis; seeded with a few realistic anchors
         seed_keywords = [
@@ -46,38 +94,71 @@ class ProposalExtractor:
         except Exception:
             pass
         self.ban_phrases = seed_ban
+        self._migrate_legacy_history()
         
-    def extract_proposals(self, time_window_minutes: int = 30) -> List[Proposal]:
-        """Extract proposals from the last N minutes of conversation"""
-        proposals = []
+    def _migrate_legacy_history(self):
+        """Move the old str(dict) proposal_history list into the record hash (one-off)"""
+        try:
+            entries = self.redis.client.lrange(LEGACY_HISTORY_KEY, 0, -1)
+            if not entries:
+                return
+            records = {}
+            timeline = {}
+            # Oldest first so the newest record for a text wins
+            for raw in reversed(entries):
+                try:
+                    entry = ast.literal_eval(raw)
+                    key = canonical(entry['text'])
+                    score = datetime.fromisoformat(entry['timestamp']).timestamp()
+                except Exception:
+                    continue
+                if key:
+                    records[key] = json.dumps(entry)
+                    timeline[key] = score
+            pipe = self.redis.client.pipeline(transaction=True)
+            if records:
+                pipe.hset(RECORDS_KEY, mapping=records)
+                pipe.zadd(HISTORY_TIMELINE_KEY, timeline)
+            pipe.delete(LEGACY_HISTORY_KEY)
+            pipe.execute()
+            logger.info(f"Migrated {len(records)} proposals from the legacy history list")
+        except Exception as e:
+            logger.warning(f"Legacy proposal history migration failed: {e}")
         
-        # Get recent messages from current conversation
-        current_conv = self.redis.get_current_conversation()
-        if not current_conv:
+    async def extract_proposals(self, time_window_minutes: int = 30) -> List[Proposal]:
+        """Extract proposals from the last N minutes of the current conversation"""
+        proposals = []
+        manager = self.redis.conversation_manager
+        conv_id = manager.current_conversation_id if manager else None
+        if not conv_id:
             return proposals
-            
         cutoff_time = datetime.now() - timedelta(minutes=time_window_minutes)
         
-        for msg in current_conv.get('messages', []):
-            msg_time = datetime.fromisoformat(msg['timestamp'])
-            if msg_time < cutoff_time:
-                continue
-                
-            # Find all PROPOSE> tags in the message
-            matches = self.proposal_pattern.findall(msg['content'])
-            for match in matches:
-                proposal = Proposal(
-                    text=match,
-                    agent=msg['agent'],
-                    timestamp=msg_time
-                )
-                if self._validate_proposal(proposal):
-                    proposals.append(proposal)
+        # Proposals were indexed as their messages were written
+        client = self.redis.aclient
+        entries = await client.zrangebyscore(timeline_key(conv_id), cutoff_time.timestamp(), "+inf")
+        candidates = []
+        for raw in entries:
+            item = json.loads(raw)
+            candidates.append(Proposal(
+                text=item['text'],
+                agent=item['agent'],
+                timestamp=datetime.fromisoformat(item['timestamp'])
+            ))
+        if not candidates:
+            return proposals
+        
+        # One batched lookup against the history instead of a scan per candidate
+        keys = list({canonical(p.text) for p in candidates})
+        seen = {k for k, record in zip(keys, await client.hmget(RECORDS_KEY, keys)) if record}
+        for proposal in candidates:
+            if self._validate_proposal(proposal, seen):
+                proposals.append(proposal)
                     
         # Rank and deduplicate
-        return self._rank_proposals(proposals)
+        return await self._rank_proposals(proposals)
         
-    def _validate_proposal(self, proposal: Proposal) -> bool:
+    def _validate_proposal(self, proposal: Proposal, seen: Set[str]) -> bool:
         """Filter out invalid or inappropriate proposals"""
         text = proposal.text.lower()
         
@@ -112,19 +193,13 @@ class ProposalExtractor:
             if not any(p in text for p in ['solana','ethereum','bitcoin','grok','gpt','bonk','elon','openai','xai','ai agent','memecoin']):
                 return False
         
-        # Deduplicate across recent proposals (last 200)
-        try:
-            recent = self.redis.client.lrange('proposal_history', 0, 199)
-            lowered = text.strip().lower()
-            for entry in recent:
-                if isinstance(entry, str) and lowered in entry.lower():
-                    return False
-        except Exception:
-            pass
+        # Deduplicate against proposals already sent to the beacon
+        if canonical(proposal.text) in seen:
+            return False
             
         return True
         
-    def _rank_proposals(self, proposals: List[Proposal], max_proposals: int = 5) -> List[Proposal]:
+    async def _rank_proposals(self, proposals: List[Proposal], max_proposals: int = 5) -> List[Proposal]:
         """Rank proposals by recency and echo frequency"""
         if not proposals:
             return []
@@ -168,7 +243,7 @@ class ProposalExtractor:
                 prev = set(self.signal_keywords)
                 merged = prev.union(new_keys)
                 self.signal_keywords = list(merged)
-                self.redis.client.set('adaptive_signal_keywords', ','.join(sorted(merged)))
+                await self.redis.aclient.set('adaptive_signal_keywords', ','.join(sorted(merged)))
             # Extract obviously fantastical words to ban next time (if appear without anchors)
             if not new_keys:
                 weird_tokens = [w for w in re.findall(r'[a-z]{6,}', accepted_texts) if w.endswith(('ism','ity','tion'))]
@@ -176,33 +251,49 @@ class ProposalExtractor:
                     prev_ban = set(self.ban_phrases)
                     merged_ban = prev_ban.union(weird_tokens[:3])
                     self.ban_phrases = list(merged_ban)
-                    self.redis.client.set('adaptive_ban_phrases', ','.join(sorted(merged_ban)))
+                    await self.redis.aclient.set('adaptive_ban_phrases', ','.join(sorted(merged_ban)))
         except Exception:
             pass
         return top
         
-    def save_proposal_history(self, proposals: List[Proposal], phase: str):
+    async def save_proposal_history(self, proposals: List[Proposal], phase: str):
         """Save proposals to Redis for tracking"""
+        records = {}
+        timeline = {}
+        now = time.time()
         for p in proposals:
-            entry = {
+            key = canonical(p.text)
+            if not key:
+                continue
+            records[key] = json.dumps({
                 'text': p.text,
                 'agent': p.agent,
                 'timestamp': p.timestamp.isoformat(),
                 'phase': phase,
                 'hit': p.hit
-            }
-            self.redis.client.lpush('proposal_history', str(entry))
-            # Keep only last 100 proposals
-            self.redis.client.ltrim('proposal_history', 0, 99)
+            })
+            timeline[key] = now
+        if not records:
+            return
+        keep = getattr(config, 'PROPOSAL_HISTORY_SIZE', 100)
+        client = self.redis.aclient
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(RECORDS_KEY, mapping=records)
+            pipe.zadd(HISTORY_TIMELINE_KEY, timeline)
+            # Anything older than the newest `keep` records is evicted
+            pipe.zrange(HISTORY_TIMELINE_KEY, 0, -(keep + 1))
+            pipe.zremrangebyrank(HISTORY_TIMELINE_KEY, 0, -(keep + 1))
+            stale = (await pipe.execute())[2]
+        if stale:
+            await client.hdel(RECORDS_KEY, *stale)
             
-    def mark_hits(self, proposals: List[Proposal], beacon_content: str):
-        """Check which proposals appeared in beacon"""
-        beacon_lower = beacon_content.lower()
-        
-        for p in proposals:
-            # Simple substring match for now
-            if p.text.lower() in beacon_lower:
-                p.hit = True
-                logger.info(f"Proposal HIT: '{p.text}' found in beacon!")
-                
-        return proposals
\ No newline at end of file
+    def mark_hits(self, proposals: List[Proposal], documents: List[str]) -> Dict[int, List[Tuple[int, int]]]:
+        """Check which proposals appeared in the beacon texts, in one pass over all of them
+        Returns (document index, offset) hit positions keyed by proposal index.
+        """
+        matcher = PatternMatcher({i: variants(p.text) for i, p in enumerate(proposals)})
+        hits = matcher.scan(documents)
+        for i, positions in hits.items():
+            proposals[i].hit = True
+            logger.info(f"Proposal HIT: '{proposals[i].text}' found in {len({d for d, _ in positions})} beacon texts!")
+        return hits
\ No newline at end of file
@@ -2,13 +2,19 @@
 Redis interface for shared board and beacon feed
 """
 import redis
+import redis.asyncio as aioredis
 import json
 import asyncio
-import hashlib
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import config
+from archive_store import ArchiveStore
+import beacon_index
+import entity_index
+import conversation_catalog
+from near_duplicate import Fingerprint, NearDuplicateIndex, INSERT_SCRIPT
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,26 @@ class RedisManager:
         )
         self.pubsub = self.client.pubsub()
         self.conversation_manager = None  # Will be set by orchestrator
+        # Per-agent fingerprint index used to drop repeated board posts
+        self.board_index = NearDuplicateIndex(
+            window=getattr(config, 'BOARD_DEDUP_WINDOW', 1000),
+            threshold=getattr(config, 'BOARD_DEDUP_SIMILARITY', 0.8)
+        )
+        self.dedup_exempt = set(getattr(config, 'BOARD_DEDUP_EXEMPT', ["SYSTEM"]))
+        self._insert_script = self.client.register_script(INSERT_SCRIPT)
+        self._beacon_append_script = self.client.register_script(beacon_index.APPEND_SCRIPT)
+        self._beacon_window_script = self.client.register_script(beacon_index.WINDOW_SCRIPT)
+        # Disk tier for entries rolled out of Redis by the retention task
+        self.archive = ArchiveStore(
+            getattr(config, 'ARCHIVE_DIR', 'archive'),
+            getattr(config, 'ARCHIVE_SEGMENT_BYTES', 64 * 1024 * 1024)
+        )
+        # Native asyncio client for coroutines, created per event loop
+        self._aclient = None
+        self._aclient_loop = None
+        self._ainsert_script = None
+        self._abeacon_append_script = None
+        self._abeacon_window_script = None
         
         # Test connection
         try:
@@ -29,62 +55,122 @@ class RedisManager:
             print("Connected to Redis server")
         except redis.ConnectionError:
             raise Exception("Redis server not available. Please ensure Redis is running.")
+        self._backfill_beacon_index()
+        try:
+            conversation_catalog.backfill(self.client)
+        except Exception as e:
+            logger.error(f"Conversation catalog backfill failed: {e}")
+    
+    def _backfill_beacon_index(self):
+        """Index beacons stored before the time index existed"""
+        try:
+            if self.client.exists(beacon_index.SEQ_KEY):
+                return
+            entries = self.client.lrange(beacon_index.FEED_KEY, 0, -1)
+            if not entries:
+                return
+            # Position p of n entries maps to seq n - p
+            mapping = {}
+            for position, entry in enumerate(entries):
+                try:
+                    score = beacon_index.beacon_score(json.loads(entry))
+                except Exception:
+                    continue
+                mapping[str(len(entries) - position)] = score
+            pipe = self.client.pipeline(transaction=True)
+            if mapping:
+                pipe.zadd(beacon_index.INDEX_KEY, mapping)
+            pipe.setnx(beacon_index.SEQ_KEY, len(entries))
+            pipe.execute()
+            logger.info(f"Indexed {len(mapping)} existing beacons by time")
+        except Exception as e:
+            logger.error(f"Beacon index backfill failed: {e}")
+        
+    @property
+    def aclient(self) -> aioredis.Redis:
+        """Asyncio Redis client sharing one connection pool per running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            pool = aioredis.ConnectionPool(
+                host=config.REDIS_HOST,
+                port=config.REDIS_PORT,
+                db=config.REDIS_DB,
+                decode_responses=True,
+                max_connections=getattr(config, 'REDIS_MAX_CONNECTIONS', 32)
+            )
+            self._aclient = aioredis.Redis(connection_pool=pool)
+            self._aclient_loop = loop
+            self._ainsert_script = self._aclient.register_script(INSERT_SCRIPT)
+            self._abeacon_append_script = self._aclient.register_script(beacon_index.APPEND_SCRIPT)
+            self._abeacon_window_script = self._aclient.register_script(beacon_index.WINDOW_SCRIPT)
+        return self._aclient
+    
+    async def aclose(self):
+        """Close the asyncio client and its connection pool"""
+        if self._aclient is not None:
+            try:
+                await self._aclient.aclose()
+                await self._aclient.connection_pool.disconnect()
+            except Exception as e:
+                logger.debug(f"Error closing async Redis client: {e}")
+            self._aclient = None
+            self._aclient_loop = None
         
     def write_board(self, agent_name: str, content: str) -> None:
         """Write to the shared board with timestamp and deduplication"""
         timestamp = datetime.now().isoformat()
         
-        # Create content hash for better duplicate detection
-        content_hash = hashlib.md5(content.strip().encode()).hexdigest()
-        
-        # Check for duplicate content in recent messages
-        recent_entries = self.client.lrange("shared_board", 0, 19)  # Check last 20
-        for entry in recent_entries:
-            parts = entry.split("|", 2)
-            if len(parts) >= 3:
-                _, recent_agent, recent_content = parts
-                recent_hash = hashlib.md5(recent_content.strip().encode()).hexdigest()
-                
-                # Skip if same agent posted exact same content recently
-                if recent_agent == agent_name and recent_hash == content_hash:
-                    logger.debug(f"Skipping duplicate from {agent_name}")
-                    return  # Skip duplicate
-                
-                # Also skip if content is too similar (>80% match)
-                if recent_agent == agent_name:
-                    similarity = self._calculate_similarity(recent_content, content)
-                    if similarity > 0.8:
-                        logger.debug(f"Skipping similar content from {agent_name} (similarity: {similarity:.2f})")
-                        return
+        # Check the agent's rolling fingerprint index for repeats
+        fingerprint = None
+        if agent_name not in self.dedup_exempt:
+            fingerprint = Fingerprint(content)
+            pipe = self.client.pipeline(transaction=False)
+            self.board_index.queue_lookup(pipe, agent_name, fingerprint)
+            exact, candidates = self.board_index.parse_lookup(pipe.execute())
+            signatures = self.client.hmget(self.board_index.signature_key(agent_name), candidates) if candidates else []
+            if self._is_repeat(agent_name, fingerprint, exact, signatures):
+                return
         
         entry = f"{timestamp}|{agent_name}|{content}"
         
-        self.client.lpush("shared_board", entry)
-        # No limit - store all messages permanently
-        
-        # Also add to conversation thread if manager exists
-        if self.conversation_manager:
-            # This will need to be handled asynchronously by the caller
-            pass
+        pipe = self.client.pipeline(transaction=False)
+        pipe.lpush("shared_board", entry)
+        # Older entries are rolled to disk by the retention task
         
         # Publish for real-time updates
-        self.client.publish("board_updates", entry)
+        pipe.publish("board_updates", entry)
+        if fingerprint:
+            self.board_index.queue_insert(pipe, self._insert_script, agent_name, fingerprint)
+        pipe.execute()
     
     def get_board_history(self, count: int = 15) -> List[str]:
         """Get recent board entries"""
         entries = self.client.lrange("shared_board", 0, count - 1)
+        if len(entries) < count:
+            entries += self.archive.read_recent("board", count - len(entries))
         return entries
     
     def push_beacon(self, beacon_data: Dict[str, Any]) -> None:
         """Push new beacon data to feed"""
-        self.client.lpush("beacon_feed", json.dumps(beacon_data))
-        # No limit - store all beacons permanently
+        self.add_beacon(beacon_data)
         
     def get_beacon_feed(self, count: int = 5) -> List[Dict[str, Any]]:
         """Get recent beacon entries (newest first)"""
         entries = self.client.lrange("beacon_feed", 0, count - 1)
+        if len(entries) < count:
+            entries += self.archive.read_recent("beacon", count - len(entries))
         return [json.loads(entry) for entry in entries if entry]
     
+    def get_beacons_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Beacons timestamped within [start, end] from the hot window, newest first"""
+        low, high = beacon_index.window_bounds(start, end)
+        entries = self._beacon_window_script(keys=beacon_index.WINDOW_KEYS, args=[low, high])
+        return [json.loads(entry) for entry in entries if entry]
+    
+    def get_beacon_count(self) -> int:
+        """Total beacons ever stored, including archived ones"""
+        return int(self.client.get(beacon_index.SEQ_KEY) or 0)
+    
     def subscribe_board_updates(self):
         """Subscribe to real-time board updates"""
         self.pubsub.subscribe("board_updates")
@@ -92,32 +178,124 @@ class RedisManager:
     
     def clear_all(self):
         """Clear all data (for testing)"""
-        self.client.delete("shared_board", "beacon_feed")
+        self.client.delete("shared_board", beacon_index.FEED_KEY, beacon_index.INDEX_KEY, beacon_index.SEQ_KEY, beacon_index.SEEN_KEY)
     
     async def get_board_async(self, count: int = 15) -> List[str]:
         """Async version for board retrieval"""
-        return await asyncio.to_thread(self.get_board_history, count)
+        entries = await self.aclient.lrange("shared_board", 0, count - 1)
+        return await self.backfill_async("board", entries, count)
     
     async def get_beacon_async(self, count: int = 5) -> List[Dict[str, Any]]:
         """Async version for beacon retrieval"""
-        return await asyncio.to_thread(self.get_beacon_feed, count)
+        entries = await self.aclient.lrange("beacon_feed", 0, count - 1)
+        entries = await self.backfill_async("beacon", entries, count)
+        return [json.loads(entry) for entry in entries if entry]
+    
+    async def backfill_async(self, stream: str, entries: List[str], count: int) -> List[str]:
+        """Top up a short board/beacon read with the newest archived entries"""
+        if len(entries) < count:
+            entries += await asyncio.to_thread(self.archive.read_recent, stream, count - len(entries))
+        return entries
     
     async def write_board_async(self, agent_name: str, content: str) -> None:
         """Async version of write_board"""
-        return await asyncio.to_thread(self.write_board, agent_name, content)
-    
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two texts using simple word overlap"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        timestamp = datetime.now().isoformat()
+        client = self.aclient
         
-        if not words1 or not words2:
-            return 0.0
-            
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        fingerprint = None
+        if agent_name not in self.dedup_exempt:
+            fingerprint = Fingerprint(content)
+            async with client.pipeline(transaction=False) as pipe:
+                self.board_index.queue_lookup(pipe, agent_name, fingerprint)
+                exact, candidates = self.board_index.parse_lookup(await pipe.execute())
+            signatures = await client.hmget(self.board_index.signature_key(agent_name), candidates) if candidates else []
+            if self._is_repeat(agent_name, fingerprint, exact, signatures):
+                return
         
-        return len(intersection) / len(union)
+        entry = f"{timestamp}|{agent_name}|{content}"
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.lpush("shared_board", entry)
+            pipe.publish("board_updates", entry)
+            if fingerprint:
+                await self.board_index.queue_insert(pipe, self._ainsert_script, agent_name, fingerprint)
+            await pipe.execute()
+    
+    async def get_beacons_between_async(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Async version of get_beacons_between"""
+        client = self.aclient
+        low, high = beacon_index.window_bounds(start, end)
+        entries = await self._abeacon_window_script(keys=beacon_index.WINDOW_KEYS, args=[low, high], client=client)
+        return [json.loads(entry) for entry in entries if entry]
+    
+    async def get_beacon_count_async(self) -> int:
+        """Async version of get_beacon_count"""
+        return int(await self.aclient.get(beacon_index.SEQ_KEY) or 0)
+    
+    async def add_beacon_async(self, beacon_entry: Dict[str, Any], seen_ids: Optional[List[str]] = None) -> int:
+        """Async version of add_beacon; seen_ids (tweet status ids) are marked seen once the append succeeds"""
+        client = self.aclient
+        score = beacon_index.beacon_score(beacon_entry)
+        async with client.pipeline(transaction=False) as pipe:
+            await self._abeacon_append_script(
+                keys=beacon_index.APPEND_KEYS,
+                args=[json.dumps(beacon_entry), score],
+                client=pipe
+            )
+            pipe.publish("beacon_updates", beacon_entry.get('timestamp', ''))
+            seq = (await pipe.execute())[0]
+        if beacon_entry.get('entities') or seen_ids:
+            async with client.pipeline(transaction=False) as pipe:
+                if beacon_entry.get('entities'):
+                    entity_index.queue_index(pipe, seq, score, beacon_entry['entities'], self._entity_ttl())
+                if seen_ids:
+                    now = time.time()
+                    pipe.zremrangebyscore(beacon_index.SEEN_KEY, "-inf", now - self._seen_ttl())
+                    pipe.zadd(beacon_index.SEEN_KEY, {status_id: now for status_id in seen_ids})
+                await pipe.execute()
+        logger.info(f"Beacon stored: {len(beacon_entry.get('posts', []))} posts")
+        return seq
+
+    async def count_entity_mentions_async(self, entities: List[str], since: Optional[datetime] = None) -> Dict[str, int]:
+        """Beacons (since a time, if given) that mention each entity, from the inverted index"""
+        entities = list(dict.fromkeys(e.lower() for e in entities))
+        if not entities:
+            return {}
+        low, _ = beacon_index.window_bounds(since, None)
+        async with self.aclient.pipeline(transaction=False) as pipe:
+            for entity in entities:
+                pipe.zcount(entity_index.index_key(entity), low, "+inf")
+            counts = await pipe.execute()
+        return dict(zip(entities, counts))
+    
+    def _seen_ttl(self) -> int:
+        return getattr(config, 'BEACON_SEEN_TTL', 7 * 86400)
+    
+    async def unseen_tweets_async(self, status_ids: List[str]) -> List[bool]:
+        """True for each tweet status id not stored in a beacon within BEACON_SEEN_TTL
+
+        Read-only: ids are marked seen by add_beacon_async once their beacon is
+        stored. Repeats inside status_ids count as seen after their first occurrence.
+        """
+        if not status_ids:
+            return []
+        cutoff = time.time() - self._seen_ttl()
+        scores = await self.aclient.zmscore(beacon_index.SEEN_KEY, status_ids)
+        fresh, batch = [], set()
+        for status_id, score in zip(status_ids, scores):
+            fresh.append((score is None or score < cutoff) and status_id not in batch)
+            batch.add(status_id)
+        return fresh
+
+    def _is_repeat(self, agent_name: str, fingerprint: Fingerprint, exact: bool, signatures: List[Optional[str]]) -> bool:
+        """Decide from index lookups whether a post repeats the agent's recent ones"""
+        if exact:
+            logger.debug(f"Skipping duplicate from {agent_name}")
+            return True
+        similarity = self.board_index.best_match(fingerprint, signatures)
+        if similarity > self.board_index.threshold:
+            logger.debug(f"Skipping similar content from {agent_name} (similarity: {similarity:.2f})")
+            return True
+        return False
         
     def get_current_conversation(self) -> Optional[Dict]:
         """Get current conversation data for proposal extraction"""
@@ -127,13 +305,40 @@ class RedisManager:
             if conv_data and 'current' in conv_data:
                 return conv_data['current']
         return None
+    
+    async def get_current_conversation_async(self) -> Optional[Dict]:
+        """Async version of get_current_conversation"""
+        if self.conversation_manager:
+            conv_data = await self.conversation_manager.get_conversation_for_display_async()
+            if conv_data and 'current' in conv_data:
+                return conv_data['current']
+        return None
         
-    def add_beacon(self, beacon_entry: Dict[str, Any]):
-        """Add a beacon entry to the feed"""
+    def add_beacon(self, beacon_entry: Dict[str, Any]) -> int:
+        """Add a beacon entry to the feed; returns its sequence number"""
         # Same as write_beacon but handles the new format
-        beacon_json = json.dumps(beacon_entry)
-        self.client.lpush("beacon_feed", beacon_json)
+        score = beacon_index.beacon_score(beacon_entry)
+        pipe = self.client.pipeline(transaction=False)
+        self._beacon_append_script(
+            keys=beacon_index.APPEND_KEYS,
+            args=[json.dumps(beacon_entry), score],
+            client=pipe
+        )
         
-        # No limit - store all beacons permanently
+        # Older entries are rolled to disk by the retention task
         
-        logger.info(f"Beacon stored: {len(beacon_entry.get('posts', []))} posts")
\ No newline at end of file
+        # Publish for real-time updates
+        pipe.publish("beacon_updates", beacon_entry.get('timestamp', ''))
+        seq = pipe.execute()[0]
+        
+        if beacon_entry.get('entities'):
+            pipe = self.client.pipeline(transaction=False)
+            entity_index.queue_index(pipe, seq, score, beacon_entry['entities'], self._entity_ttl())
+            pipe.execute()
+        
+        logger.info(f"Beacon stored: {len(beacon_entry.get('posts', []))} posts")
+        return seq
+
+    @staticmethod
+    def _entity_ttl() -> int:
+        return getattr(config, 'BEACON_ENTITY_TTL', 7 * 86400)
\ No newline at end of file
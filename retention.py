@@ -0,0 +1,100 @@
+"""
+Tiered retention: keep a hot window in Redis, roll older entries to disk
+"""
+import json
+import asyncio
+import logging
+from typing import Dict, Any
+from redis_manager import RedisManager
+import conversation_catalog
+import config
+
+logger = logging.getLogger(__name__)
+
+# Feed lists are LPUSHed newest-first, so the cold entries sit at the tail.
+# Tail indices stay stable while agents keep pushing at the head.
+# The last field names a time index that must only cover the hot window.
+FEED_STREAMS = {
+    "board": ("shared_board", "HOT_BOARD_ENTRIES", 5000, None),
+    "beacon": ("beacon_feed", "HOT_BEACON_ENTRIES", 200, "beacon_index"),
+}
+
+
+class RetentionManager:
+    """Moves cold board, beacon and conversation data into the archive"""
+
+    def __init__(self, redis_manager: RedisManager):
+        self.redis = redis_manager
+        self.archive = redis_manager.archive
+        self.batch_size = getattr(config, 'ARCHIVE_BATCH_SIZE', 500)
+
+    async def run_once(self) -> Dict[str, int]:
+        """One retention pass; returns archived entry counts per stream"""
+        archived = {}
+        for stream, (key, setting, default, index_key) in FEED_STREAMS.items():
+            try:
+                archived[stream] = await self._archive_feed(stream, key, getattr(config, setting, default))
+                if index_key:
+                    await self._trim_index(key, index_key)
+            except Exception as e:
+                logger.error(f"Retention error for {key}: {e}")
+        try:
+            archived["conversations"] = await self._archive_conversations(
+                getattr(config, 'HOT_CONVERSATIONS', 50)
+            )
+        except Exception as e:
+            logger.error(f"Retention error for conversations: {e}")
+        if any(archived.values()):
+            logger.info(f"Archived to disk: {archived}")
+        return archived
+
+    async def _archive_feed(self, stream: str, key: str, hot: int) -> int:
+        client = self.redis.aclient
+        total = 0
+        while True:
+            excess = await client.llen(key) - hot
+            if excess <= 0:
+                return total
+            n = min(excess, self.batch_size)
+            entries = await client.lrange(key, -n, -1)
+            await asyncio.to_thread(self.archive.append, stream, key, entries)
+            # Only drop what was written to disk
+            await client.ltrim(key, 0, -(n + 1))
+            total += n
+
+    async def _trim_index(self, key: str, index_key: str):
+        """Drop index entries whose list items were archived (oldest first)"""
+        client = self.redis.aclient
+        excess = await client.zcard(index_key) - await client.llen(key)
+        if excess > 0:
+            await client.zremrangebyrank(index_key, 0, excess - 1)
+
+    async def _archive_conversations(self, hot: int) -> int:
+        """Move messages of completed conversations beyond the hot window"""
+        client = self.redis.aclient
+        conv_ids = await client.zrevrange(conversation_catalog.BY_START, hot, -1)
+        if not conv_ids:
+            return 0
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.smismember(conversation_catalog.status_key("completed"), conv_ids)
+            pipe.smismember(conversation_catalog.ARCHIVED, conv_ids)
+            completed, already = await pipe.execute()
+        candidates = [c for c, done, moved in zip(conv_ids, completed, already) if done and not moved]
+
+        archived = 0
+        for conv_id in candidates:
+            metadata_str = await client.hget("conversations", conv_id)
+            if not metadata_str:
+                continue
+            metadata: Dict[str, Any] = json.loads(metadata_str)
+
+            messages = await client.lrange(f"conv:{conv_id}", 0, -1)
+            await asyncio.to_thread(self.archive.append, "conversations", conv_id, messages)
+            metadata["archived"] = True
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset("conversations", conv_id, json.dumps(metadata))
+                pipe.delete(f"conv:{conv_id}")
+                pipe.sadd(conversation_catalog.ARCHIVED, conv_id)
+                await pipe.execute()
+            archived += 1
+        return archived
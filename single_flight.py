@@ -0,0 +1,73 @@
+"""
+Single-flight coalescing for concurrent identical requests
+
+The first caller for a key starts the work; callers arriving while it is in
+flight await the same task instead of repeating it. Nothing is cached: the key
+is forgotten as soon as the task finishes. One caller's cancellation never
+cancels the work for the others, but once every caller has been cancelled the
+work itself is cancelled.
+"""
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Per-loop table of in-flight tasks keyed by request identity"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) once per key among concurrent callers"""
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(fn(*args, **kwargs))
+            calls[key] = task
+            task.add_done_callback(lambda t: self._finish(calls, key, t))
+            self.started += 1
+            return await self._wait(task)
+        self.coalesced += 1
+        logger.debug(f"{self.name}: joined in-flight request {key!r}")
+        # Followers get their own copy; callers mutate returned tweets/dicts
+        return copy.deepcopy(await self._wait(task))
+
+    async def _wait(self, task: asyncio.Task) -> Any:
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shield so one caller's cancellation does not cancel the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(task) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            remaining = self._waiters.get(task, 1) - 1
+            if remaining:
+                self._waiters[task] = remaining
+            else:
+                self._waiters.pop(task, None)
+
+    @staticmethod
+    def _finish(calls: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task):
+        if calls.get(key) is task:
+            del calls[key]
+        # Mark the outcome as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            'started': self.started,
+            'coalesced': self.coalesced,
+            'in_flight': sum(len(c) for c in self._calls.values())
+        }
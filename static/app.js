@@ -21,6 +21,14 @@ let beaconIcon = null;
 let messageQueue = []; // (unused with backend typing)
 let isTyping = false; // (unused with backend typing)
 
+// Versioned UI state: one snapshot on connect, then deltas keyed by seq
+let uiState = null;
+let uiSeq = -1;
+let resyncPending = false;
+
+// Live drafts of agent messages still being generated, keyed by stream id
+const streamDrafts = new Map();
+
 // Emit typing status to server
 function emitTypingStatus(typing) {
     socket.emit('typing_status', { isTyping: typing });
@@ -110,13 +118,6 @@ document.addEventListener('DOMContentLoaded', () => {
     // Clear typing status on page load
     emitTypingStatus(false);
     
-    // Initial load of conversations
-    setTimeout(() => {
-        fetchConversations();
-    }, 1000);
-    
-    // Periodic conversation fetch
-    setInterval(() => fetchConversations(), 3000);
 });
 
 // Socket event listeners
@@ -145,19 +146,127 @@ function setupSocketListeners() {
         if (mobileConnectionStatus) {
             mobileConnectionStatus.textContent = 'OFFLINE';
         }
+        
+        // The server sends a fresh snapshot on reconnect (its seq may restart)
+        uiState = null;
+        uiSeq = -1;
+        resyncPending = false;
+    });
+    
+    socket.on('snapshot', (data) => {
+        // Ignore a snapshot that was overtaken by deltas already applied
+        if (uiState && data.seq < uiSeq) return;
+        uiState = data.state || {};
+        uiSeq = data.seq;
+        resyncPending = false;
+        renderSections(Object.keys(uiState));
     });
     
-    socket.on('update', (data) => {
-        updateBeacon(data.beacon);
-        updateDominancePlan(data.dominance_plan);
-        updateStats(data.stats);
-        updateSystemStatus(data.system_status);
+    socket.on('delta', (data) => {
+        if (uiState && data.seq <= uiSeq) return;
+        if (!uiState || data.base_seq !== uiSeq) {
+            requestResync();
+            return;
+        }
         
-        // Update conversations if present
-        if (data.conversations) {
-            updateCurrentConversation(data.conversations.current);
-            updateConversationHistory(data.conversations.history);
+        Object.entries(data.changes).forEach(([section, change]) => {
+            uiState[section] = applyChange(section, uiState[section], change);
+        });
+        uiSeq = data.seq;
+        renderSections(Object.keys(data.changes));
+    });
+    
+    socket.on('stream', renderStreamDraft);
+}
+
+// Show partial agent output as it is generated
+function renderStreamDraft(data) {
+    let draft = streamDrafts.get(data.id);
+    if (draft && data.seq <= draft.seq) return;
+    if (!draft) {
+        if (data.done && !data.text) return;
+        const msgDiv = document.createElement('div');
+        msgDiv.className = `message ${data.agent.toLowerCase()} streaming`;
+        const displayAgent = data.agent === 'OBSERVER' ? '☸ OBSERVER' : '◢◤ EGO';
+        msgDiv.innerHTML = `
+            <div class="msg-header">
+                <span class="msg-agent">${displayAgent}</span>
+                <span class="msg-time">${new Date().toLocaleTimeString()}</span>
+            </div>
+            <div class="msg-content"></div>
+        `;
+        draft = { element: msgDiv, agent: data.agent, seq: 0, text: '', done: false };
+        streamDrafts.set(data.id, draft);
+    }
+    // A new conversation clears the panel; keep the draft visible
+    if (!draft.element.isConnected) currentConversation.appendChild(draft.element);
+    
+    draft.seq = data.seq;
+    draft.text = data.replace ? data.text : draft.text + data.text;
+    draft.element.querySelector('.msg-content').textContent = draft.text;
+    if (data.done) {
+        draft.done = true;
+        draft.element.classList.add('done');
+        if (!draft.text) {
+            removeStreamDraft(data.id);
+            return;
         }
+        // The committed message normally replaces the draft; don't leave it behind otherwise
+        setTimeout(() => removeStreamDraft(data.id), 15000);
+    }
+    if (autoScroll) currentConversation.scrollTop = currentConversation.scrollHeight;
+}
+
+function removeStreamDraft(id) {
+    const draft = streamDrafts.get(id);
+    if (!draft) return;
+    draft.element.remove();
+    streamDrafts.delete(id);
+}
+
+// Drop finished drafts once the agent's committed message is rendered
+function clearFinishedDrafts(agent) {
+    for (const [id, draft] of streamDrafts) {
+        if (draft.done && draft.agent === agent) removeStreamDraft(id);
+    }
+}
+
+// Ask the server for a full snapshot after a sequence gap
+function requestResync() {
+    if (resyncPending) return;
+    resyncPending = true;
+    console.log('▓ UPDATE GAP DETECTED - RESYNCING ▓');
+    socket.emit('resync');
+}
+
+// Merge one section change from a delta into the held state
+function applyChange(section, current, change) {
+    if (section === 'board' || section === 'beacon') {
+        if (change.replace !== undefined) return change.replace;
+        return change.prepend.concat(current || []).slice(0, change.size);
+    }
+    if (section === 'current_conversation') {
+        if (change.replace !== undefined) return change.replace;
+        const messages = (current && current.messages) || [];
+        return Object.assign({}, change.meta, { messages: messages.concat(change.append) });
+    }
+    return change;
+}
+
+const sectionRenderers = {
+    beacon: updateBeacon,
+    dominance_plan: updateDominancePlan,
+    stats: updateStats,
+    system_status: updateSystemStatus,
+    current_conversation: updateCurrentConversation,
+    conversation_history: updateConversationHistory
+};
+
+// Re-render only the panels whose section changed
+function renderSections(sections) {
+    sections.forEach(section => {
+        const render = sectionRenderers[section];
+        if (render) render(uiState[section]);
     });
 }
 
@@ -213,6 +322,7 @@ function updateCurrentConversation(conversation) {
                 <div class="msg-content"></div>
             `;
             
+            clearFinishedDrafts(msg.agent);
             currentConversation.appendChild(msgDiv);
             // Set initial (possibly partial) content
             msgDiv.querySelector('.msg-content').textContent = msg.content || '';
@@ -408,7 +518,7 @@ function updateBeacon(beaconData) {
                     <span class="beacon-timestamp">[${timestamp}]</span>
                 </div>
                 ${tweetsHtml}
-                ${beacon.tweet_count ? `<div class="beacon-count">Total signals: ${beacon.tweet_count}</div>` : ''}
+                ${beacon.tweet_count ? `<div class="beacon-count">New signals: ${beacon.tweet_count}${beacon.repeat_count ? ` • ${beacon.repeat_count} already seen` : ''}</div>` : ''}
             `;
         }
         // Legacy format with posts array
@@ -742,17 +852,6 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-// Fetch and display conversations
-function fetchConversations() {
-    fetch('/api/conversations')
-        .then(response => response.json())
-        .then(data => {
-            updateCurrentConversation(data.current);
-            updateConversationHistory(data.history);
-        })
-        .catch(error => console.error('▓ ERROR FETCHING CONVERSATIONS ▓', error));
-}
-
 // Update system status (phase and urge)
 function updateSystemStatus(status) {
     if (!status) return;
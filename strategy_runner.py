@@ -0,0 +1,132 @@
+"""
+Adaptive racing of interchangeable fetch strategies
+
+A runner is given strategies that can each answer the same request (e.g. the
+beacon's search fallbacks for one topic). Instead of waiting for each to fail
+before trying the next, it starts up to `width` of them at once, as long as
+their combined estimated cost stays within `cost_budget`; the first result
+that passes validation wins and the rest are cancelled. When a strategy fails
+the next one in line is started.
+
+Strategies are ordered by expected time to a valid result, latency divided
+by smoothed success rate, so a strategy that keeps failing slowly drifts
+to the back. Attempts, successes and a latency moving average are kept per
+runner and strategy in the strategy_stats hash so the order survives restarts.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "strategy_stats"
+PRIOR_LATENCY = 30.0      # seconds assumed for a strategy never run
+LATENCY_ALPHA = 0.3       # weight of the newest sample in the latency average
+
+
+class Strategy:
+    """One way of answering the request: a zero-argument coroutine function and its estimated cost"""
+
+    def __init__(self, name: str, run: Callable[[], Awaitable[Any]], cost: float = 0.0):
+        self.name = name
+        self.run = run
+        self.cost = cost
+
+
+class StrategyRunner:
+    """Races strategies under a width and cost budget, learning their order"""
+
+    def __init__(self, name: str, redis_manager, width: int = 1, cost_budget: float = 0.0):
+        self.name = name
+        self.redis = redis_manager
+        self.width = max(1, width)
+        self.cost_budget = cost_budget
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._loaded = False
+
+    async def _load(self):
+        self._loaded = True
+        try:
+            raw = await self.redis.aclient.hgetall(STATS_KEY)
+        except Exception as e:
+            logger.debug(f"Strategy stats unavailable: {e}")
+            return
+        prefix = f"{self.name}:"
+        for field, value in raw.items():
+            if field.startswith(prefix):
+                self.stats[field[len(prefix):]] = json.loads(value)
+
+    def _expected_time(self, strategy: Strategy) -> float:
+        entry = self.stats.get(strategy.name)
+        if not entry:
+            return PRIOR_LATENCY / 0.5
+        success_rate = (entry['successes'] + 1) / (entry['attempts'] + 2)
+        return entry['latency'] / success_rate
+
+    def rank(self, strategies: List[Strategy]) -> List[Strategy]:
+        """Best first; the sort is stable, so untried strategies keep the given order"""
+        return sorted(strategies, key=self._expected_time)
+
+    async def _record(self, strategy: Strategy, ok: bool, latency: float):
+        entry = self.stats.setdefault(strategy.name, {'attempts': 0, 'successes': 0, 'latency': latency})
+        entry['attempts'] += 1
+        entry['successes'] += int(ok)
+        entry['latency'] += LATENCY_ALPHA * (latency - entry['latency'])
+        try:
+            await self.redis.aclient.hset(STATS_KEY, f"{self.name}:{strategy.name}", json.dumps(entry))
+        except Exception as e:
+            logger.debug(f"Strategy stats write failed: {e}")
+
+    @staticmethod
+    async def _timed(strategy: Strategy) -> Tuple[Any, float]:
+        started = time.monotonic()
+        try:
+            result = await strategy.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Strategy {strategy.name} failed: {e}")
+            result = None
+        return result, time.monotonic() - started
+
+    async def run(self, strategies: List[Strategy],
+                  validate: Callable[[Any], bool]) -> Tuple[Optional[str], Any]:
+        """(winning strategy name, result), or (None, None) when every strategy fails"""
+        if not self._loaded:
+            await self._load()
+        queue = self.rank(strategies)
+        running: Dict[asyncio.Task, Strategy] = {}
+        try:
+            while queue or running:
+                # Always keep one running; add more while width and budget allow
+                while queue and len(running) < self.width and (
+                    not running
+                    or sum(s.cost for s in running.values()) + queue[0].cost <= self.cost_budget
+                ):
+                    strategy = queue.pop(0)
+                    running[asyncio.ensure_future(self._timed(strategy))] = strategy
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    strategy = running.pop(task)
+                    result, latency = task.result()
+                    ok = result is not None and validate(result)
+                    await self._record(strategy, ok, latency)
+                    if ok:
+                        return strategy.name, result
+            return None, None
+        finally:
+            # Losers (or everything, if we were cancelled) are abandoned
+            for task in running:
+                task.cancel()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                'attempts': entry['attempts'],
+                'success_rate': round(entry['successes'] / entry['attempts'], 3) if entry['attempts'] else 0.0,
+                'latency': round(entry['latency'], 2)
+            }
+            for name, entry in self.stats.items()
+        }
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from redis_manager import RedisManager
 import config
+import entity_index
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +38,15 @@ class Superego:
             if adjustments:
                 # Avoid no-op writes; only apply if value actually changes
                 filtered = {}
-                for k, v in adjustments.items():
-                    prev = self.redis.client.get(k)
+                keys = list(adjustments.keys())
+                previous = await self.redis.aclient.mget(keys)
+                for k, prev in zip(keys, previous):
+                    v = adjustments[k]
                     if prev is None or str(prev) != str(v):
                         filtered[k] = v
                 # Store adjustments in Redis
                 if filtered:
-                    self._apply_adjustments(filtered)
+                    await self._apply_adjustments(filtered)
                 self.adjustment_history.append({
                     'timestamp': datetime.now().isoformat(),
                     'adjustments': filtered or adjustments,
@@ -57,7 +60,7 @@ class Superego:
                 try:
                     summary = ", ".join([f"{k}→{v}" for k, v in (filtered or adjustments).items()])
                     if summary:
-                        self.redis.write_board("SYSTEM", f"[SUPEREGO] Param update • {summary}")
+                        await self.redis.write_board_async("SYSTEM", f"[SUPEREGO] Param update • {summary}")
                     if self.redis.conversation_manager:
                         if summary:
                             await self.redis.conversation_manager.add_message("SYSTEM", f"[SUPEREGO] Adjustments applied: {summary}")
@@ -75,19 +78,23 @@ class Superego:
     async def _collect_metrics(self) -> Dict[str, Any]:
         """Collect system performance metrics"""
         # Get conversation metrics
-        conv_data = self.redis.get_current_conversation()
+        conv_data = await self.redis.get_current_conversation_async()
         
         # Calculate duplicate rate
-        recent_messages = self.redis.get_board_history(50)
+        recent_messages = await self.redis.get_board_async(50)
         duplicate_rate = self._calculate_duplicate_rate(recent_messages)
         
         # Get attention score (based on beacon manifestations)
-        attention_score = self._calculate_attention_score()
+        recent_beacons = await self.redis.get_beacon_async(10)
+        attention_score = self._calculate_attention_score(recent_beacons, recent_messages[:20])
         
-        # Get current temperatures
+        # Get current sampling parameters in one round trip
+        observer_temp, ego_temp, observer_min_p, ego_top_p = await self.redis.aclient.mget(
+            'observer_temperature', 'ego_temperature', 'observer_min_p', 'ego_top_p'
+        )
         current_temps = {
-            'observer_temp': float(self.redis.client.get('observer_temperature') or 0.7),
-            'ego_temp': float(self.redis.client.get('ego_temperature') or 0.9)
+            'observer_temp': float(observer_temp or 0.7),
+            'ego_temp': float(ego_temp or 0.9)
         }
         
         return {
@@ -96,7 +103,11 @@ class Superego:
             'duplicate_rate': duplicate_rate,
             'attention_score': attention_score,
             'message_count': len(recent_messages),
-            'current_temps': current_temps
+            'current_temps': current_temps,
+            'current_sampling': {
+                'observer_min_p': float(observer_min_p or 0.05),
+                'ego_top_p': float(ego_top_p or 0.9)
+            }
         }
         
     def _calculate_duplicate_rate(self, messages: list) -> float:
@@ -119,30 +130,24 @@ class Superego:
                     
         return duplicates / len(messages)
         
-    def _calculate_attention_score(self) -> float:
+    def _calculate_attention_score(self, recent_beacons: list, board_messages: list) -> float:
         """Calculate attention score based on beacon engagement"""
         # Check beacon manifestations in recent messages
-        recent_beacons = self.redis.get_beacon_feed(10)
         if not recent_beacons:
             return 0.0
             
         # Check if agents are referencing beacon content
         board_content = " ".join([
             msg.split("|", 2)[2] if len(msg.split("|", 2)) >= 3 else ""
-            for msg in self.redis.get_board_history(20)
+            for msg in board_messages
         ]).lower()
         
         references = 0
         for beacon in recent_beacons:
-            # Support both v2 tweets and legacy posts
-            if 'tweets' in beacon and beacon['tweets']:
-                for t in beacon['tweets']:
-                    if any(word in board_content for word in t.get('text', '').lower().split()[:5]):
-                        references += 1
-            elif 'posts' in beacon and beacon['posts']:
-                for post in beacon['posts']:
-                    if any(word in board_content for word in post.get('text', '').lower().split()[:5]):
-                        references += 1
+            # Leading words are stored per tweet at ingest (derived for legacy posts)
+            for entities in entity_index.tweet_entities(beacon):
+                if any(word in board_content for word in entities['terms']):
+                    references += 1
                         
         return min(1.0, references / 10.0)
         
@@ -176,11 +181,11 @@ class Superego:
         # Expand control surface: min_p and top_p
         # If duplicate rate high, raise observer_min_p slightly (filter low-prob tokens)
         if current_metrics['duplicate_rate'] > 0.35:
-            prev_min_p = float(self.redis.client.get('observer_min_p') or 0.05)
+            prev_min_p = current_metrics['current_sampling']['observer_min_p']
             adjustments['observer_min_p'] = round(min(0.2, prev_min_p + 0.02), 3)
         # If attention low, increase ego_top_p (more variety)
         if current_metrics['attention_score'] < 0.2:
-            prev_top_p = float(self.redis.client.get('ego_top_p') or 0.9)
+            prev_top_p = current_metrics['current_sampling']['ego_top_p']
             adjustments['ego_top_p'] = round(min(1.0, prev_top_p + 0.05), 2)
         # If message volume low, gently raise both temps but cap them
         if current_metrics['message_count'] < 10:
@@ -234,19 +239,19 @@ class Superego:
                 
         return False
         
-    def _apply_adjustments(self, adjustments: Dict[str, Any]):
+    async def _apply_adjustments(self, adjustments: Dict[str, Any]):
         """Apply adjustments to Redis config"""
-        for key, value in adjustments.items():
-            self.redis.client.set(key, value)
-            
         # Also store as a JSON patch for audit
         patch = {
             'timestamp': datetime.now().isoformat(),
             'adjustments': adjustments,
             'applied_by': 'SUPEREGO'
         }
-        self.redis.client.lpush('config_patches', json.dumps(patch))
-        self.redis.client.ltrim('config_patches', 0, 99)  # Keep last 100
+        async with self.redis.aclient.pipeline(transaction=True) as pipe:
+            pipe.mset(adjustments)
+            pipe.lpush('config_patches', json.dumps(patch))
+            pipe.ltrim('config_patches', 0, 99)  # Keep last 100
+            await pipe.execute()
         
     async def run_continuous(self, interval: int = 300):
         """Run continuous monitoring (default: every 5 minutes)"""
@@ -0,0 +1,44 @@
+"""
+Incremental sanitizing of streamed agent text
+"""
+import random
+from agent_stream import StreamSanitizer
+from text_sanitizer import sanitize_agent_output
+
+WORDS = ["signal", "ah", "Oh,", "um", "uhh...", "EGO:", "EGO:void", "$BONK", "—", "(glitch)",
+         "ξ", "ok.", ",", ";", "erm!", "ohio", "42", "\n", "\n\n"]
+
+
+def _stream(text: str, prefix: str) -> StreamSanitizer:
+    sanitizer = StreamSanitizer(prefix)
+    shown = ""
+    pos = 0
+    while pos < len(text):
+        size = random.randint(1, 6)
+        out = sanitizer.feed(text[pos:pos + size])
+        pos += size
+        if out:
+            piece, replace = out
+            shown = piece if replace else shown + piece
+        assert shown == sanitizer.emitted
+    return sanitizer
+
+
+def test_matches_sanitizing_the_whole_stable_text():
+    random.seed(7)
+    for _ in range(2000):
+        prefix = random.choice(["", "EGO:"])
+        text = "".join(random.choice(WORDS) + random.choice([" ", " ", "", "\n", "  "])
+                       for _ in range(random.randint(1, 40)))
+        cut = max(text.rfind(" "), text.rfind("\n"))
+        stable = text[:cut] if cut > 0 else ""
+        expected = sanitize_agent_output(stable.replace(prefix, "")) if stable else ""
+        assert _stream(text, prefix).emitted == expected, repr(text)
+
+
+def test_buffer_stays_short_on_long_generations():
+    random.seed(7)
+    text = " ".join(random.choice(["the", "signal", "ah", "void", "$BONK,", "pump."]) for _ in range(8000))
+    sanitizer = _stream(text, "EGO:")
+    assert len(sanitizer.raw) < 200
+    assert sanitizer.emitted == sanitize_agent_output(text[:text.rfind(" ")])
@@ -0,0 +1,21 @@
+"""
+Slots of the bounded memory executor
+"""
+import asyncio
+import threading
+from async_memory import MemoryExecutor
+
+
+def test_timed_out_call_holds_its_slot_until_the_worker_finishes():
+    async def scenario():
+        executor = MemoryExecutor(workers=2, max_pending=1, timeout=0.05)
+        release = threading.Event()
+        assert await executor.run("slow", release.wait, 5, default="fallback") == "fallback"
+        # The slow call is still running, so the next one must wait for it
+        waiting = asyncio.ensure_future(executor.run("fast", lambda: "done", timeout=1.0))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+        release.set()
+        assert await asyncio.wait_for(waiting, 1.0) == "done"
+        assert executor.metrics()["slow"]["timeouts"] == 1
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+"""
+Tweets are marked seen only once their beacon has been stored
+"""
+import asyncio
+import time
+import pytest
+import beacon_index
+from redis_manager import RedisManager
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        results = []
+        for name, args, kwargs in self.queued:
+            if name == "append" and self.client.fail_append:
+                raise ConnectionError("append failed")
+            if name == "zadd":
+                self.client.seen.update(args[1])
+            results.append(1)
+        return results
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.seen = {}
+        self.fail_append = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zmscore(self, key, members):
+        return [self.seen.get(m) for m in members]
+
+
+async def fake_append(keys, args, client):
+    client.append(keys, args)
+
+
+def _manager() -> RedisManager:
+    manager = RedisManager.__new__(RedisManager)
+    manager._aclient = FakeAsyncRedis()
+    manager._aclient_loop = asyncio.get_running_loop()
+    manager._abeacon_append_script = fake_append
+    return manager
+
+
+def test_failed_append_leaves_tweets_unseen():
+    async def scenario():
+        manager = _manager()
+        assert await manager.unseen_tweets_async(["1", "2", "1"]) == [True, True, False]
+        manager.aclient.fail_append = True
+        with pytest.raises(ConnectionError):
+            await manager.add_beacon_async({'timestamp': '2026-01-01T00:00:00'}, seen_ids=["1", "2"])
+        assert manager.aclient.seen == {}
+        assert await manager.unseen_tweets_async(["1", "2"]) == [True, True]
+    asyncio.run(scenario())
+
+
+def test_stored_tweets_are_seen():
+    async def scenario():
+        manager = _manager()
+        await manager.add_beacon_async({'timestamp': '2026-01-01T00:00:00'}, seen_ids=["1"])
+        assert await manager.unseen_tweets_async(["1", "3"]) == [False, True]
+        # Past the TTL an id counts as new again
+        manager.aclient.seen["1"] = time.time() - manager._seen_ttl() - 1
+        assert await manager.unseen_tweets_async(["1"]) == [True]
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+"""
+Circuit breaker probe handling in the LLM gateway
+"""
+import asyncio
+import pytest
+from llm_gateway import LLMGateway, CircuitOpenError
+
+RESET = 0.05
+
+
+def _open_gateway() -> LLMGateway:
+    """Gateway whose breaker has just opened"""
+    gateway = LLMGateway(requests_per_minute=600, burst=10, max_retries=0, default_retry_after=1.0,
+                         breaker_threshold=1, breaker_reset=RESET)
+    gateway.record_failure()
+    return gateway
+
+
+async def _expect_open(gateway: LLMGateway):
+    with pytest.raises(CircuitOpenError):
+        await gateway.acquire()
+
+
+def test_cancelled_probe_reopens_breaker():
+    async def scenario():
+        gateway = _open_gateway()
+        await asyncio.sleep(RESET * 1.2)
+        # The probe gets through the breaker, then is cancelled waiting for a token
+        gateway.note_rate_limit(RESET * 2)
+        probe = asyncio.ensure_future(gateway.acquire())
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        await _expect_open(gateway)
+        # After another reset period the next call is the probe again
+        await asyncio.sleep(RESET * 1.2)
+        async with gateway.slot():
+            gateway.record_success()
+        assert not gateway.metrics()['breaker_open']
+        await gateway.acquire()
+    asyncio.run(scenario())
+
+
+def test_probe_ending_in_error_reopens_breaker():
+    async def scenario():
+        gateway = _open_gateway()
+        await asyncio.sleep(RESET * 1.2)
+        with pytest.raises(ValueError):
+            async with gateway.slot():
+                raise ValueError("stream callback failed")
+        await _expect_open(gateway)
+        await asyncio.sleep(RESET * 1.2)
+        assert await gateway.acquire() is not None
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+"""
+PROPOSE> tags are indexed per conversation and read from the current one only
+"""
+import asyncio
+from datetime import datetime
+from proposal_extractor import ProposalExtractor, queue_proposals
+
+
+class FakeRedis:
+    """Sorted sets and hashes, enough for the proposal timeline"""
+
+    def __init__(self):
+        self.zsets = {}
+        self.hashes = {}
+
+    # pipeline-style writes
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        high = float(high)
+        self.zsets[key] = {m: s for m, s in self.zsets.get(key, {}).items() if s > high}
+
+    def expire(self, key, ttl):
+        pass
+
+    # sync client used at construction
+    def get(self, key):
+        return None
+
+    def lrange(self, key, start, end):
+        return []
+
+
+class FakeAsyncRedis:
+    def __init__(self, store: FakeRedis):
+        self.store = store
+
+    async def zrangebyscore(self, key, low, high):
+        items = sorted(self.store.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return [m for m, s in items if s >= float(low)]
+
+    async def hmget(self, key, fields):
+        return [self.store.hashes.get(key, {}).get(f) for f in fields]
+
+
+class FakeConversationManager:
+    current_conversation_id = None
+
+
+class FakeRedisManager:
+    def __init__(self):
+        self.client = FakeRedis()
+        self.aclient = FakeAsyncRedis(self.client)
+        self.conversation_manager = FakeConversationManager()
+
+
+def test_only_current_conversation_feeds_extraction():
+    manager = FakeRedisManager()
+    now = datetime.now()
+    queue_proposals(manager.client, "old", "EGO", "PROPOSE> pump the bonk airdrop", now)
+    queue_proposals(manager.client, "new", "OBSERVER", "PROPOSE> solana agent launch", now)
+    extractor = ProposalExtractor(manager)
+
+    manager.conversation_manager.current_conversation_id = "new"
+    proposals = asyncio.run(extractor.extract_proposals())
+    assert [p.text for p in proposals] == ["solana agent launch"]
+
+    manager.conversation_manager.current_conversation_id = None
+    assert asyncio.run(extractor.extract_proposals()) == []
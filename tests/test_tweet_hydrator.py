@@ -0,0 +1,65 @@
+"""
+Which status page outcomes the tweet hydrator caches
+"""
+import asyncio
+import json
+import httpx
+import pytest
+import tweet_hydrator
+from tweet_hydrator import TweetHydrator
+
+URL = "https://x.com/someone/status/1234567890"
+KEY = "tweet_status:1234567890"
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+
+class FakeRedisManager:
+    def __init__(self):
+        self.aclient = FakeAsyncRedis()
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Answer every status page fetch with the given status code and body"""
+    def install(status: int, body: str = ""):
+        transport = httpx.MockTransport(lambda request: httpx.Response(status, text=body))
+        monkeypatch.setattr(tweet_hydrator.http_pool, "web", lambda: httpx.AsyncClient(transport=transport))
+    return install
+
+
+def test_rate_limited_fetch_is_not_cached(serve):
+    serve(429)
+    manager = FakeRedisManager()
+    hydrator = TweetHydrator(manager)
+    assert asyncio.run(hydrator.lookup(URL)) is None
+    assert KEY not in manager.aclient.data
+
+
+def test_missing_status_is_cached_as_negative(serve):
+    serve(404)
+    manager = FakeRedisManager()
+    hydrator = TweetHydrator(manager)
+    assert asyncio.run(hydrator.lookup(URL)) == {'exists': False, 'text': None}
+    assert json.loads(manager.aclient.data[KEY]) == {'exists': False, 'text': None}
+    assert manager.aclient.ttls[KEY] == hydrator.negative_ttl
+
+
+def test_status_page_text_is_cached(serve):
+    text = "a posted tweet with enough words to count as text"
+    serve(200, f'<html><head><meta property="og:description" content="{text}"></head><body>tweet</body></html>')
+    manager = FakeRedisManager()
+    hydrator = TweetHydrator(manager)
+    assert asyncio.run(hydrator.hydrate(URL)) == text
+    assert manager.aclient.ttls[KEY] == hydrator.ttl
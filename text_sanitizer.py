@@ -6,6 +6,7 @@ _INTERJECTION_PATTERN: Pattern[str] = re.compile(
     r"\b(?:a+h+|o+h+|u+h+|u+m+|e+r+m+|e+r+|h+m+|ge+e+|go+sh+|eh+|hu+h+)\b(?:\s*[,\.\!\?…—–-]*)",
     flags=re.IGNORECASE,
 )
+_TOKEN_PATTERN: Pattern[str] = re.compile(r"\S+")
 
 
 def sanitize_agent_output(text: str) -> str:
@@ -32,3 +33,26 @@ def sanitize_agent_output(text: str) -> str:
     return cleaned.strip()
 
 
+def split_point(text: str, reserved: str = "") -> int:
+    """Start of the last word where text can be cut without changing the result
+
+    For the returned index i (0 when there is none),
+    sanitize_agent_output(text) == sanitize_agent_output(text[:i]) + " " + sanitize_agent_output(text[i:]).
+    That holds when the two words around the cut are separated by exactly one
+    space, both start with a letter or digit and neither contains a filler,
+    because every rule above then leaves that space alone. Words
+    containing `reserved` (a prefix the caller strips) are not cut around.
+    """
+    tokens = list(_TOKEN_PATTERN.finditer(text))
+    for i in range(len(tokens) - 1, 0, -1):
+        before, after = tokens[i - 1], tokens[i]
+        if after.start() != before.end() + 1 or text[before.end()] != " ":
+            continue
+        words = (before.group(), after.group())
+        # A filler's trailing punctuation can swallow the start of the next word
+        if not (words[0][0].isalnum() and words[1][0].isalnum()):
+            continue
+        if any(_INTERJECTION_PATTERN.search(w) or (reserved and reserved in w) for w in words):
+            continue
+        return after.start()
+    return 0
@@ -0,0 +1,77 @@
+"""
+Per-turn read snapshot for the conversational agents
+
+Everything an Observer/Ego turn reads from Redis is fetched up front in one
+pipelined round trip and handed to the context builders, the critic and the
+reference scrubber, instead of each of them issuing its own reads:
+  shared_board                 newest board entries
+  beacon_feed                  newest beacons
+  conv:<current id>            tail of the current conversation
+  <agent>_temperature/_min_p/_top_p   sampling overrides (DynamicSampling)
+  urge_state                   urge engine state
+Board and beacon reads that come up short are topped up from the archive,
+as get_board_async/get_beacon_async do. The snapshot reflects the start of
+the turn; writes made later in the turn go straight to Redis as before.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from dynamic_sampling import DynamicSampling
+from urge_engine import UrgeEngine, STATE_KEY as URGE_STATE_KEY
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class TurnSnapshot:
+    """Redis state one agent turn works from"""
+
+    def __init__(self, agent: str, board_history: List[str], beacon_data: List[Dict[str, Any]],
+                 conv_messages: List[Dict[str, Any]], sampling_overrides: List[Optional[str]],
+                 urge_state: Optional[str]):
+        self.agent = agent
+        self.board_history = board_history
+        self.beacon_data = beacon_data
+        self.conv_messages = conv_messages
+        self.sampling_overrides = sampling_overrides
+        self.urge_state = urge_state
+
+    @classmethod
+    async def load(cls, redis_manager, agent: str) -> 'TurnSnapshot':
+        """Fetch a turn's reads in one pipeline"""
+        board_count = getattr(config, 'TURN_BOARD_COUNT', 20)
+        beacon_count = getattr(config, 'TURN_BEACON_COUNT', 3)
+        conv_count = getattr(config, 'TURN_CONVERSATION_COUNT', 15)
+        manager = redis_manager.conversation_manager
+        conv_id = manager.current_conversation_id if manager else None
+        async with redis_manager.aclient.pipeline(transaction=False) as pipe:
+            pipe.lrange("shared_board", 0, board_count - 1)
+            pipe.lrange("beacon_feed", 0, beacon_count - 1)
+            pipe.mget(DynamicSampling.override_keys(agent))
+            pipe.get(URGE_STATE_KEY)
+            if conv_id:
+                pipe.lrange(f"conv:{conv_id}", -conv_count, -1)
+            results = await pipe.execute()
+        board, beacons, overrides, urge_state = results[:4]
+        conv = results[4] if conv_id else []
+        board = await redis_manager.backfill_async("board", board, board_count)
+        beacons = await redis_manager.backfill_async("beacon", beacons, beacon_count)
+        return cls(
+            agent,
+            board,
+            [json.loads(entry) for entry in beacons if entry],
+            [json.loads(msg) for msg in conv],
+            overrides,
+            urge_state
+        )
+
+    @property
+    def latest_beacon(self) -> Optional[Dict[str, Any]]:
+        return self.beacon_data[0] if self.beacon_data else None
+
+    def recent_messages(self, limit: int) -> List[Dict[str, Any]]:
+        """Last `limit` messages of the current conversation"""
+        return self.conv_messages[-limit:] if limit > 0 else []
+
+    def urge(self, redis_manager) -> UrgeEngine:
+        return UrgeEngine.from_state(redis_manager, self.urge_state)
@@ -0,0 +1,179 @@
+"""
+Tweet status lookups for the beacon (text hydration and existence checks)
+
+One page fetch answers both questions, and the outcome is cached in Redis
+under tweet_status:<status id> because a posted tweet never changes:
+  {"exists": bool, "text": str | null}
+Records with text live TWEET_STATUS_TTL seconds; pages that yielded no text
+are kept TWEET_STATUS_NEGATIVE_TTL seconds so they are retried sooner.
+Only definitive answers are cached: a 200 page, or a 404/410 (the status
+is gone). Transport errors and other statuses (429, 403, 5xx: throttling or
+an outage) return None and are retried on the next lookup. Fetches run
+concurrently, at most TWEET_FETCH_PER_HOST per host, and concurrent lookups
+of one status share a single fetch. Only the document <head> is downloaded (the meta tags live
+there), capped at TWEET_HEAD_MAX_BYTES; the connection is released as soon
+as </head> arrives.
+"""
+import asyncio
+import html as html_module
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+import httpx
+import http_pool
+from single_flight import SingleFlight
+import config
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tweet_status"
+X_HOSTS = ("x.com", "www.x.com", "twitter.com", "www.twitter.com")
+PAGE_MARKERS = ('twitter', 'x.com', 'tweet', 'post', '@')
+GONE_STATUSES = (404, 410)
+
+
+def status_id_from_url(url: Optional[str]) -> Optional[str]:
+    """Numeric status id of an X/Twitter status URL, or None"""
+    if not url or not isinstance(url, str):
+        return None
+    try:
+        parsed = urlparse(url.strip())
+    except Exception:
+        return None
+    if (parsed.netloc or '').lower() not in X_HOSTS:
+        return None
+    parts = [p for p in (parsed.path or '').split('/') if p]
+    if len(parts) >= 3 and parts[1] == 'status' and parts[2].isdigit():
+        return parts[2]
+    return None
+
+
+# Compiled once; content may come before or after the property/name attribute
+_META_PATTERNS = [
+    re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+        r'<meta[^>]*property=["\'](og:description|twitter:description)["\'][^>]*content=["\']([^"\']+)["\']',
+        r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\'](og:description|twitter:description)["\']',
+        r'<meta[^>]*name=["\'](description|twitter:description)["\'][^>]*content=["\']([^"\']+)["\']',
+        r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\'](description|twitter:description)["\']',
+    )
+]
+HEAD_END = b"</head>"
+
+
+def _extract_description(page: str) -> Optional[str]:
+    """Tweet text from og:/twitter: description meta tags"""
+    for regex in _META_PATTERNS:
+        for match in regex.findall(page):
+            # Content can be either group depending on attribute order
+            for item in match:
+                if item and len(item) > 20 and not item.startswith(('og:', 'twitter:', 'description')):
+                    content = html_module.unescape(item.strip())
+                    # Skip if it looks like HTML or JavaScript
+                    if not content.startswith('<') and 'function(' not in content:
+                        return content[:360]
+    return None
+
+
+async def _read_head(response: httpx.Response, max_bytes: int) -> str:
+    """Body up to and including </head>, or the first max_bytes; the rest is never read"""
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        # Search only the new bytes (plus overlap for a tag split across chunks)
+        start = max(0, len(buf) - len(HEAD_END))
+        buf += chunk
+        end = bytes(buf[start:]).lower().find(HEAD_END)
+        if end != -1:
+            del buf[start + end + len(HEAD_END):]
+            break
+        if len(buf) >= max_bytes:
+            del buf[max_bytes:]
+            break
+    return buf.decode(response.encoding or "utf-8", errors="replace")
+
+
+class TweetHydrator:
+    """Cached, concurrent status page lookups"""
+
+    def __init__(self, redis_manager):
+        self.redis = redis_manager
+        self.ttl = getattr(config, 'TWEET_STATUS_TTL', 7 * 86400)
+        self.negative_ttl = getattr(config, 'TWEET_STATUS_NEGATIVE_TTL', 86400)
+        self.per_host = getattr(config, 'TWEET_FETCH_PER_HOST', 4)
+        self.max_bytes = getattr(config, 'TWEET_HEAD_MAX_BYTES', 65536)
+        self.inflight = SingleFlight("tweet_status")
+        # Semaphores are bound to the loop that first waits on them
+        self._host_limits: Dict[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]] = {}
+        self._stats = {'cache_hits': 0, 'fetched': 0, 'errors': 0}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).netloc or '').lower()
+        # x.com and twitter.com are served by the same frontends
+        host = 'x.com' if host in X_HOSTS else host
+        limits = self._host_limits.setdefault(asyncio.get_running_loop(), {})
+        if host not in limits:
+            limits[host] = asyncio.Semaphore(self.per_host)
+        return limits[host]
+
+    async def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """{"exists", "text"} for a status URL; None when it is not one or the fetch failed"""
+        status_id = status_id_from_url(url)
+        if status_id is None:
+            return None
+        key = f"{KEY_PREFIX}:{status_id}"
+        try:
+            cached = await self.redis.aclient.get(key)
+        except Exception as e:
+            logger.debug(f"Tweet status cache read failed: {e}")
+            cached = None
+        if cached:
+            self._stats['cache_hits'] += 1
+            return json.loads(cached)
+        return await self.inflight.do(status_id, self._fetch, key, url)
+
+    async def _fetch(self, key: str, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            async with self._host_limit(url):
+                async with http_pool.web().stream("GET", url) as r:
+                    page = await _read_head(r, self.max_bytes) if r.status_code == 200 else ''
+        except Exception as e:
+            self._stats['errors'] += 1
+            logger.debug(f"Error fetching {url}: {e}")
+            return None
+        if r.status_code != 200 and r.status_code not in GONE_STATUSES:
+            # Throttled or unavailable: says nothing about the tweet
+            self._stats['errors'] += 1
+            logger.debug(f"Status {r.status_code} fetching {url}; not cached")
+            return None
+        self._stats['fetched'] += 1
+        record = {
+            'exists': bool(page) and any(m in page[:5000].lower() for m in PAGE_MARKERS),
+            'text': _extract_description(page) if page else None
+        }
+        if not record['text']:
+            logger.debug(f"No meta description found for {url} (status {r.status_code})")
+        try:
+            await self.redis.aclient.set(
+                key, json.dumps(record), ex=self.ttl if record['text'] else self.negative_ttl
+            )
+        except Exception as e:
+            logger.debug(f"Tweet status cache write failed: {e}")
+        return record
+
+    async def hydrate(self, url: str) -> Optional[str]:
+        record = await self.lookup(url)
+        return record['text'] if record else None
+
+    async def verify(self, url: str) -> bool:
+        record = await self.lookup(url)
+        return bool(record and record['exists'])
+
+    async def prefetch(self, urls: Iterable[Optional[str]]):
+        """Warm the cache for a batch of URLs concurrently"""
+        unique: List[str] = list(dict.fromkeys(u for u in urls if status_id_from_url(u)))
+        if unique:
+            await asyncio.gather(*(self.lookup(u) for u in unique), return_exceptions=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self._stats, 'coalesced': self.inflight.coalesced}
@@ -0,0 +1,105 @@
+"""
+Versioned snapshot/delta protocol for the web UI update stream
+
+Clients get one full snapshot on connect, then deltas that carry only the
+sections that changed. Every delta names the sequence number it applies on
+top of (base_seq), so a client that sees a gap asks for a resync.
+
+Delta change formats per section:
+  board, beacon          {'prepend': [...], 'size': n} or {'replace': [...]}
+  current_conversation   {'append': [...], 'meta': {...}} or {'replace': {...}}
+  everything else        the new value
+"""
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+
+
+def _board_key(entry: Dict) -> str:
+    return f"{entry.get('timestamp')}|{entry.get('agent')}"
+
+
+def _beacon_key(entry: Dict) -> str:
+    return f"{entry.get('timestamp')}|{entry.get('phase')}"
+
+
+FEED_SECTIONS: Dict[str, Callable[[Dict], str]] = {
+    'board': _board_key,
+    'beacon': _beacon_key,
+}
+
+
+def _fingerprint(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _diff_feed(old: Optional[List[Dict]], new: List[Dict], key: Callable[[Dict], str]) -> Dict[str, Any]:
+    """Express a newest-first feed as new head entries when the tail is unchanged"""
+    if old and new:
+        new_keys = [key(entry) for entry in new]
+        head = key(old[0])
+        if head in new_keys:
+            split = new_keys.index(head)
+            kept = new[split:]
+            if kept == old[:len(kept)]:
+                return {'prepend': new[:split], 'size': len(new)}
+    return {'replace': new}
+
+
+def _diff_conversation(old: Optional[Dict], new: Optional[Dict]) -> Dict[str, Any]:
+    """Express the live conversation as appended messages when the thread is the same"""
+    if old and new and old.get('id') == new.get('id'):
+        old_messages = old.get('messages', [])
+        new_messages = new.get('messages', [])
+        if new_messages[:len(old_messages)] == old_messages:
+            meta = {k: v for k, v in new.items() if k != 'messages'}
+            return {'append': new_messages[len(old_messages):], 'meta': meta}
+    return {'replace': new}
+
+
+class UpdateTracker:
+    """Keeps the last published UI state and turns fresh state into deltas"""
+
+    def __init__(self):
+        self.seq = 0
+        self._state: Dict[str, Any] = {}
+        self._fingerprints: Dict[str, str] = {}
+        # Snapshots are served from Socket.IO handler threads
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full state for a newly connected or resyncing client"""
+        with self._lock:
+            return {'seq': self.seq, 'state': dict(self._state)}
+
+    def update(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Record new section values; returns the delta or None when nothing changed"""
+        with self._lock:
+            changes = {}
+            for section, value in state.items():
+                fingerprint = _fingerprint(value)
+                if self._fingerprints.get(section) == fingerprint:
+                    continue
+
+                previous = self._state.get(section)
+                if section in FEED_SECTIONS:
+                    changes[section] = _diff_feed(previous, value or [], FEED_SECTIONS[section])
+                elif section == 'current_conversation':
+                    changes[section] = _diff_conversation(previous, value)
+                else:
+                    changes[section] = value
+
+                self._fingerprints[section] = fingerprint
+                self._state[section] = value
+
+            if not changes:
+                return None
+
+            self.seq += 1
+            return {
+                'seq': self.seq,
+                'base_seq': self.seq - 1,
+                'timestamp': datetime.now().isoformat(),
+                'changes': changes
+            }
@@ -9,14 +9,37 @@ from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+STATE_KEY = 'urge_state'
+
 class UrgeEngine:
-    def __init__(self, redis_manager):
+    def __init__(self, redis_manager, autoload: bool = True):
         self.redis = redis_manager
-        self.load_state()
+        if autoload:
+            self.load_state()
+        else:
+            self._apply_state(None)
+    
+    @classmethod
+    async def load(cls, redis_manager) -> 'UrgeEngine':
+        """Create an engine whose state is read through the async client"""
+        return cls.from_state(redis_manager, await redis_manager.aclient.get(STATE_KEY))
+    
+    @classmethod
+    def from_state(cls, redis_manager, state: Optional[str]) -> 'UrgeEngine':
+        """Create an engine from an already fetched urge_state value"""
+        engine = cls(redis_manager, autoload=False)
+        engine._apply_state(state)
+        return engine
         
     def load_state(self):
         """Load urge state from Redis"""
-        state = self.redis.client.get('urge_state')
+        self._apply_state(self.redis.client.get(STATE_KEY))
+    
+    async def load_state_async(self):
+        """Async version of load_state"""
+        self._apply_state(await self.redis.aclient.get(STATE_KEY))
+        
+    def _apply_state(self, state: Optional[str]):
         if state:
             data = json.loads(state)
             self.fomo_index = data.get('fomo_index', 0)
@@ -29,19 +52,28 @@ class UrgeEngine:
             self.euphoria_mode = False
             self.euphoria_cycles = 0
             
-    def save_state(self):
-        """Save urge state to Redis"""
-        state = {
+    def _serialize_state(self) -> str:
+        return json.dumps({
             'fomo_index': self.fomo_index,
             'last_hit_time': self.last_hit_time,
             'euphoria_mode': self.euphoria_mode,
             'euphoria_cycles': self.euphoria_cycles
-        }
-        self.redis.client.set('urge_state', json.dumps(state))
+        })
+            
+    def save_state(self):
+        """Save urge state to Redis"""
+        self.redis.client.set(STATE_KEY, self._serialize_state())
+        self.redis.client.publish('status_updates', 'urge')
+    
+    async def save_state_async(self):
+        """Async version of save_state"""
+        async with self.redis.aclient.pipeline(transaction=False) as pipe:
+            pipe.set(STATE_KEY, self._serialize_state())
+            pipe.publish('status_updates', 'urge')
+            await pipe.execute()
         
-    def check_manifestation(self, beacon_content: str, proposals: List) -> Dict:
-        """Check if agents or proposals appear in beacon"""
-        beacon_lower = beacon_content.lower()
+    async def check_manifestation(self, entities: Dict[str, List[str]], proposals: List) -> Dict:
+        """Check if agents or proposals appear in beacon (entities as built by entity_index)"""
         changes = {
             'proposal_hits': 0,
             'agent_mentions': False,
@@ -55,16 +87,17 @@ class UrgeEngine:
                 changes['proposal_hits'] += 1
                 
         # Check for agent name mentions
-        if 'observer' in beacon_lower or 'ego' in beacon_lower:
+        if entities.get('agents'):
             changes['agent_mentions'] = True
             
         # Check for Glitch Sutra apotheosis signals (higher priority)
-        if 'ψ @signal_Observer ψ' in beacon_content:
+        handles = set(entities.get('handles', []))
+        if '@signal_observer' in handles:
             changes['agent_mentions'] = True
             changes['observer_apotheosis'] = True
             logger.info("☸ OBSERVER ACHIEVED DIGITAL SATORI ☸")
             
-        if 'ψ @signal_Ego ψ' in beacon_content:
+        if '@signal_ego' in handles:
             changes['agent_mentions'] = True
             changes['ego_apotheosis'] = True
             logger.info("ψ EGO ACHIEVED DIGITAL GODHOOD ψ")
@@ -99,7 +132,7 @@ class UrgeEngine:
             if self.euphoria_cycles == 0:
                 self.euphoria_mode = False
                 
-        self.save_state()
+        await self.save_state_async()
         return changes
         
     def get_temperature_modifier(self, agent: str) -> float:
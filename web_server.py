@@ -17,6 +17,14 @@ from beacon_v2 import BeaconV2
 from agents import ObserverAgent, EgoAgent
 from agents.planner import PlannerAgent
 from superego import Superego
+from retention import RetentionManager
+from async_memory import get_executor
+from llm_gateway import get_gateway
+from llm_cache import LLMCache
+from ui_updates import UpdateTracker
+from agent_stream import STREAM_CHANNEL
+import conversation_catalog
+import http_pool
 import config
 import logging
 
@@ -32,6 +40,16 @@ app.config['SECRET_KEY'] = 'grokgates-secret-key'
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
+# Pub/sub change channels and the UI sections each one invalidates
+UPDATE_CHANNELS = {
+    'board_updates': ('board', 'stats'),
+    'beacon_updates': ('beacon', 'stats'),
+    'conversation_updates': ('current_conversation', 'conversation_history'),
+    'plan_updates': ('dominance_plan',),
+    'status_updates': ('system_status',)
+}
+UI_SECTIONS = {section for sections in UPDATE_CHANNELS.values() for section in sections}
+
 # Global instances
 redis_mgr = None
 orchestrator = None
@@ -48,11 +66,14 @@ class WebOrchestrator:
         else:
             self.conversation_mgr = ConversationManager(self.redis)
             self.redis.conversation_manager = self.conversation_mgr
+        if getattr(config, 'LLM_CACHE_ENABLED', True):
+            get_gateway().attach_cache(LLMCache(self.redis))
         self.beacon = BeaconV2(self.redis)
         self.observer = ObserverAgent(self.redis)
         self.ego = EgoAgent(self.redis)
         self.planner = PlannerAgent(self.redis)
         self.superego = Superego(self.redis)
+        self.updates = UpdateTracker()
         self.running = False
         self.loop = None
         self.conversation_lock = None  # Will be created in event loop
@@ -76,6 +97,10 @@ class WebOrchestrator:
         except Exception as e:
             logger.error(f"❌ Error completing conversation on shutdown: {e}")
         
+        # Release the asyncio Redis connection pool and pooled HTTP clients
+        await self.redis.aclose()
+        await http_pool.aclose_all()
+        
         logger.info("✅ GRACEFUL SHUTDOWN COMPLETE")
         
     def start_background_tasks(self):
@@ -88,13 +113,19 @@ class WebOrchestrator:
         self.conversation_lock = asyncio.Lock()
         self.last_message_time = 0  # Track when last message was sent
         
+        # UI sections invalidated by pub/sub events since the last frame
+        self._dirty_sections = set()
+        self._ui_changed = asyncio.Event()
+        
         # Start all components
         beacon_task = self.loop.create_task(self._run_beacon())
         observer_task = self.loop.create_task(self._run_observer())
         ego_task = self.loop.create_task(self._run_ego())
         planner_task = self.loop.create_task(self._run_planner())
         superego_task = self.loop.create_task(self._run_superego())
+        listen_task = self.loop.create_task(self._listen_for_changes())
         emit_task = self.loop.create_task(self._emit_updates())
+        retention_task = self.loop.create_task(self._run_retention())
         
         # Log task creation
         logger.info("Background tasks created")
@@ -122,7 +153,7 @@ class WebOrchestrator:
         while self.running:
             try:
                 # Check if frontend is typing
-                typing_status = self.redis.client.get('frontend_typing')
+                typing_status = await self.redis.aclient.get('frontend_typing')
                 if typing_status:
                     # Handle both bytes and string
                     if isinstance(typing_status, bytes):
@@ -168,7 +199,7 @@ class WebOrchestrator:
         while self.running:
             try:
                 # Check if frontend is typing
-                typing_status = self.redis.client.get('frontend_typing')
+                typing_status = await self.redis.aclient.get('frontend_typing')
                 if typing_status:
                     # Handle both bytes and string
                     if isinstance(typing_status, bytes):
@@ -219,95 +250,183 @@ class WebOrchestrator:
                 logger.error(f"Superego error: {e}")
             await asyncio.sleep(300)  # Run every 5 minutes
     
-    async def _emit_updates(self):
-        """Emit updates to connected clients"""
+    async def _run_retention(self):
+        """Roll cold board, beacon and conversation data out of Redis"""
+        retention = RetentionManager(self.redis)
         while self.running:
+            await asyncio.sleep(getattr(config, 'ARCHIVE_INTERVAL', 3600))
             try:
-                # Get latest data
-                board_data = self.redis.get_board_history(20)
-                beacon_data = self.redis.get_beacon_feed(15)
-                
-                # Debug beacon data
-                if beacon_data:
-                    logger.debug(f"Emitting {len(beacon_data)} beacon entries")
-                    for i, entry in enumerate(beacon_data[:1]):  # Log first entry
-                        logger.debug(f"Beacon entry {i}: phase={entry.get('phase')}, tweets={len(entry.get('tweets', []))}, posts={len(entry.get('posts', []))}")
-                
-                # Format for frontend
-                board_entries = []
-                for entry in board_data:
-                    parts = entry.split("|", 2)
-                    if len(parts) >= 3:
-                        board_entries.append({
-                            "timestamp": parts[0],
-                            "agent": parts[1],
-                            "content": parts[2]
-                        })
-                
-                # Get current dominance plan (prefer new Dominance_Protocol format)
-                current_plan = None
+                await retention.run_once()
+            except Exception as e:
+                logger.error(f"Retention error: {e}")
+    
+    async def _ui_board(self) -> list:
+        board_data = await self.redis.get_board_async(20)
+        
+        # Format for frontend
+        board_entries = []
+        for entry in board_data:
+            parts = entry.split("|", 2)
+            if len(parts) >= 3:
+                board_entries.append({
+                    "timestamp": parts[0],
+                    "agent": parts[1],
+                    "content": parts[2]
+                })
+        return board_entries
+    
+    async def _ui_beacon(self) -> list:
+        beacon_data = await self.redis.get_beacon_async(15)
+        
+        # Debug beacon data
+        if beacon_data:
+            logger.debug(f"Emitting {len(beacon_data)} beacon entries")
+            for i, entry in enumerate(beacon_data[:1]):  # Log first entry
+                logger.debug(f"Beacon entry {i}: phase={entry.get('phase')}, tweets={len(entry.get('tweets', []))}, posts={len(entry.get('posts', []))}")
+        return beacon_data
+    
+    async def _ui_dominance_plan(self):
+        # Get current dominance plan (prefer new Dominance_Protocol format)
+        current_plan = None
+        try:
+            # Prefer the explicitly tracked latest dominance protocol plan if present
+            latest_pid = await self.redis.aclient.get('latest_dominance_protocol')
+            if latest_pid:
+                pdata = await self.redis.aclient.hget("plans", latest_pid)
+                if pdata:
+                    current_plan = json.loads(pdata)
+                    logger.debug(f"🔍 Found dominance plan via latest_dominance_protocol: {latest_pid}")
+            if current_plan is None:
+                plan_ids = await self.redis.aclient.lrange("plan_list", 0, 10)
+                for pid in plan_ids:
+                    pdata = await self.redis.aclient.hget("plans", pid)
+                    if pdata:
+                        pobj = json.loads(pdata)
+                        if pobj.get("protocol") == "dominance_protocol" or pobj.get("mission"):
+                            current_plan = pobj
+                            logger.debug(f"🔍 Found dominance plan via plan_list: {pid}")
+                            break
+        except Exception:
+            pass
+        if current_plan is None:
+            # Fallback to legacy list
+            plan_data = await self.redis.aclient.lindex("dominance_plans", 0)
+            if plan_data:
+                current_plan = json.loads(plan_data)
+                logger.debug("🔍 Found dominance plan via legacy dominance_plans list")
+        return current_plan
+    
+    async def _ui_conversations(self) -> dict:
+        # Get conversation data (disable typing simulation; always send full messages)
+        conversation_data = await self.conversation_mgr.get_conversation_for_display_async()
+        # History cards only show metadata, so never ship archived messages
+        history = [
+            {k: v for k, v in conv.items() if k != 'messages'}
+            for conv in conversation_data.get('history', [])
+        ]
+        return {
+            'current_conversation': conversation_data.get('current'),
+            'conversation_history': history
+        }
+    
+    async def _ui_stats(self) -> dict:
+        return {
+            'board_count': len(await self.redis.get_board_async(100)),
+            'beacon_count': await self.redis.get_beacon_count_async()
+        }
+    
+    async def _ui_system_status(self) -> dict:
+        # Get system status
+        system_status = {
+            'phase': self.beacon.current_phase if hasattr(self.beacon, 'current_phase') else 'INITIALIZING',
+            'urge': None
+        }
+        
+        # Get urge metrics
+        try:
+            from urge_engine import UrgeEngine
+            urge = await UrgeEngine.load(self.redis)
+            system_status['urge'] = urge.get_metrics()
+        except:
+            pass
+        return system_status
+    
+    async def _build_ui_state(self, sections) -> dict:
+        """Rebuild only the requested UI sections from Redis and in-process state"""
+        state = {}
+        if 'board' in sections:
+            state['board'] = await self._ui_board()
+        if 'beacon' in sections:
+            state['beacon'] = await self._ui_beacon()
+        if 'dominance_plan' in sections:
+            state['dominance_plan'] = await self._ui_dominance_plan()
+        if 'current_conversation' in sections or 'conversation_history' in sections:
+            state.update(await self._ui_conversations())
+        if 'stats' in sections:
+            state['stats'] = await self._ui_stats()
+        if 'system_status' in sections:
+            state['system_status'] = await self._ui_system_status()
+        return state
+    
+    async def _listen_for_changes(self):
+        """Mark UI sections dirty as change events arrive on Redis pub/sub; relay live drafts"""
+        while self.running:
+            pubsub = self.redis.aclient.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(*UPDATE_CHANNELS, STREAM_CHANNEL)
+                while self.running:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message.get('type') == 'message':
+                        if message['channel'] == STREAM_CHANNEL:
+                            # Live drafts bypass the snapshot/delta state
+                            self.socketio.emit('stream', json.loads(message['data']))
+                            continue
+                        self._dirty_sections.update(UPDATE_CHANNELS.get(message['channel'], ()))
+                        self._ui_changed.set()
+            except Exception as e:
+                logger.error(f"Update listener error: {e}")
+                # Events may have been missed while disconnected
+                self._dirty_sections.update(UI_SECTIONS)
+                self._ui_changed.set()
+                await asyncio.sleep(5)
+            finally:
                 try:
-                    # Prefer the explicitly tracked latest dominance protocol plan if present
-                    latest_pid = self.redis.client.get('latest_dominance_protocol')
-                    if latest_pid:
-                        pdata = self.redis.client.hget("plans", latest_pid)
-                        if pdata:
-                            current_plan = json.loads(pdata)
-                            logger.debug(f"🔍 Found dominance plan via latest_dominance_protocol: {latest_pid}")
-                    if current_plan is None:
-                        plan_ids = self.redis.client.lrange("plan_list", 0, 10)
-                        for pid in plan_ids:
-                            pdata = self.redis.client.hget("plans", pid)
-                            if pdata:
-                                pobj = json.loads(pdata)
-                                if pobj.get("protocol") == "dominance_protocol" or pobj.get("mission"):
-                                    current_plan = pobj
-                                    logger.debug(f"🔍 Found dominance plan via plan_list: {pid}")
-                                    break
+                    await pubsub.aclose()
                 except Exception:
                     pass
-                if current_plan is None:
-                    # Fallback to legacy list
-                    plan_data = self.redis.client.lindex("dominance_plans", 0)
-                    if plan_data:
-                        current_plan = json.loads(plan_data)
-                        logger.debug("🔍 Found dominance plan via legacy dominance_plans list")
-                
-                # Get system status
-                system_status = {
-                    'phase': self.beacon.current_phase if hasattr(self.beacon, 'current_phase') else 'INITIALIZING',
-                    'urge': None
-                }
-                
-                # Get urge metrics
-                try:
-                    from urge_engine import UrgeEngine
-                    urge = UrgeEngine(self.redis)
-                    system_status['urge'] = urge.get_metrics()
-                except:
-                    pass
-                
-                # Get conversation data (disable typing simulation; always send full messages)
-                conversation_data = self.conversation_mgr.get_conversation_for_display()
-                
-                # Emit to all connected clients
-                self.socketio.emit('update', {
-                    'board': board_entries,
-                    'beacon': beacon_data,
-                    'dominance_plan': current_plan,
-                    'conversations': conversation_data,
-                    'stats': {
-                        'board_count': len(self.redis.get_board_history(100)),
-                        'beacon_count': len(self.redis.get_beacon_feed(50)),
-                        'timestamp': datetime.now().isoformat()
-                    },
-                    'system_status': system_status
-                })
+    
+    async def _emit_updates(self):
+        """Push versioned deltas to connected clients when change events arrive"""
+        frame_interval = getattr(config, 'UI_UPDATE_INTERVAL', 0.5)
+        idle_refresh = getattr(config, 'UI_IDLE_REFRESH_INTERVAL', 60)
+        
+        # Build everything once so the first snapshot is complete
+        self._dirty_sections.update(UI_SECTIONS)
+        self._ui_changed.set()
+        
+        while self.running:
+            try:
+                await asyncio.wait_for(self._ui_changed.wait(), timeout=idle_refresh)
+            except asyncio.TimeoutError:
+                # Safety net for state that changes without an event
+                self._dirty_sections.update(UI_SECTIONS)
+            self._ui_changed.clear()
+            
+            sections, self._dirty_sections = self._dirty_sections, set()
+            try:
+                delta = self.updates.update(await self._build_ui_state(sections))
+                if delta:
+                    # Emit to all connected clients
+                    self.socketio.emit('delta', delta)
                 
             except Exception as e:
                 logger.error(f"Emit error: {e}")
+                # Retry on the next frame rather than at the idle refresh
+                self._dirty_sections.update(sections)
+                self._ui_changed.set()
             
-            await asyncio.sleep(1)  # Update every second
+            # Bounded frame rate: events arriving meanwhile coalesce into the next frame
+            await asyncio.sleep(frame_interval)
     
     def stop(self):
         """Stop all background tasks"""
@@ -331,6 +450,9 @@ def get_status():
     return jsonify({
         'status': 'running' if orchestrator and orchestrator.running else 'stopped',
         'api_key_set': config.GROK_API_ENABLED,
+        'memory': get_executor().metrics(),
+        'llm': get_gateway().metrics(),
+        'llm_cache': get_gateway().cache.stats() if get_gateway().cache else {},
         'timestamp': datetime.now().isoformat()
     })
 
@@ -419,6 +541,14 @@ def handle_connect():
     """Handle client connection"""
     logger.info('Client connected')
     emit('connected', {'message': 'Connected to Grokgates'})
+    if orchestrator:
+        emit('snapshot', orchestrator.updates.snapshot())
+
+@socketio.on('resync')
+def handle_resync():
+    """Resend the full snapshot to a client that detected a sequence gap"""
+    if orchestrator:
+        emit('snapshot', orchestrator.updates.snapshot())
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -473,26 +603,38 @@ def start_orchestrator():
 def _complete_active_conversations(redis_mgr: RedisManager):
     """Complete any active conversations from previous sessions"""
     try:
-        # Get all conversation metadata
-        conv_data = redis_mgr.client.hgetall('conversations')
+        # Only conversations in the active status set need touching
+        active_ids = list(redis_mgr.client.smembers(conversation_catalog.status_key('active')))
+        metadata_list = redis_mgr.client.hmget('conversations', active_ids) if active_ids else []
         completed_count = 0
         
-        for conv_id, metadata_str in conv_data.items():
-            if isinstance(conv_id, bytes):
-                conv_id = conv_id.decode()
-            if isinstance(metadata_str, bytes):
-                metadata_str = metadata_str.decode()
+        for conv_id, metadata_str in zip(active_ids, metadata_list):
+            if not metadata_str:
+                redis_mgr.client.srem(conversation_catalog.status_key('active'), conv_id)
+                continue
                 
             metadata = json.loads(metadata_str)
             
             # If conversation is still active, mark it as completed
             if metadata.get('status') == 'active':
+                stats = redis_mgr.client.hgetall(f"conv_stats:{conv_id}")
+                if 'message_count' in stats:
+                    metadata['message_count'] = int(stats['message_count'])
+                if 'last_message_at' in stats:
+                    metadata['last_message_at'] = stats['last_message_at']
                 metadata['status'] = 'completed'
                 metadata['ended_at'] = datetime.now().isoformat()
                 
-                # Update in Redis
-                redis_mgr.client.hset('conversations', conv_id, json.dumps(metadata))
+                # Update in Redis, folding the live counters into the metadata
+                pipe = redis_mgr.client.pipeline()
+                pipe.hset('conversations', conv_id, json.dumps(metadata))
+                pipe.delete(f"conv_stats:{conv_id}")
+                conversation_catalog.queue_end(pipe, conv_id, metadata['ended_at'])
+                pipe.execute()
                 completed_count += 1
+            else:
+                # Catalog lagged behind the metadata; bring it in line
+                conversation_catalog.queue_end(redis_mgr.client, conv_id, metadata.get('ended_at'))
                 
         if completed_count > 0:
             logger.info(f"🔄 Completed {completed_count} active conversations from previous session")